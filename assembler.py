@@ -0,0 +1,635 @@
+#!/usr/bin/env python3
+"""Two-pass RV32I assembler for the CPU's ROM images.
+
+Reads RISC-V assembly text with labels, a handful of directives and the
+standard ABI register names, and produces the 32-bit words that
+instruction_memory_axi.v loads from rom.mem:
+
+    program = assemble(source)
+    write_mem_file("rom.mem", program.words)
+    write_listing_file("rom.lst", program)
+
+The first pass lays out statements and records label addresses, the second
+evaluates operands (so branches may refer to labels further down) and encodes.
+
+Branch and jump operands are target addresses, not offsets: use a label, or
+"." for the address of the current instruction (e.g. "j .").
+
+The usual pseudo-instructions are expanded before anything else sees the
+program (see PSEUDO_INSTRUCTIONS): nop, li, la, mv, not, neg, seqz, snez,
+sltz, sgtz, beqz, bnez, blez, bgez, bltz, bgtz, bgt, ble, bgtu, bleu, j,
+jal/jalr with one operand, jr, ret, call and tail. li picks the shortest
+sequence for its constant, which matters for the 4KB ROM.
+
+Directives:
+    .text / .globl / .global / .section   accepted and ignored
+    .org OFFSET        pad with zero words up to base + OFFSET
+    .align N           pad with NOPs to a 2**N byte boundary
+    .word EXPR, ...    emit 32-bit values
+    .zero N / .space N emit N zero bytes (multiple of 4)
+    .equ NAME, EXPR    define a constant (.set is an alias)
+
+Usage: ./assembler.py program.s [-o rom.mem] [-l rom.lst] [--base 0x80000000]
+                                              [--schedule] [--insert-nops]
+"""
+
+import argparse
+import ast
+import os
+import re
+import sys
+import warnings
+
+CPU_BASE_ADDR = 0x80000000
+ROM_BOUNDARY_ADDR = 0x80000FFF
+ROM_SIZE = ROM_BOUNDARY_ADDR - CPU_BASE_ADDR + 1
+NOP = 0x00000013  # addi zero, zero, 0
+
+OP_LUI    = 0b0110111
+OP_AUIPC  = 0b0010111
+OP_JAL    = 0b1101111
+OP_JALR   = 0b1100111
+OP_BRANCH = 0b1100011
+OP_LOAD   = 0b0000011
+OP_STORE  = 0b0100011
+OP_ALU_I  = 0b0010011
+OP_ALU_R  = 0b0110011
+
+REGISTERS = {f"x{i}": i for i in range(32)}
+REGISTERS.update({
+    'zero': 0, 'ra': 1, 'sp': 2, 'gp': 3, 'tp': 4,
+    't0': 5, 't1': 6, 't2': 7, 's0': 8, 'fp': 8, 's1': 9,
+    'a0': 10, 'a1': 11, 'a2': 12, 'a3': 13, 'a4': 14, 'a5': 15, 'a6': 16, 'a7': 17,
+    's2': 18, 's3': 19, 's4': 20, 's5': 21, 's6': 22, 's7': 23, 's8': 24, 's9': 25, 's10': 26, 's11': 27,
+    't3': 28, 't4': 29, 't5': 30, 't6': 31,
+})
+
+# mnemonic -> (funct3, funct7)
+R_TYPE = {
+    'add':  (0b000, 0b0000000), 'sub':  (0b000, 0b0100000),
+    'sll':  (0b001, 0b0000000), 'slt':  (0b010, 0b0000000),
+    'sltu': (0b011, 0b0000000), 'xor':  (0b100, 0b0000000),
+    'srl':  (0b101, 0b0000000), 'sra':  (0b101, 0b0100000),
+    'or':   (0b110, 0b0000000), 'and':  (0b111, 0b0000000),
+}
+I_TYPE_ALU = {'addi': 0b000, 'slti': 0b010, 'sltiu': 0b011, 'xori': 0b100, 'ori': 0b110, 'andi': 0b111}
+SHIFT_IMM = {'slli': (0b001, 0b0000000), 'srli': (0b101, 0b0000000), 'srai': (0b101, 0b0100000)}
+LOADS = {'lb': 0b000, 'lh': 0b001, 'lw': 0b010, 'lbu': 0b100, 'lhu': 0b101}
+STORES = {'sb': 0b000, 'sh': 0b001, 'sw': 0b010}
+BRANCHES = {'beq': 0b000, 'bne': 0b001, 'blt': 0b100, 'bge': 0b101, 'bltu': 0b110, 'bgeu': 0b111}
+
+IGNORED_DIRECTIVES = {'.text', '.globl', '.global', '.section'}
+
+_LABEL = re.compile(r"\s*([A-Za-z_.$][\w.$]*)\s*:")
+_INTEGER = re.compile(r"[+-]?(?:0[xX][0-9a-fA-F]+|0[bB][01]+|[1-9][0-9]*|0)")
+MEMORY_OPERAND = re.compile(r"(.*)\(\s*(\w+)\s*\)")
+_TOKEN = re.compile(r"\s*(0[xX][0-9a-fA-F]+|0[bB][01]+|\d+|'\\?.'|%hi|%lo|[A-Za-z_.$][\w.$]*|.)")
+
+
+def encode_r_type(opcode, rd, funct3, rs1, rs2, funct7):
+    return (funct7 << 25) | (rs2 << 20) | (rs1 << 15) | (funct3 << 12) | (rd << 7) | opcode
+
+def encode_i_type(opcode, rd, funct3, rs1, imm):
+    return ((imm & 0xFFF) << 20) | (rs1 << 15) | (funct3 << 12) | (rd << 7) | opcode
+
+def encode_s_type(opcode, funct3, rs1, rs2, imm):
+    imm_11_5 = (imm >> 5) & 0x7F
+    imm_4_0 = imm & 0x1F
+    return (imm_11_5 << 25) | (rs2 << 20) | (rs1 << 15) | (funct3 << 12) | (imm_4_0 << 7) | opcode
+
+def encode_b_type(opcode, funct3, rs1, rs2, imm):
+    imm_12 = (imm >> 12) & 0x1
+    imm_11 = (imm >> 11) & 0x1
+    imm_10_5 = (imm >> 5) & 0x3F
+    imm_4_1 = (imm >> 1) & 0xF
+    return (imm_12 << 31) | (imm_10_5 << 25) | (rs2 << 20) | (rs1 << 15) | (funct3 << 12) | (imm_4_1 << 8) | (imm_11 << 7) | opcode
+
+def encode_u_type(opcode, rd, imm):
+    return ((imm & 0xFFFFF) << 12) | (rd << 7) | opcode
+
+def encode_j_type(opcode, rd, imm):
+    imm_20 = (imm >> 20) & 0x1
+    imm_19_12 = (imm >> 12) & 0xFF
+    imm_11 = (imm >> 11) & 0x1
+    imm_10_1 = (imm >> 1) & 0x3FF
+    return (imm_20 << 31) | (imm_10_1 << 21) | (imm_11 << 20) | (imm_19_12 << 12) | (rd << 7) | opcode
+
+
+def hi(value):
+    """Upper 20 bits for lui/auipc, rounded so that adding lo(value) gives value."""
+    return ((value + 0x800) >> 12) & 0xFFFFF
+
+def lo(value):
+    """Sign-extended low 12 bits, the addi/load/store half of a hi/lo pair."""
+    return ((value & 0xFFF) ^ 0x800) - 0x800
+
+
+class Statement:
+    """One source line: optional labels plus an instruction or directive."""
+
+    __slots__ = ("line_no", "text", "labels", "mnemonic", "operands", "address", "size")
+
+    def __init__(self, line_no, text, labels, mnemonic, operands):
+        self.line_no = line_no
+        self.text = text
+        self.labels = labels
+        self.mnemonic = mnemonic
+        self.operands = operands
+        self.address = None
+        self.size = 0
+
+    def __repr__(self):
+        return f"Statement(line {self.line_no}: {self.text.strip()!r})"
+
+
+class Program:
+    """Result of assemble(): encoded words plus everything needed to map them back to source."""
+
+    def __init__(self, base_addr, words, symbols, statements):
+        self.base_addr = base_addr
+        self.words = words
+        self.symbols = symbols
+        self.statements = statements
+
+    def __len__(self):
+        return len(self.words)
+
+
+def _fail(statement, message):
+    raise ValueError(f"line {statement.line_no}: {message}: {statement.text.strip()}")
+
+
+def parse(source):
+    """Split assembly text into Statements, without resolving anything."""
+    statements = []
+    for line_no, text in enumerate(source.splitlines(), start=1):
+        code = text
+        if '#' in code:
+            code = code.split('#', 1)[0]
+        if '//' in code:
+            code = code.split('//', 1)[0]
+        labels = []
+        while ':' in code:
+            match = _LABEL.match(code)
+            if match is None:
+                break
+            labels.append(match.group(1))
+            code = code[match.end():]
+        code = code.strip()
+        if not code and not labels:
+            continue
+
+        mnemonic, operands = None, []
+        if code:
+            parts = code.split(None, 1)
+            mnemonic = parts[0].lower()
+            if len(parts) > 1:
+                operands = [operand.strip() for operand in parts[1].split(',')]
+        statements.append(Statement(line_no, text, labels, mnemonic, operands))
+    return statements
+
+
+def _tokenize(expression):
+    tokens = _TOKEN.findall(expression)
+    return [token for token in tokens if not token.isspace()]
+
+
+def _character(token):
+    """Value of a character literal such as 'a', '\\n' or '\\''."""
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")  # invalid escapes such as '\q'
+            value = ast.literal_eval(token)
+    except (SyntaxError, ValueError):
+        value = None
+    if not isinstance(value, str) or len(value) != 1:
+        raise ValueError(f"Malformed character literal {token}")
+    return ord(value)
+
+
+def evaluate(expression, symbols, pc=None):
+    """Evaluate an integer expression: numbers, symbols, '.', + - * / ( ), %hi() and %lo().
+
+    Division is integer (floor) division.
+
+    Raises:
+        ValueError: On syntax errors or undefined symbols
+    """
+    expression = expression.strip()
+    if expression in symbols:
+        return symbols[expression]
+    if _INTEGER.fullmatch(expression):
+        return int(expression, 0)
+
+    tokens = _tokenize(expression)
+    position = 0
+
+    def peek():
+        return tokens[position] if position < len(tokens) else None
+
+    def take(expected=None):
+        nonlocal position
+        token = peek()
+        if token is None or (expected is not None and token != expected):
+            raise ValueError(f"Malformed expression '{expression}'")
+        position += 1
+        return token
+
+    def atom():
+        token = take()
+        if token == '(':
+            value = total()
+            take(')')
+            return value
+        if token == '-':
+            return -atom()
+        if token == '+':
+            return atom()
+        if token in ('%hi', '%lo'):
+            take('(')
+            value = total()
+            take(')')
+            return hi(value) if token == '%hi' else lo(value)
+        if token[0].isdigit():
+            return int(token, 0) if token[:2].lower() in ('0x', '0b') else int(token, 10)
+        if token[0] == "'":
+            return _character(token)
+        if token == '.':
+            if pc is None:
+                raise ValueError(f"'.' is only valid in instruction operands: '{expression}'")
+            return pc
+        if token in symbols:
+            return symbols[token]
+        if token[0].isalpha() or token[0] in '_.$':
+            raise ValueError(f"Undefined symbol '{token}'")
+        raise ValueError(f"Unexpected '{token}' in expression '{expression}'")
+
+    def product():
+        value = atom()
+        while peek() in ('*', '/'):
+            if take() == '*':
+                value *= atom()
+            else:
+                value //= atom()
+        return value
+
+    def total():
+        value = product()
+        while peek() in ('+', '-'):
+            if take() == '+':
+                value += product()
+            else:
+                value -= product()
+        return value
+
+    value = total()
+    if position != len(tokens):
+        raise ValueError(f"Unexpected '{tokens[position]}' in expression '{expression}'")
+    return value
+
+
+def parse_register(name):
+    try:
+        return REGISTERS[name.lower()]
+    except KeyError:
+        raise ValueError(f"Unknown register '{name}'") from None
+
+
+def _check_range(value, low, high, what):
+    if not low <= value <= high:
+        raise ValueError(f"{what} {value} out of range [{low}, {high}]")
+    return value
+
+
+def _operands(statement, count):
+    if len(statement.operands) != count:
+        raise ValueError(f"'{statement.mnemonic}' takes {count} operands, got {len(statement.operands)}")
+    return statement.operands
+
+
+def split_memory_operand(operand):
+    """Split "offset(register)" into its offset text and register name."""
+    match = MEMORY_OPERAND.fullmatch(operand)
+    if match is None:
+        raise ValueError(f"Expected offset(register), got '{operand}'")
+    return match.group(1).strip(), match.group(2)
+
+
+def _memory_operand(operand, symbols, pc):
+    offset, register = split_memory_operand(operand)
+    value = evaluate(offset, symbols, pc) if offset else 0
+    return _check_range(value, -2048, 2047, "Offset"), parse_register(register)
+
+
+def encode(statement, symbols):
+    """Encode one instruction Statement whose address has been assigned.
+
+    Raises:
+        ValueError: On unknown mnemonics, bad operands or out-of-range immediates
+    """
+    mnemonic = statement.mnemonic
+    pc = statement.address
+
+    if mnemonic in R_TYPE:
+        rd, rs1, rs2 = _operands(statement, 3)
+        funct3, funct7 = R_TYPE[mnemonic]
+        return encode_r_type(OP_ALU_R, parse_register(rd), funct3, parse_register(rs1), parse_register(rs2), funct7)
+
+    if mnemonic in I_TYPE_ALU:
+        rd, rs1, imm = _operands(statement, 3)
+        imm = _check_range(evaluate(imm, symbols, pc), -2048, 2047, "Immediate")
+        return encode_i_type(OP_ALU_I, parse_register(rd), I_TYPE_ALU[mnemonic], parse_register(rs1), imm)
+
+    if mnemonic in SHIFT_IMM:
+        rd, rs1, shamt = _operands(statement, 3)
+        shamt = _check_range(evaluate(shamt, symbols, pc), 0, 31, "Shift amount")
+        funct3, funct7 = SHIFT_IMM[mnemonic]
+        return encode_i_type(OP_ALU_I, parse_register(rd), funct3, parse_register(rs1), (funct7 << 5) | shamt)
+
+    if mnemonic in LOADS:
+        rd, address = _operands(statement, 2)
+        offset, rs1 = _memory_operand(address, symbols, pc)
+        return encode_i_type(OP_LOAD, parse_register(rd), LOADS[mnemonic], rs1, offset)
+
+    if mnemonic in STORES:
+        rs2, address = _operands(statement, 2)
+        offset, rs1 = _memory_operand(address, symbols, pc)
+        return encode_s_type(OP_STORE, STORES[mnemonic], rs1, parse_register(rs2), offset)
+
+    if mnemonic in BRANCHES:
+        rs1, rs2, target = _operands(statement, 3)
+        offset = evaluate(target, symbols, pc) - pc
+        _check_range(offset, -4096, 4094, "Branch offset")
+        return encode_b_type(OP_BRANCH, BRANCHES[mnemonic], parse_register(rs1), parse_register(rs2), offset)
+
+    if mnemonic in ('lui', 'auipc'):
+        rd, imm = _operands(statement, 2)
+        imm = _check_range(evaluate(imm, symbols, pc), -0x80000, 0xFFFFF, "Upper immediate")
+        opcode = OP_LUI if mnemonic == 'lui' else OP_AUIPC
+        return encode_u_type(opcode, parse_register(rd), imm)
+
+    if mnemonic == 'jal':
+        rd, target = _operands(statement, 2)
+        offset = evaluate(target, symbols, pc) - pc
+        _check_range(offset, -(1 << 20), (1 << 20) - 2, "Jump offset")
+        return encode_j_type(OP_JAL, parse_register(rd), offset)
+
+    if mnemonic == 'jalr':
+        if len(statement.operands) == 3:
+            rd, rs1, imm = statement.operands
+            offset = _check_range(evaluate(imm, symbols, pc), -2048, 2047, "Offset")
+            rs1 = parse_register(rs1)
+        else:
+            rd, address = _operands(statement, 2)
+            offset, rs1 = _memory_operand(address, symbols, pc)
+        return encode_i_type(OP_JALR, parse_register(rd), 0b000, rs1, offset)
+
+    raise ValueError(f"Unknown instruction '{mnemonic}'")
+
+
+def _li(rd, value, constants):
+    """Shortest sequence loading a 32-bit constant; lui+addi when it depends on a label."""
+    if '.' in _tokenize(value):
+        raise ValueError("'.' is not allowed in li/la operands")
+    try:
+        number = evaluate(value, constants)
+    except ValueError:
+        # Not known before layout (e.g. a label): reserve the full pair
+        return [('lui', [rd, f"%hi({value})"]), ('addi', [rd, rd, f"%lo({value})"])]
+    _check_range(number, -(1 << 31), (1 << 32) - 1, "Constant")
+    number = ((number & 0xFFFFFFFF) ^ 0x80000000) - 0x80000000
+    if -2048 <= number <= 2047:
+        return [('addi', [rd, 'zero', str(number)])]
+    if lo(number) == 0:
+        return [('lui', [rd, hex(hi(number))])]
+    return [('lui', [rd, hex(hi(number))]), ('addi', [rd, rd, str(lo(number))])]
+
+
+# mnemonic -> {operand count: operands -> [(mnemonic, operands), ...]}
+PSEUDO_INSTRUCTIONS = {
+    'nop': {0: lambda: [('addi', ['zero', 'zero', '0'])]},
+    'mv': {2: lambda rd, rs: [('addi', [rd, rs, '0'])]},
+    'not': {2: lambda rd, rs: [('xori', [rd, rs, '-1'])]},
+    'neg': {2: lambda rd, rs: [('sub', [rd, 'zero', rs])]},
+    'seqz': {2: lambda rd, rs: [('sltiu', [rd, rs, '1'])]},
+    'snez': {2: lambda rd, rs: [('sltu', [rd, 'zero', rs])]},
+    'sltz': {2: lambda rd, rs: [('slt', [rd, rs, 'zero'])]},
+    'sgtz': {2: lambda rd, rs: [('slt', [rd, 'zero', rs])]},
+    'beqz': {2: lambda rs, target: [('beq', [rs, 'zero', target])]},
+    'bnez': {2: lambda rs, target: [('bne', [rs, 'zero', target])]},
+    'blez': {2: lambda rs, target: [('bge', ['zero', rs, target])]},
+    'bgez': {2: lambda rs, target: [('bge', [rs, 'zero', target])]},
+    'bltz': {2: lambda rs, target: [('blt', [rs, 'zero', target])]},
+    'bgtz': {2: lambda rs, target: [('blt', ['zero', rs, target])]},
+    'bgt': {3: lambda rs, rt, target: [('blt', [rt, rs, target])]},
+    'ble': {3: lambda rs, rt, target: [('bge', [rt, rs, target])]},
+    'bgtu': {3: lambda rs, rt, target: [('bltu', [rt, rs, target])]},
+    'bleu': {3: lambda rs, rt, target: [('bgeu', [rt, rs, target])]},
+    'j': {1: lambda target: [('jal', ['zero', target])]},
+    'jal': {1: lambda target: [('jal', ['ra', target])]},
+    'jr': {1: lambda rs: [('jalr', ['zero', f"0({rs})"])]},
+    'jalr': {1: lambda rs: [('jalr', ['ra', f"0({rs})"])]},
+    'ret': {0: lambda: [('jalr', ['zero', '0(ra)'])]},
+    # Everything fits in jal's +-1MB range (ROM plus RAM), so no auipc+jalr pair
+    'call': {1: lambda target: [('jal', ['ra', target])]},
+    'tail': {1: lambda target: [('jal', ['zero', target])]},
+}
+
+
+def expand_pseudo_instructions(statements):
+    """Replace pseudo-instructions with the real instructions they stand for.
+
+    li (and la, its alias for addresses) uses the shortest sequence for the
+    value: one addi if it fits in 12 signed bits, one lui if its low 12 bits
+    are zero, else lui + addi with the sign carry folded into the lui. Values
+    built from numbers and earlier .equ constants are known here; anything
+    involving a label gets the two-instruction form so layout stays one pass.
+
+    The first real instruction keeps the labels and source text, so line
+    numbers in errors and reports still point at the pseudo-instruction.
+
+    Raises:
+        ValueError: With the offending line number on bad operands
+    """
+    constants = {}
+    output = []
+    for statement in statements:
+        mnemonic = statement.mnemonic
+        if mnemonic in ('.equ', '.set') and len(statement.operands) == 2:
+            name, value = statement.operands
+            try:
+                constants[name] = evaluate(value, constants)
+            except ValueError:
+                # Depends on a label; _layout() resolves it
+                pass
+        try:
+            if mnemonic in ('li', 'la'):
+                rd, value = _operands(statement, 2)
+                expansion = _li(rd, value, constants)
+            elif mnemonic in PSEUDO_INSTRUCTIONS and len(statement.operands) in PSEUDO_INSTRUCTIONS[mnemonic]:
+                expansion = PSEUDO_INSTRUCTIONS[mnemonic][len(statement.operands)](*statement.operands)
+            else:
+                output.append(statement)
+                continue
+        except ValueError as error:
+            _fail(statement, error)
+
+        for index, (real, operands) in enumerate(expansion):
+            labels = statement.labels if index == 0 else []
+            output.append(Statement(statement.line_no, statement.text, labels, real, operands))
+    return output
+
+
+def _layout(statements, base_addr):
+    """First pass: assign addresses and collect label / .equ symbols."""
+    symbols = {}
+    address = base_addr
+    for statement in statements:
+        try:
+            for label in statement.labels:
+                if label in symbols:
+                    raise ValueError(f"Duplicate symbol '{label}'")
+                symbols[label] = address
+            statement.address = address
+
+            mnemonic = statement.mnemonic
+            if mnemonic is None or mnemonic in IGNORED_DIRECTIVES:
+                size = 0
+            elif mnemonic in ('.equ', '.set'):
+                name, value = _operands(statement, 2)
+                symbols[name] = evaluate(value, symbols)
+                size = 0
+            elif mnemonic == '.word':
+                size = 4 * len(statement.operands)
+            elif mnemonic in ('.zero', '.space'):
+                size = evaluate(_operands(statement, 1)[0], symbols)
+                if size < 0 or size % 4:
+                    raise ValueError(f"{mnemonic} size must be a non-negative multiple of 4")
+            elif mnemonic == '.align':
+                alignment = 1 << _check_range(evaluate(_operands(statement, 1)[0], symbols), 2, 16, "Alignment")
+                size = -(address - base_addr) % alignment
+            elif mnemonic == '.org':
+                target = base_addr + evaluate(_operands(statement, 1)[0], symbols)
+                if target < address or target % 4:
+                    raise ValueError(f".org target {target:#010x} is behind {address:#010x} or unaligned")
+                size = target - address
+            elif mnemonic.startswith('.'):
+                raise ValueError(f"Unknown directive '{mnemonic}'")
+            else:
+                size = 4
+        except ValueError as error:
+            _fail(statement, error)
+        statement.size = size
+        address += size
+    return symbols
+
+
+def assemble(source, base_addr=CPU_BASE_ADDR, passes=()):
+    """Assemble RISC-V source text into a Program.
+
+    Args:
+        source: Assembly text
+        base_addr: Address of the first word (the ROM starts at CPU_BASE_ADDR)
+        passes: Callables run in order on the parsed Statement list (with
+            pseudo-instructions already expanded) before layout, each returning the new list (e.g. hazards.NopInserter)
+
+    Raises:
+        ValueError: With the offending line number on any error
+    """
+    statements = expand_pseudo_instructions(parse(source))
+    for transform in passes:
+        statements = transform(statements)
+    symbols = _layout(statements, base_addr)
+
+    words = []
+    for statement in statements:
+        mnemonic = statement.mnemonic
+        try:
+            if mnemonic is None or mnemonic in IGNORED_DIRECTIVES or mnemonic in ('.equ', '.set'):
+                continue
+            if mnemonic == '.word':
+                words.extend(evaluate(value, symbols, statement.address) & 0xFFFFFFFF
+                             for value in statement.operands)
+            elif mnemonic == '.align':
+                words.extend([NOP] * (statement.size // 4))
+            elif mnemonic in ('.zero', '.space', '.org'):
+                words.extend([0] * (statement.size // 4))
+            else:
+                words.append(encode(statement, symbols))
+        except ValueError as error:
+            _fail(statement, error)
+
+    return Program(base_addr, words, symbols, statements)
+
+
+def write_mem_file(path, words):
+    """Write words in $readmemh format, one 8-digit hex word per line."""
+    with open(path, 'w') as f:
+        f.write(''.join(f"{word:08x}\n" for word in words))
+
+
+def write_listing_file(path, program):
+    """Write a tab-separated listing: address, labels, word count, source line number and text.
+
+    One row per emitted instruction or directive and per label, in address
+    order; labels are comma-separated or "-". A row covers its word count
+    from its address on (several for .word lists, .zero and .align).
+    tools/probe.py loads this to name sampled PCs.
+    """
+    rows = ["# address\tlabels\twords\tline\tsource\n"]
+    for statement in program.statements:
+        if not statement.size and not statement.labels:
+            continue
+        labels = ",".join(statement.labels) or "-"
+        rows.append(f"{statement.address:08x}\t{labels}\t{statement.size // 4}\t{statement.line_no}\t{statement.text.strip()}\n")
+    with open(path, 'w') as f:
+        f.write(''.join(rows))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Assemble RV32I source into a $readmemh ROM image.")
+    parser.add_argument("source", help="assembly file ('-' for stdin)")
+    parser.add_argument("-o", "--output", default="rom.mem", help="output file (default: rom.mem)")
+    parser.add_argument("-l", "--listing", help="listing file (default: output with a .lst suffix)")
+    parser.add_argument("--base", type=lambda text: int(text, 0), default=CPU_BASE_ADDR,
+                        help="address of the first word (default: 0x80000000)")
+    parser.add_argument("--insert-nops", action="store_true",
+                        help="pad load-use hazards with the minimum number of NOPs (see hazards.py)")
+    parser.add_argument("--schedule", action="store_true",
+                        help="reorder basic blocks to fill hazard slots before padding (see scheduler.py)")
+    args = parser.parse_args()
+
+    if args.source == '-':
+        source = sys.stdin.read()
+    else:
+        with open(args.source) as f:
+            source = f.read()
+
+    from hazards import NopInserter, ROM_FETCH_CYCLES, RAM_FETCH_CYCLES
+    from scheduler import ListScheduler
+    fetch_cycles = ROM_FETCH_CYCLES if args.base <= ROM_BOUNDARY_ADDR else RAM_FETCH_CYCLES
+    passes = []
+    if args.schedule:
+        passes.append(ListScheduler(fetch_cycles))
+    if args.insert_nops:
+        passes.append(NopInserter(fetch_cycles))
+
+    try:
+        program = assemble(source, args.base, passes)
+    except ValueError as error:
+        sys.exit(f"{args.source}: {error}")
+
+    if args.base <= ROM_BOUNDARY_ADDR and args.base + 4 * len(program) > ROM_BOUNDARY_ADDR + 1:
+        sys.exit(f"{args.source}: {4 * len(program)} bytes from {args.base:#010x} "
+                 f"overflow the {ROM_SIZE}-byte ROM")
+
+    for transform in passes:
+        print(transform.report())
+    write_mem_file(args.output, program.words)
+    listing = args.listing or os.path.splitext(args.output)[0] + ".lst"
+    write_listing_file(listing, program)
+    print(f"Wrote {len(program)} words to {args.output}, listing to {listing}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,22 @@
+"""Host-side client for the CPU's UART debug peripheral.
+
+    from debug_client import DebugClient, SerialTransport
+
+    client = DebugClient(SerialTransport.open("/dev/ttyUSB1"))
+    client.halt()
+    registers = client.read_registers()   # one batch of 32 READ_REGISTERs
+"""
+
+from debug_client import protocol
+from debug_client.client import AsyncDebugClient, DebugClient
+from debug_client.emulator import PtyDebugPeripheral
+from debug_client.transports import PtyTransport, SerialTransport
+
+__all__ = [
+    "AsyncDebugClient",
+    "DebugClient",
+    "PtyDebugPeripheral",
+    "PtyTransport",
+    "SerialTransport",
+    "protocol",
+]
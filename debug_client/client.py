@@ -0,0 +1,112 @@
+"""Debug clients: send protocol Commands over a transport and decode the replies.
+
+A transport has write(data), which queues the bytes of one command, and
+read(count), which returns up to count reply bytes (fewer on timeout).
+execute() writes every command of a batch before reading any reply, so the
+round trips overlap: reading all 32 registers costs one reply window, not 32.
+Replies are then read command by command as they stream in, with no fixed
+delays between them.
+
+DebugClient drives blocking transports (SerialTransport, PtyTransport);
+AsyncDebugClient drives transports whose write/read are coroutines, such as
+the cocotb ones in tests/cpu/debug_transports.py.
+"""
+
+from debug_client import protocol
+
+
+def _decode(command, reply):
+    if len(reply) != command.reply_length:
+        raise TimeoutError(f"Expected {command.reply_length} reply bytes for {command.name}, got {len(reply)}")
+    return command.decode(reply)
+
+
+class _Commands:
+    """The protocol's commands as methods, each one a batch of one."""
+
+    def reset(self):
+        return self._single(protocol.reset())
+
+    def unreset(self):
+        return self._single(protocol.unreset())
+
+    def halt(self):
+        return self._single(protocol.halt())
+
+    def unhalt(self):
+        return self._single(protocol.unhalt())
+
+    def ping(self):
+        return self._single(protocol.ping())
+
+    def read_pc(self):
+        return self._single(protocol.read_pc())
+
+    def write_pc(self, pc):
+        return self._single(protocol.write_pc(pc))
+
+    def read_register(self, index):
+        return self._single(protocol.read_register(index))
+
+    def write_register(self, index, value):
+        return self._single(protocol.write_register(index, value))
+
+    def dump_state(self):
+        return self._single(protocol.dump_state())
+
+    def read_registers(self, indices=range(protocol.NUM_REGISTERS)):
+        """Read several registers in one batch; returns their values in order."""
+        return self.execute([protocol.read_register(index) for index in indices])
+
+    def write_registers(self, values):
+        """Write {index: value} in one batch."""
+        return self.execute([protocol.write_register(index, value) for index, value in values.items()])
+
+
+class DebugClient(_Commands):
+    """Debug client over a blocking transport.
+
+    Args:
+        transport: Object with write(data) and read(count) -> bytes
+    """
+
+    def __init__(self, transport):
+        self.transport = transport
+
+    def execute(self, commands):
+        """Send commands back to back, then read and decode all their replies.
+
+        Returns:
+            One result per command, in order
+
+        Raises:
+            TimeoutError: If the transport returned fewer reply bytes than expected
+        """
+        commands = list(commands)
+        for command in commands:
+            self.transport.write(command.request)
+        # Replies stream back in command order: decode each as soon as its bytes are in
+        return [_decode(command, self.transport.read(command.reply_length)) for command in commands]
+
+    def _single(self, command):
+        return self.execute([command])[0]
+
+
+class AsyncDebugClient(_Commands):
+    """Debug client over a transport whose write() and read() are coroutines.
+
+    Every method returns a coroutine: result = await client.read_pc()
+    """
+
+    def __init__(self, transport):
+        self.transport = transport
+
+    async def execute(self, commands):
+        """Async version of DebugClient.execute()."""
+        commands = list(commands)
+        for command in commands:
+            await self.transport.write(command.request)
+        return [_decode(command, await self.transport.read(command.reply_length)) for command in commands]
+
+    async def _single(self, command):
+        return (await self.execute([command]))[0]
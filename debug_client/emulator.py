@@ -0,0 +1,145 @@
+"""Pty stand-in for the board: the debug protocol served from a Python model.
+
+PtyDebugPeripheral opens a pseudo-terminal and answers commands on it the
+way debug_peripheral.v would, from a model holding a PC, a register file and
+the halt/reset flags. Anything that can open a serial port can then run
+without hardware; the model is not a CPU, so the PC only moves by WRITE_PC
+and by step() while unhalted.
+
+    python -m debug_client.emulator     # prints the pty path, serves until Ctrl-C
+    tools/probe.py /dev/pts/N
+"""
+
+import os
+import select
+import threading
+import tty
+
+from debug_client import protocol
+
+# Arguments each opcode takes; everything else is a single byte
+ARGUMENT_BYTES = {protocol.OP_WRITE_PC: 4, protocol.OP_READ_REGISTER: 1, protocol.OP_WRITE_REGISTER: 5}
+
+# Seconds the serving thread waits for input before checking for stop()
+POLL_INTERVAL = 0.05
+
+
+class PtyDebugPeripheral:
+    """Debug protocol model served on the master side of a pty.
+
+    Args:
+        pc: Initial PC
+    """
+
+    def __init__(self, pc=0x80000000):
+        self.pc = pc
+        self.registers = [0] * protocol.NUM_REGISTERS
+        self.halted = False
+        self.in_reset = False
+        self.commands = 0
+        self._master, self._slave = os.openpty()
+        tty.setraw(self._master)
+        self.port = os.ttyname(self._slave)
+        self._thread = None
+        self._running = False
+
+    def start(self):
+        """Serve commands on a background thread."""
+        self._running = True
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop serving and close the pty; safe to call without start()."""
+        self._running = False
+        try:
+            # The reader notices within POLL_INTERVAL: it gets no EOF while
+            # another process (a client) still has the slave open
+            os.close(self._slave)
+            if self._thread is not None:
+                self._thread.join()
+                self._thread = None
+        finally:
+            os.close(self._master)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def step(self):
+        """Advance the PC one instruction if the CPU is running."""
+        if not self.halted and not self.in_reset:
+            self.pc = (self.pc + 4) & 0xFFFFFFFF
+
+    def execute(self, opcode, arguments):
+        """Apply one command to the model and return its reply bytes."""
+        self.commands += 1
+        if opcode == protocol.OP_RESET:
+            self.in_reset = True
+        elif opcode == protocol.OP_UNRESET:
+            self.in_reset = False
+        elif opcode == protocol.OP_HALT:
+            self.halted = True
+        elif opcode == protocol.OP_UNHALT:
+            self.halted = False
+        elif opcode == protocol.OP_PING:
+            return bytes([protocol.PING_RESPONSE_BYTE])
+        elif opcode == protocol.OP_READ_PC:
+            return self.pc.to_bytes(4, "little")
+        elif opcode == protocol.OP_WRITE_PC:
+            self.halted = True
+            self.pc = int.from_bytes(arguments, "little")
+        elif opcode == protocol.OP_READ_REGISTER:
+            self.halted = True
+            return self.registers[arguments[0] & 0x1F].to_bytes(4, "little")
+        elif opcode == protocol.OP_WRITE_REGISTER:
+            self.halted = True
+            index = arguments[0] & 0x1F
+            if index:
+                self.registers[index] = int.from_bytes(arguments[1:], "little")
+        elif opcode == protocol.OP_DUMP_STATE:
+            # Flushed and idle when halted, fetching otherwise; calibration done
+            flushed = 0x10 if self.halted else 0x04
+            return bytes([flushed, 0x20])
+        return b""
+
+    def _serve(self):
+        pending = bytearray()
+        while self._running:
+            try:
+                if not select.select([self._master], [], [], POLL_INTERVAL)[0]:
+                    continue
+                data = os.read(self._master, 4096)
+            except OSError:
+                return
+            if not data:
+                return
+            pending += data
+            while pending:
+                needed = 1 + ARGUMENT_BYTES.get(pending[0], 0)
+                if len(pending) < needed:
+                    break
+                reply = self.execute(pending[0], bytes(pending[1:needed]))
+                del pending[:needed]
+                if reply:
+                    os.write(self._master, reply)
+
+
+def main():
+    import time
+    peripheral = PtyDebugPeripheral().start()
+    print(f"Debug peripheral stand-in on {peripheral.port} (Ctrl-C to stop)")
+    try:
+        while True:
+            time.sleep(0.001)
+            peripheral.step()
+    except KeyboardInterrupt:
+        pass
+    peripheral.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""Byte-level protocol of the debug peripheral (hdl/debug_peripheral).
+
+Every command is an opcode byte followed by its argument bytes; commands that
+answer put a fixed number of reply bytes on the UART. Multi-byte values are
+little-endian. The functions below build Command objects without doing any
+I/O, so the same commands can go over a serial port, a pty or a cocotb
+harness.
+"""
+
+OP_NOP = 0x00
+OP_RESET = 0x01
+OP_UNRESET = 0x02
+OP_HALT = 0x03
+OP_UNHALT = 0x04
+OP_PING = 0x05
+OP_READ_PC = 0x06
+OP_WRITE_PC = 0x07
+OP_READ_REGISTER = 0x08
+OP_WRITE_REGISTER = 0x09
+OP_DUMP_STATE = 0x0A
+
+PING_RESPONSE_BYTE = 0xAA
+
+NUM_REGISTERS = 32
+
+# DUMP_STATE fields: memory_axi.v and instruction_memory_axi.v state machines
+DATA_MEM_STATES = {0: "IDLE", 1: "RD_SUBMIT", 2: "RD_AWAIT", 3: "RD_OK",
+                   4: "WR_SUBMIT", 5: "WR_AWAIT", 6: "WR_OK", 7: "MEM_ERR"}
+INSTR_MEM_STATES = {0: "IDLE", 1: "RD_SUBMIT", 2: "RD_AWAIT", 3: "RD_OK"}
+
+
+class Command:
+    """One debug command: the bytes to send and how to read its reply.
+
+    Args:
+        name: Opcode name, for messages
+        request: Opcode and argument bytes
+        reply_length: Number of bytes the peripheral answers with
+        decode: Turns the reply bytes into the command's result (None when omitted)
+    """
+
+    __slots__ = ("name", "request", "reply_length", "decode")
+
+    def __init__(self, name, request, reply_length=0, decode=None):
+        self.name = name
+        self.request = bytes(request)
+        self.reply_length = reply_length
+        self.decode = decode if decode is not None else (lambda reply: None)
+
+    def __repr__(self):
+        return f"Command({self.name}, {self.request.hex()})"
+
+
+def _word(value):
+    return (value & 0xFFFFFFFF).to_bytes(4, "little")
+
+
+def _unsigned(reply):
+    return int.from_bytes(reply, "little")
+
+
+def _check_register(index):
+    if not 0 <= index < NUM_REGISTERS:
+        raise ValueError(f"Register index must be 0-{NUM_REGISTERS - 1}, got {index}")
+
+
+def decode_state(reply):
+    """Decode the two DUMP_STATE bytes into named pipeline/memory fields."""
+    b0, b1 = reply[0], reply[1]
+    return {
+        "data_mem":         DATA_MEM_STATES[(b0 >> 5) & 0x7],
+        "pipeline_flushed": bool(b0 & 0x10),
+        "stall_s1":         bool(b0 & 0x08),
+        "enable_fetch":     bool(b0 & 0x04),
+        "s2_valid":         bool(b0 & 0x02),
+        "s3_valid":         bool(b0 & 0x01),
+        "instr_mem":        INSTR_MEM_STATES[(b1 >> 6) & 0x3],
+        "init_calib":       bool(b1 & 0x20),
+    }
+
+
+def reset():
+    return Command("RESET", [OP_RESET])
+
+
+def unreset():
+    return Command("UNRESET", [OP_UNRESET])
+
+
+def halt():
+    return Command("HALT", [OP_HALT])
+
+
+def unhalt():
+    return Command("UNHALT", [OP_UNHALT])
+
+
+def ping():
+    """PING; its result is whether the peripheral answered PING_RESPONSE_BYTE."""
+    return Command("PING", [OP_PING], 1, lambda reply: reply[0] == PING_RESPONSE_BYTE)
+
+
+def read_pc():
+    return Command("READ_PC", [OP_READ_PC], 4, _unsigned)
+
+
+def write_pc(pc):
+    """WRITE_PC; the peripheral halts the CPU to apply it."""
+    return Command("WRITE_PC", bytes([OP_WRITE_PC]) + _word(pc))
+
+
+def read_register(index):
+    """READ_REGISTER of x<index>; leaves the CPU halted.
+
+    Raises:
+        ValueError: If index is not 0-31
+    """
+    _check_register(index)
+    return Command("READ_REGISTER", [OP_READ_REGISTER, index], 4, _unsigned)
+
+
+def write_register(index, value):
+    """WRITE_REGISTER of x<index>; leaves the CPU halted, writes to x0 are ignored.
+
+    Raises:
+        ValueError: If index is not 0-31
+    """
+    _check_register(index)
+    return Command("WRITE_REGISTER", bytes([OP_WRITE_REGISTER, index]) + _word(value))
+
+
+def dump_state():
+    """DUMP_STATE; its result is decode_state() of the two reply bytes."""
+    return Command("DUMP_STATE", [OP_DUMP_STATE], 2, decode_state)
@@ -0,0 +1,98 @@
+"""Blocking transports for DebugClient: a pyserial port or a raw tty path.
+
+Both hold written commands until the next read() and then send them in one
+write, so a batch leaves the host as a single burst.
+"""
+
+import os
+import select
+import time
+
+UART_BAUD_RATE = 115200
+
+
+class _BufferedTransport:
+    def __init__(self):
+        self._pending = bytearray()
+
+    def write(self, data):
+        """Queue the bytes of one command; they are sent by the next read()."""
+        self._pending += data
+
+    def read(self, count):
+        """Send the queued commands, then wait for count reply bytes (fewer on timeout)."""
+        if self._pending:
+            self._send(bytes(self._pending))
+            self._pending.clear()
+        if count == 0:
+            return b""
+        return self._receive(count)
+
+
+class SerialTransport(_BufferedTransport):
+    """Debug port on a pyserial Serial object.
+
+    Args:
+        port: An open serial.Serial; its timeout bounds each read()
+    """
+
+    def __init__(self, port):
+        super().__init__()
+        self.port = port
+
+    @classmethod
+    def open(cls, path, baudrate=UART_BAUD_RATE, timeout=0.5):
+        """Open path with pyserial (imported here, so the package works without it)."""
+        import serial
+        return cls(serial.Serial(path, baudrate, timeout=timeout))
+
+    def reset_input(self):
+        """Drop anything already received, e.g. a reply to an earlier session."""
+        self.port.reset_input_buffer()
+
+    def close(self):
+        self.port.close()
+
+    def _send(self, data):
+        self.port.write(data)
+
+    def _receive(self, count):
+        return self.port.read(count)
+
+
+class PtyTransport(_BufferedTransport):
+    """Debug port on a tty device opened directly (e.g. a pty from PtyDebugPeripheral).
+
+    Args:
+        path: Device path
+        timeout: Seconds read() waits for the full reply
+    """
+
+    def __init__(self, path, timeout=0.5):
+        import tty
+        super().__init__()
+        self.timeout = timeout
+        self.fd = os.open(path, os.O_RDWR | os.O_NOCTTY)
+        tty.setraw(self.fd)
+
+    def reset_input(self):
+        while select.select([self.fd], [], [], 0)[0]:
+            os.read(self.fd, 4096)
+
+    def close(self):
+        os.close(self.fd)
+
+    def _send(self, data):
+        view = memoryview(data)
+        while view:
+            view = view[os.write(self.fd, view):]
+
+    def _receive(self, count):
+        reply = bytearray()
+        deadline = time.monotonic() + self.timeout
+        while len(reply) < count:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not select.select([self.fd], [], [], remaining)[0]:
+                break
+            reply += os.read(self.fd, count - len(reply))
+        return bytes(reply)
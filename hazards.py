@@ -0,0 +1,220 @@
+"""Pipeline hazard model of cpu.v and the automatic NOP insertion pass.
+
+cpu.v has three stages, no interlocks and no forwarding apart from the
+write-through register file:
+
+    S1  fetch / decode / execute   reads rs1/rs2 and computes the ALU result
+    S2  memory / wait              a load or store stalls S1 until it completes
+    S3  writeback                  the written value is readable in S1 that cycle
+
+Fetching takes at least two cycles (ROM: IDLE -> READ_SUCCESS), so an ALU
+result is always in S3 by the time the next instruction is in S1. Loads are
+different: the fetch state machine keeps running while S2 stalls, so the next
+instruction can already be in S1 on the cycle the read completes, one cycle
+before the data reaches S3. Whether it is depends on memory latency, so an
+instruction that reads a load's rd must not directly follow the load. Taken
+branches and jumps drain the pipeline before fetching the target, so hazards
+never carry across them.
+
+    inserter = NopInserter()
+    program = assemble(source, passes=[inserter])
+    print(inserter.report())
+"""
+
+from assembler import (
+    BRANCHES,
+    I_TYPE_ALU,
+    LOADS,
+    R_TYPE,
+    SHIFT_IMM,
+    STORES,
+    Statement,
+    parse_register,
+    split_memory_operand,
+)
+
+ROM_FETCH_CYCLES = 2  # IDLE -> READ_SUCCESS
+RAM_FETCH_CYCLES = 5  # IDLE -> READ_SUBMITTING -> READ_AWAITING -> READ_SUCCESS against axil_ram
+
+# Cycles from an instruction entering S1 until the next one does, measured on
+# the integration harness (taken branches cost the same as jumps).
+ISSUE_CYCLES = {
+    ROM_FETCH_CYCLES: {"alu": 2, "load": 6, "store": 4, "branch": 2, "jump": 5},
+    RAM_FETCH_CYCLES: {"alu": 5, "load": 5, "store": 5, "branch": 5, "jump": 8},
+}
+
+# S1 -> S2 -> S3: an ALU result can be read two cycles after it was computed
+ALU_RESULT_CYCLES = 2
+
+
+def result_cycles(kind, fetch_cycles):
+    """Worst-case cycles from a producer entering S1 until its rd is readable in S1.
+
+    For a load the worst case is memory completing just as the next instruction
+    is fetched, with the data reaching S3 one cycle later.
+    """
+    if kind == "load":
+        return fetch_cycles + 1
+    return ALU_RESULT_CYCLES
+
+
+def _base(operand):
+    return split_memory_operand(operand)[1]
+
+
+def register_usage(statement):
+    """Classify an instruction Statement.
+
+    Returns:
+        (kind, reads, write): kind is one of "alu", "load", "store", "branch",
+        "jump", or None for labels and directives; reads is a tuple of source
+        register numbers; write is the destination register number or None.
+        x0 is never reported as read or written.
+
+    Raises:
+        ValueError: On unknown mnemonics or malformed operands
+    """
+    mnemonic = statement.mnemonic
+    operands = statement.operands
+    if mnemonic is None or mnemonic.startswith('.'):
+        return None, (), None
+
+    if mnemonic in R_TYPE:
+        kind, write, reads = "alu", operands[0], operands[1:3]
+    elif mnemonic in I_TYPE_ALU or mnemonic in SHIFT_IMM:
+        kind, write, reads = "alu", operands[0], operands[1:2]
+    elif mnemonic in ('lui', 'auipc'):
+        kind, write, reads = "alu", operands[0], []
+    elif mnemonic in LOADS:
+        kind, write, reads = "load", operands[0], [_base(operands[1])]
+    elif mnemonic in STORES:
+        kind, write, reads = "store", None, [operands[0], _base(operands[1])]
+    elif mnemonic in BRANCHES:
+        kind, write, reads = "branch", None, operands[0:2]
+    elif mnemonic == 'jal':
+        kind, write, reads = "jump", operands[0], []
+    elif mnemonic == 'jalr':
+        base = operands[1] if len(operands) == 3 else _base(operands[1])
+        kind, write, reads = "jump", operands[0], [base]
+    else:
+        raise ValueError(f"Unknown instruction '{mnemonic}'")
+
+    reads = tuple(number for number in map(parse_register, reads) if number != 0)
+    write = parse_register(write) if write is not None else 0
+    return kind, reads, write or None
+
+
+def estimate_cycles(statements, fetch_cycles=ROM_FETCH_CYCLES):
+    """Estimated cycles to run straight through statements once, including hazard padding.
+
+    Branches are counted as not taken and jumps as taken.
+    """
+    issue = ISSUE_CYCLES[fetch_cycles]
+    inserter = NopInserter(fetch_cycles)
+    cycles = 0
+    for statement in inserter(list(statements)):
+        kind = register_usage(statement)[0]
+        if kind is not None:
+            cycles += issue[kind]
+    return cycles
+
+
+def nop_statement(like, reason):
+    """A NOP Statement attributed to the source line of `like`."""
+    return Statement(like.line_no, f"    nop  # inserted: {reason}", [], 'addi', ['zero', 'zero', '0'])
+
+
+class Hazard:
+    """A RAW dependency that needed padding."""
+
+    def __init__(self, producer, consumer, register, nops):
+        self.producer = producer
+        self.consumer = consumer
+        self.register = register
+        self.nops = nops
+
+    def __repr__(self):
+        return (f"Hazard(x{self.register}: line {self.producer.line_no} -> "
+                f"line {self.consumer.line_no}, {self.nops} nop)")
+
+
+class NopInserter:
+    """Assembler pass that pads RAW hazards with the minimum number of NOPs.
+
+    Instructions are given worst-case S1 entry times (one fetch apart) and
+    every source register is checked against the cycle its last producer's
+    result becomes readable. NOPs go directly after the previous instruction,
+    i.e. before any labels on the consumer, so only the fall-through path
+    pays for them. Only a jump ends the window of a producer; directives,
+    even ones that emit bytes, do not.
+
+    Args:
+        fetch_cycles: ROM_FETCH_CYCLES or RAM_FETCH_CYCLES, depending on where
+            the program runs from; used for both the model and the cost report
+    """
+
+    def __init__(self, fetch_cycles=ROM_FETCH_CYCLES):
+        self.fetch_cycles = fetch_cycles
+        self.hazards = []
+
+    @property
+    def nops(self):
+        return sum(hazard.nops for hazard in self.hazards)
+
+    @property
+    def cycles(self):
+        """Cycles the padding costs each time every inserted NOP executes once."""
+        return self.nops * ISSUE_CYCLES[self.fetch_cycles]["alu"]
+
+    def __call__(self, statements):
+        self.hazards = []
+        output = []
+        # register -> (producer statement, cycle its value is readable)
+        pending = {}
+        cycle = 0
+        insert_at = 0
+
+        for statement in statements:
+            try:
+                kind, reads, write = register_usage(statement)
+            except ValueError:
+                # Leave reporting malformed instructions to the encoder
+                kind = None
+            if kind is None:
+                # Directives keep loads in flight: padding they emit only
+                # delays the consumer, so the check stays on the safe side
+                output.append(statement)
+                continue
+
+            stall = 0
+            culprit = None
+            for register in reads:
+                if register in pending:
+                    producer, ready = pending[register]
+                    if ready - cycle > stall:
+                        stall, culprit = ready - cycle, (producer, register)
+            if culprit is not None:
+                nops = -(-stall // self.fetch_cycles)
+                producer, register = culprit
+                reason = f"x{register} from line {producer.line_no}"
+                output[insert_at:insert_at] = [nop_statement(statement, reason) for _ in range(nops)]
+                self.hazards.append(Hazard(producer, statement, register, nops))
+                cycle += nops * self.fetch_cycles
+
+            output.append(statement)
+            insert_at = len(output)
+            if write is not None:
+                pending[write] = (statement, cycle + result_cycles(kind, self.fetch_cycles))
+            cycle += self.fetch_cycles
+            if kind == "jump":
+                pending.clear()
+
+        return output
+
+    def report(self):
+        lines = [f"Inserted {self.nops} NOP(s) for {len(self.hazards)} hazard(s), "
+                 f"costing {self.cycles} cycles per pass"]
+        for hazard in self.hazards:
+            lines.append(f"  line {hazard.consumer.line_no}: x{hazard.register} written on line "
+                         f"{hazard.producer.line_no}, {hazard.nops} NOP(s)")
+        return "\n".join(lines)
@@ -144,7 +144,8 @@ module control_unit (
           o_Flush_Pipeline = 1'b0;
           case (i_Funct3)
             FUNC3_ALU_ADD_SUB: begin
-              o_Alu_Select = (i_Funct7_Bit_5) ? ALU_SEL_SUB : ALU_SEL_ADD;
+              // No SUBI: bit 30 is imm[10] here, not funct7
+              o_Alu_Select = ALU_SEL_ADD;
               o_Cmp_Select = CMP_SEL_UNKNOWN;
               o_Reg_Write_Select = REG_WRITE_ALU;
             end
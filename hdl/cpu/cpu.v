@@ -2,7 +2,9 @@
 `include "cpu_core_params.vh"
 `include "memory.vh"
 
-module cpu (
+module cpu #(
+    parameter UART_CLKS_PER_BIT = UART_CLOCKS_PER_BIT
+) (
     input i_Reset,
     input i_Clock,
     input i_Init_Calib_Complete,
@@ -375,10 +377,15 @@ module cpu (
 
   /*----------------DEBUG PERIPHERAL----------------*/
 
-  debug_peripheral debug_peripheral (
+  debug_peripheral #(
+      .UART_CLKS_PER_BIT(UART_CLKS_PER_BIT)
+  ) debug_peripheral (
       .i_Reset(i_Reset),
       .i_Clock(i_Clock),
       .i_Uart_Tx_In(i_Uart_Tx_In),
+      // Simulation backdoor only: test harnesses force these
+      .i_Cmd_DV(1'b0),
+      .i_Cmd_Byte(8'b0),
 
       .i_PC(r_PC),
       .i_Pipeline_Flushed(w_Pipeline_Flushed),
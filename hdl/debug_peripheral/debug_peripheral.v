@@ -2,13 +2,19 @@
 `include "cpu_core_params.vh"
 `include "debug_peripheral.vh"
 
-module debug_peripheral (
+module debug_peripheral #(
+    parameter UART_CLKS_PER_BIT = UART_CLOCKS_PER_BIT
+) (
     input i_Clock,
     input i_Reset,
 
     input  i_Uart_Tx_In,
     output o_Uart_Rx_Out,
 
+    // Command bytes that bypass the UART (simulation backdoor, tie to 0)
+    input i_Cmd_DV,
+    input [7:0] i_Cmd_Byte,
+
     input [31:0] i_PC,
     input i_Pipeline_Flushed,
     input [2:0] i_Mem_AXI_State,
@@ -39,7 +45,9 @@ module debug_peripheral (
 
   wire w_Rx_DV;
   wire [7:0] w_Rx_Byte;
-  uart_receiver uart_receiver (
+  uart_receiver #(
+      .CLKS_PER_BIT(UART_CLKS_PER_BIT)
+  ) uart_receiver (
       .i_Reset(i_Reset),
       .i_Clock(i_Clock),
       .i_Rx_Serial(i_Uart_Tx_In),
@@ -47,6 +55,10 @@ module debug_peripheral (
       .o_Rx_Byte(w_Rx_Byte)
   );
 
+  // A backdoor byte takes the place of a received one
+  wire w_Cmd_DV = w_Rx_DV | i_Cmd_DV;
+  wire [7:0] w_Cmd_Byte = i_Cmd_DV ? i_Cmd_Byte : w_Rx_Byte;
+
   /* ----------------UART_TRANSMITTER---------------- */
 
   // Input buffer (Stack)
@@ -62,7 +74,9 @@ module debug_peripheral (
   reg [7:0] r_Tx_Byte = 0;
   wire w_Tx_Done;
 
-  uart_transmitter uart_transmitter (
+  uart_transmitter #(
+      .CLKS_PER_BIT(UART_CLKS_PER_BIT)
+  ) uart_transmitter (
       .i_Reset(i_Reset),
       .i_Clock(i_Clock),
       .i_Tx_DV(r_Tx_DV),
@@ -94,6 +108,12 @@ module debug_peripheral (
   reg [ 7:0] r_Op_Code = 0;
   reg [31:0] r_Exec_Counter = 0;
 
+  // PC and DUMP_STATE bytes sampled on the cycle a command is accepted, so
+  // READ_PC and DUMP_STATE describe one cycle even while the CPU runs (neither
+  // command halts it)
+  reg [31:0] r_PC_Sample = 0;
+  reg [15:0] r_State_Sample = 0;
+
   always @(posedge i_Clock, posedge i_Reset) begin
     if (i_Reset) begin
       r_State <= s_IDLE;
@@ -101,6 +121,8 @@ module debug_peripheral (
       o_Halt_Cpu <= 0;
       o_Reset_Cpu <= 0;
       r_Exec_Counter <= 0;
+      r_PC_Sample <= 0;
+      r_State_Sample <= 0;
       output_buffer_head <= 0;
       input_buffer_head <= 0;
       o_Write_PC_Enable <= 0;
@@ -108,11 +130,23 @@ module debug_peripheral (
     end else begin
       case (r_State)
         s_IDLE: begin
-          if (w_Rx_DV) begin
-            r_Op_Code <= w_Rx_Byte;
+          if (w_Cmd_DV) begin
+            r_Op_Code <= w_Cmd_Byte;
             r_State <= s_DECODE_AND_EXECUTE;
             r_Exec_Counter <= 0;
             input_buffer_head <= 0;
+            r_PC_Sample <= i_PC;
+            r_State_Sample <= {
+              i_Mem_AXI_State,
+              i_Pipeline_Flushed,
+              i_Stall_S1,
+              i_Enable_Instruction_Fetch,
+              i_S2_Valid,
+              i_S3_Valid,
+              i_Instr_Mem_AXI_State,
+              i_Init_Calib_Complete,
+              5'b0
+            };
           end
         end
         s_DECODE_AND_EXECUTE: begin
@@ -145,19 +179,19 @@ module debug_peripheral (
             op_READ_PC: begin
               case (r_Exec_Counter)
                 0: begin
-                  output_buffer[output_buffer_head] <= i_PC[7:0];
+                  output_buffer[output_buffer_head] <= r_PC_Sample[7:0];
                   output_buffer_head <= output_buffer_head + 1;
                 end
                 1: begin
-                  output_buffer[output_buffer_head] <= i_PC[15:8];
+                  output_buffer[output_buffer_head] <= r_PC_Sample[15:8];
                   output_buffer_head <= output_buffer_head + 1;
                 end
                 2: begin
-                  output_buffer[output_buffer_head] <= i_PC[23:16];
+                  output_buffer[output_buffer_head] <= r_PC_Sample[23:16];
                   output_buffer_head <= output_buffer_head + 1;
                 end
                 3: begin
-                  output_buffer[output_buffer_head] <= i_PC[31:24];
+                  output_buffer[output_buffer_head] <= r_PC_Sample[31:24];
                   output_buffer_head <= output_buffer_head + 1;
                 end
                 default: begin
@@ -167,8 +201,8 @@ module debug_peripheral (
             end
             op_WRITE_PC: begin
               o_Halt_Cpu <= 1;
-              if (w_Rx_DV) begin
-                input_buffer[input_buffer_head] <= w_Rx_Byte;
+              if (w_Cmd_DV) begin
+                input_buffer[input_buffer_head] <= w_Cmd_Byte;
                 input_buffer_head <= input_buffer_head + 1;
               end
               if (i_Pipeline_Flushed && input_buffer_head == 4) begin
@@ -185,8 +219,8 @@ module debug_peripheral (
             end
             op_READ_REGISTER: begin
               o_Halt_Cpu <= 1;
-              if (w_Rx_DV) begin
-                input_buffer[input_buffer_head] <= w_Rx_Byte;
+              if (w_Cmd_DV) begin
+                input_buffer[input_buffer_head] <= w_Cmd_Byte;
                 input_buffer_head <= input_buffer_head + 1;
               end
               if (i_Pipeline_Flushed && input_buffer_head > 0) begin
@@ -207,8 +241,8 @@ module debug_peripheral (
             end
             op_WRITE_REGISTER: begin
               o_Halt_Cpu <= 1;
-              if (w_Rx_DV) begin
-                input_buffer[input_buffer_head] <= w_Rx_Byte;
+              if (w_Cmd_DV) begin
+                input_buffer[input_buffer_head] <= w_Cmd_Byte;
                 input_buffer_head <= input_buffer_head + 1;
               end
               if (i_Pipeline_Flushed && input_buffer_head == 5) begin
@@ -227,22 +261,11 @@ module debug_peripheral (
             op_DUMP_STATE: begin
               case (r_Exec_Counter)
                 0: begin
-                  output_buffer[output_buffer_head] <= {
-                    i_Mem_AXI_State,
-                    i_Pipeline_Flushed,
-                    i_Stall_S1,
-                    i_Enable_Instruction_Fetch,
-                    i_S2_Valid,
-                    i_S3_Valid
-                  };
+                  output_buffer[output_buffer_head] <= r_State_Sample[15:8];
                   output_buffer_head <= output_buffer_head + 1;
                 end
                 1: begin
-                  output_buffer[output_buffer_head] <= {
-                    i_Instr_Mem_AXI_State,
-                    i_Init_Calib_Complete,
-                    5'b0
-                  };
+                  output_buffer[output_buffer_head] <= r_State_Sample[7:0];
                   output_buffer_head <= output_buffer_head + 1;
                 end
                 default: begin
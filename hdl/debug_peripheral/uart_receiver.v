@@ -1,7 +1,9 @@
 `timescale 1ns / 1ps
 `include "cpu_core_params.vh"
 
-module uart_receiver (
+module uart_receiver #(
+    parameter CLKS_PER_BIT = UART_CLOCKS_PER_BIT
+) (
     input i_Reset,
     input i_Clock,
     input i_Rx_Serial,
@@ -51,7 +53,7 @@ module uart_receiver (
           r_SM_Main <= r_Rx_Data == 1'b0 ? s_RX_START_BIT : s_IDLE;
         end
         s_RX_START_BIT: begin
-          if (r_Clock_Count == (UART_CLOCKS_PER_BIT[15:0] - 1) / 2) begin
+          if (r_Clock_Count == (CLKS_PER_BIT[15:0] - 1) / 2) begin
             if (r_Rx_Data == 1'b0) begin
               r_Clock_Count <= 0;
               r_SM_Main <= s_RX_DATA_BITS;
@@ -62,7 +64,7 @@ module uart_receiver (
           end
         end
         s_RX_DATA_BITS: begin
-          if (r_Clock_Count < UART_CLOCKS_PER_BIT[15:0] - 1) begin
+          if (r_Clock_Count < CLKS_PER_BIT[15:0] - 1) begin
             r_Clock_Count <= r_Clock_Count + 1;
             r_SM_Main <= s_RX_DATA_BITS;
           end else begin
@@ -78,7 +80,7 @@ module uart_receiver (
           end
         end
         s_RX_STOP_BIT: begin
-          if (r_Clock_Count < UART_CLOCKS_PER_BIT[15:0] - 1) begin
+          if (r_Clock_Count < CLKS_PER_BIT[15:0] - 1) begin
             r_Clock_Count <= r_Clock_Count + 1;
             r_SM_Main     <= s_RX_STOP_BIT;
           end else begin
@@ -1,7 +1,9 @@
 `timescale 1ns / 1ps
 `include "cpu_core_params.vh"
 
-module uart_transmitter (
+module uart_transmitter #(
+    parameter CLKS_PER_BIT = UART_CLOCKS_PER_BIT
+) (
     input i_Reset,
     input i_Clock,
     input i_Tx_DV,
@@ -46,7 +48,7 @@ module uart_transmitter (
         end
         s_TX_START_BIT: begin
           o_Tx_Serial <= 1'b0;  // Start bit
-          if (r_Clock_Count < UART_CLOCKS_PER_BIT[15:0] - 1) begin
+          if (r_Clock_Count < CLKS_PER_BIT[15:0] - 1) begin
             r_Clock_Count <= r_Clock_Count + 1;
             r_SM_Main <= s_TX_START_BIT;
           end else begin
@@ -56,7 +58,7 @@ module uart_transmitter (
         end
         s_TX_DATA_BITS: begin
           o_Tx_Serial <= r_Tx_Byte[r_Bit_Index];
-          if (r_Clock_Count < UART_CLOCKS_PER_BIT[15:0] - 1) begin
+          if (r_Clock_Count < CLKS_PER_BIT[15:0] - 1) begin
             r_Clock_Count <= r_Clock_Count + 1;
             r_SM_Main <= s_TX_DATA_BITS;
           end else begin
@@ -72,7 +74,7 @@ module uart_transmitter (
         end
         s_TX_STOP_BIT: begin
           o_Tx_Serial <= 1'b1;  // Stop bit
-          if (r_Clock_Count < UART_CLOCKS_PER_BIT[15:0] - 1) begin
+          if (r_Clock_Count < CLKS_PER_BIT[15:0] - 1) begin
             r_Clock_Count <= r_Clock_Count + 1;
             r_SM_Main <= s_TX_STOP_BIT;
           end else begin
@@ -0,0 +1,14 @@
+import os
+import sys
+
+import cocotb
+
+import perf_records
+
+# cpu.constants takes the debug opcodes from debug_client, and tests use the
+# assembler: both live in the repo root, which need not be on PYTHONPATH
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+
+# Imported by cocotb's test discovery: record the cost of every test
+if cocotb.top is not None:
+    perf_records.install()
@@ -0,0 +1,319 @@
+"""Sparse paged memory and the cocotb AXI-Lite slave that serves it to the CPU.
+
+The harness' axil_ram only sees the low 16 bits of the data address, so tests
+are limited to a 64KB window and cannot reach FRAMEBUFFER_0_ADDR. AxiLiteMemory
+takes over the CPU's data port instead (the harness muxes it in while
+r_External_Data_Memory is set) and answers from a SparseMemory covering the
+whole 32-bit map of docs/architecture.md. Pages are 4KB and allocated on
+first write, so a 640x480x16bpp framebuffer fill costs 150 pages, not 128MB.
+
+    memory = SparseMemory()
+    slave = AxiLiteMemory(dut, memory)
+    slave.start()
+    ...
+    pixels = memory.read_array(FRAMEBUFFER_0_ADDR, 640 * 480 * 2)
+    slave.stop()
+
+The instruction port can be taken over the same way (port=INSTRUCTION_PORT,
+muxed by r_External_Instruction_Memory), so one SparseMemory can hold both
+the program and its data, as the DDR3 does on the board.
+
+The slave samples the CPU's requests on the falling clock edge and drives its
+responses there, so every handshake completes on the next rising edge with
+the same timing as axil_ram: ready one cycle after valid, read data or write
+response one cycle later. Give it a controller (cpu/ddr3_model.py) to add
+DDR3-like latency on top.
+"""
+
+import cocotb
+import numpy as np
+from cocotb.triggers import FallingEdge, First, RisingEdge
+
+PAGE_SHIFT = 12
+PAGE_SIZE = 1 << PAGE_SHIFT
+PAGE_MASK = PAGE_SIZE - 1
+MASK_32 = 0xFFFFFFFF
+
+DATA_PORT = "data"
+INSTRUCTION_PORT = "instruction"
+
+
+class MemorySnapshot:
+    """Frozen page table of a SparseMemory, taken by SparseMemory.snapshot().
+
+    The pages are shared with the memory it was taken from, never copied;
+    the memory copies a page the first time it writes to it afterwards.
+    """
+
+    def __init__(self, pages):
+        self.pages = pages  # page number -> bytearray(PAGE_SIZE), never written
+
+    @property
+    def allocated_bytes(self):
+        return len(self.pages) * PAGE_SIZE
+
+
+class SparseMemory:
+    """Little-endian 32-bit byte address space stored as lazily allocated 4KB pages.
+
+    Reading an address that was never written returns zero without
+    allocating its page. snapshot() and restore() are copy-on-write, so a
+    test can fork from a booted image and pay only for the pages it writes:
+
+        booted = memory.snapshot()      # once per module
+        ...
+        memory.restore(booted)          # per test, O(pages written since)
+    """
+
+    def __init__(self):
+        self.pages = {}  # page number -> bytearray(PAGE_SIZE)
+        self._owned = set()  # pages not shared with _base, safe to write in place
+        self._base = None  # snapshot the pages not in _owned come from
+
+    def _page(self, address):
+        """The page containing address, made private to this memory for writing."""
+        number = (address & MASK_32) >> PAGE_SHIFT
+        page = self.pages.get(number)
+        if number not in self._owned:
+            page = self.pages[number] = bytearray(PAGE_SIZE) if page is None else bytearray(page)
+            self._owned.add(number)
+        return page
+
+    @property
+    def dirty_pages(self):
+        """Page numbers written since the last snapshot() or restore()."""
+        return sorted(self._owned)
+
+    def snapshot(self):
+        """Freeze the current contents; later writes copy the pages they touch."""
+        self._base = MemorySnapshot(dict(self.pages))
+        self._owned.clear()
+        return self._base
+
+    def restore(self, snapshot):
+        """Return to the contents of snapshot.
+
+        Restoring the snapshot this memory was last forked from only puts
+        back the pages written since; any other snapshot replaces the whole
+        page table (still without copying page contents).
+
+        Returns:
+            Number of pages put back
+        """
+        if snapshot is self._base:
+            restored = len(self._owned)
+            for number in self._owned:
+                page = snapshot.pages.get(number)
+                if page is None:
+                    del self.pages[number]
+                else:
+                    self.pages[number] = page
+        else:
+            restored = len(snapshot.pages)
+            self.pages = dict(snapshot.pages)
+            self._base = snapshot
+        self._owned.clear()
+        return restored
+
+    @classmethod
+    def fork(cls, snapshot):
+        """A new memory starting from snapshot's contents."""
+        memory = cls()
+        memory.restore(snapshot)
+        return memory
+
+    @property
+    def allocated_bytes(self):
+        return len(self.pages) * PAGE_SIZE
+
+    def _chunks(self, address, length):
+        """(address, offset in page, chunk length) runs that stay within one page."""
+        while length > 0:
+            offset = address & PAGE_MASK
+            chunk = min(length, PAGE_SIZE - offset)
+            yield address, offset, chunk
+            address = (address + chunk) & MASK_32
+            length -= chunk
+
+    def read(self, address, length):
+        """length bytes starting at address."""
+        data = bytearray()
+        for chunk_address, offset, chunk in self._chunks(address, length):
+            page = self.pages.get(chunk_address >> PAGE_SHIFT)
+            data += page[offset:offset + chunk] if page is not None else bytes(chunk)
+        return bytes(data)
+
+    def write(self, address, data):
+        """Copy a bytes-like buffer or NumPy array (stored little-endian) to address."""
+        if isinstance(data, np.ndarray):
+            data = np.ascontiguousarray(data, dtype=data.dtype.newbyteorder("<")).tobytes()
+        data = memoryview(bytes(data))
+        position = 0
+        for chunk_address, offset, chunk in self._chunks(address, len(data)):
+            self._page(chunk_address)[offset:offset + chunk] = data[position:position + chunk]
+            position += chunk
+
+    def read_array(self, address, length):
+        """read() as a uint8 NumPy array."""
+        return np.frombuffer(self.read(address, length), dtype=np.uint8).copy()
+
+    def read_word(self, address):
+        """32-bit word at the word-aligned address containing address."""
+        address &= MASK_32 & ~0x3
+        page = self.pages.get(address >> PAGE_SHIFT)
+        if page is None:
+            return 0
+        offset = address & PAGE_MASK
+        return int.from_bytes(page[offset:offset + 4], "little")
+
+    def write_word(self, address, value, strobe=0xF):
+        """Write the byte lanes of value selected by strobe (AXI wstrb) to the word at address."""
+        address &= MASK_32 & ~0x3
+        page = self._page(address)
+        offset = address & PAGE_MASK
+        if strobe == 0xF:
+            page[offset:offset + 4] = (value & MASK_32).to_bytes(4, "little")
+            return
+        for lane in range(4):
+            if strobe >> lane & 1:
+                page[offset + lane] = (value >> (8 * lane)) & 0xFF
+
+
+class _Port:
+    """Harness signal handles of one CPU AXI-Lite port and its external-memory mux."""
+
+    def __init__(self, dut, name):
+        if name == DATA_PORT:
+            cpu, ext = "s_data_memory_axil_", "r_Ext_Data_"
+            self.select = dut.r_External_Data_Memory
+        elif name == INSTRUCTION_PORT:
+            cpu, ext = "s_instruction_memory_axil_", "r_Ext_Instruction_"
+            self.select = dut.r_External_Instruction_Memory
+        else:
+            raise ValueError(f"Unknown port '{name}'")
+        self.arvalid = getattr(dut, cpu + "arvalid")
+        self.araddr = getattr(dut, cpu + "araddr")
+        self.rready = getattr(dut, cpu + "rready")
+        self.arready = getattr(dut, ext + "Arready")
+        self.rdata = getattr(dut, ext + "Rdata")
+        self.rvalid = getattr(dut, ext + "Rvalid")
+        self.outputs = [self.arready, self.rvalid]
+        self.writable = name == DATA_PORT
+        if self.writable:
+            self.awvalid = getattr(dut, cpu + "awvalid")
+            self.awaddr = getattr(dut, cpu + "awaddr")
+            self.wvalid = getattr(dut, cpu + "wvalid")
+            self.wdata = getattr(dut, cpu + "wdata")
+            self.wstrb = getattr(dut, cpu + "wstrb")
+            self.bready = getattr(dut, cpu + "bready")
+            self.awready = getattr(dut, ext + "Awready")
+            self.wready = getattr(dut, ext + "Wready")
+            self.bvalid = getattr(dut, ext + "Bvalid")
+            self.outputs += [self.awready, self.wready, self.bvalid]
+
+
+class AxiLiteMemory:
+    """AXI-Lite slave on one harness port, backed by a SparseMemory.
+
+    Without a controller every request gets axil_ram's timing. With one (see
+    cpu/ddr3_model.py) the read data or write response is held back by the
+    latency the controller computes, and ports sharing a controller share
+    its outstanding-request limit and open rows.
+
+    Args:
+        dut: The integration test harness DUT
+        memory: SparseMemory to serve (a new, empty one by default)
+        port: DATA_PORT or INSTRUCTION_PORT
+        controller: Optional timing model with an
+            ``async access(address, write)`` coroutine that returns once the
+            request has been served
+
+    Raises:
+        ValueError: If port is unknown
+    """
+
+    def __init__(self, dut, memory=None, port=DATA_PORT, controller=None):
+        self.dut = dut
+        self.memory = memory if memory is not None else SparseMemory()
+        self.port = _Port(dut, port)
+        self.controller = controller
+        self.reads = 0
+        self.writes = 0
+        self._task = None
+
+    def start(self):
+        """Route the CPU port to this model and fork the responder."""
+        self.port.select.value = 1
+        self._task = cocotb.start_soon(self._run())
+        return self._task
+
+    def stop(self):
+        """Hand the port back to the harness' axil_ram.
+
+        The signals are written immediately rather than at the next ReadWrite
+        phase, so the switch also holds when the test returns right after.
+        """
+        if self._task is not None:
+            self._task.kill()
+            self._task = None
+        for signal in self.port.outputs + [self.port.select]:
+            signal.setimmediatevalue(0)
+
+    async def _handshake(self, ready):
+        """Wait for the falling edge after the rising edge that sampled ready high."""
+        clock = self.dut.i_Clock
+        while True:
+            seen = ready.value.integer
+            await FallingEdge(clock)
+            if seen:
+                return
+
+    async def _serve(self, address, write):
+        if self.controller is not None:
+            await self.controller.access(address, write)
+
+    async def _read(self):
+        port = self.port
+        address = port.araddr.value.integer
+        port.arready.value = 1
+        await FallingEdge(self.dut.i_Clock)
+        port.arready.value = 0
+        await self._serve(address, False)
+        port.rdata.value = self.memory.read_word(address)
+        port.rvalid.value = 1
+        self.reads += 1
+        await self._handshake(port.rready)
+        port.rvalid.value = 0
+
+    async def _write(self):
+        port = self.port
+        address = port.awaddr.value.integer
+        self.memory.write_word(address, port.wdata.value.integer, port.wstrb.value.integer)
+        port.awready.value = port.wready.value = 1
+        self.writes += 1
+        await FallingEdge(self.dut.i_Clock)
+        port.awready.value = port.wready.value = 0
+        await self._serve(address, True)
+        port.bvalid.value = 1
+        await self._handshake(port.bready)
+        port.bvalid.value = 0
+
+    async def _run(self):
+        # Requests are sampled and responses driven on the falling edge, so
+        # each handshake completes on the next rising edge
+        port = self.port
+        clock = self.dut.i_Clock
+        if port.writable:
+            request = (port.arvalid, port.awvalid)
+        else:
+            request = (port.arvalid,)
+
+        await FallingEdge(clock)
+        while True:
+            if port.arvalid.value.integer:
+                await self._read()
+            elif port.writable and port.awvalid.value.integer and port.wvalid.value.integer:
+                await self._write()
+            else:
+                await First(*(RisingEdge(valid) for valid in request))
+                await FallingEdge(clock)
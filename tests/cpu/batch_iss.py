@@ -0,0 +1,467 @@
+"""NumPy-vectorised RV32I simulator running many programs in parallel lanes.
+
+Each lane has its own program, PC, register file row and scratch data memory.
+Every step fetches one instruction per active lane and evaluates all of them
+with a fixed number of array operations: one ALU evaluation, one comparator
+evaluation, one load gather and one store scatter, selected per lane by the
+decoded opcode class. The ALU and comparator are modelled with the same
+ALU_SEL_* / CMP_SEL_* encodings as the RTL, so the operand streams a batch
+run produces can be replayed through the unit-test harness in bulk.
+
+Instruction and data memory are separate in this model: programs are not
+addressable by loads/stores, and data addresses wrap at memory_size.
+"""
+
+import numpy as np
+
+from cpu.constants import (
+    ALU_SEL_ADD,
+    ALU_SEL_SUB,
+    ALU_SEL_AND,
+    ALU_SEL_OR,
+    ALU_SEL_XOR,
+    ALU_SEL_SLL,
+    ALU_SEL_SRL,
+    ALU_SEL_SRA,
+    ALU_SEL_UNKNOWN,
+
+    CMP_SEL_EQ,
+    CMP_SEL_NE,
+    CMP_SEL_LTU,
+    CMP_SEL_GEU,
+    CMP_SEL_LT,
+    CMP_SEL_GE,
+    CMP_SEL_UNKNOWN,
+
+    OP_J_TYPE,
+    OP_B_TYPE,
+    OP_S_TYPE,
+    OP_R_TYPE,
+    OP_U_TYPE_LUI,
+    OP_U_TYPE_AUIPC,
+    OP_I_TYPE_JALR,
+    OP_I_TYPE_LOAD,
+    OP_I_TYPE_ALU,
+
+    FUNC3_ALU_ADD_SUB,
+    FUNC3_ALU_SLL,
+    FUNC3_ALU_SRL_SRA,
+
+    RAM_START_ADDR,
+)
+from cpu.iss import (
+    ISS_OP_ADD, ISS_OP_SUB, ISS_OP_SLL, ISS_OP_SLT, ISS_OP_SLTU, ISS_OP_XOR,
+    ISS_OP_SRL, ISS_OP_SRA, ISS_OP_OR, ISS_OP_AND,
+    ISS_OP_ADDI, ISS_OP_SLLI, ISS_OP_SLTI, ISS_OP_SLTIU, ISS_OP_XORI,
+    ISS_OP_SRLI, ISS_OP_SRAI, ISS_OP_ORI, ISS_OP_ANDI,
+    ISS_OP_LUI, ISS_OP_AUIPC, ISS_OP_JAL, ISS_OP_JALR,
+    ISS_OP_BEQ, ISS_OP_BNE, ISS_OP_BLT, ISS_OP_BGE, ISS_OP_BLTU, ISS_OP_BGEU,
+    ISS_OP_LB, ISS_OP_LH, ISS_OP_LW, ISS_OP_LBU, ISS_OP_LHU,
+    ISS_OP_SB, ISS_OP_SH, ISS_OP_SW,
+    R_TYPE_OPS, I_TYPE_ALU_OPS, BRANCH_OPS, LOAD_OPS, STORE_OPS,
+)
+from cpu.utils import (
+    gen_i_type_instruction,
+    gen_b_type_instruction,
+    gen_s_type_instruction,
+    gen_r_type_instruction,
+)
+
+ISS_OP_INVALID = -1
+NUM_ISS_OPS = ISS_OP_SW + 1
+
+# Opcode classes
+CLASS_ALU = 0      # result from the ALU
+CLASS_COMPARE = 1  # SLT/SLTU family: result from the comparator
+CLASS_LUI = 2
+CLASS_AUIPC = 3
+CLASS_JAL = 4
+CLASS_JALR = 5
+CLASS_BRANCH = 6
+CLASS_LOAD = 7
+CLASS_STORE = 8
+
+
+def _lookup(mapping, default):
+    table = np.full(NUM_ISS_OPS, default, dtype=np.int64)
+    for op, value in mapping.items():
+        table[op] = value
+    return table
+
+
+_OP_CLASS = _lookup({
+    **{op: CLASS_ALU for op in (ISS_OP_ADD, ISS_OP_SUB, ISS_OP_SLL, ISS_OP_XOR, ISS_OP_SRL,
+                                ISS_OP_SRA, ISS_OP_OR, ISS_OP_AND, ISS_OP_ADDI, ISS_OP_SLLI,
+                                ISS_OP_XORI, ISS_OP_SRLI, ISS_OP_SRAI, ISS_OP_ORI, ISS_OP_ANDI)},
+    **{op: CLASS_COMPARE for op in (ISS_OP_SLT, ISS_OP_SLTU, ISS_OP_SLTI, ISS_OP_SLTIU)},
+    ISS_OP_LUI: CLASS_LUI,
+    ISS_OP_AUIPC: CLASS_AUIPC,
+    ISS_OP_JAL: CLASS_JAL,
+    ISS_OP_JALR: CLASS_JALR,
+    **{op: CLASS_BRANCH for op in (ISS_OP_BEQ, ISS_OP_BNE, ISS_OP_BLT, ISS_OP_BGE,
+                                   ISS_OP_BLTU, ISS_OP_BGEU)},
+    **{op: CLASS_LOAD for op in (ISS_OP_LB, ISS_OP_LH, ISS_OP_LW, ISS_OP_LBU, ISS_OP_LHU)},
+    **{op: CLASS_STORE for op in (ISS_OP_SB, ISS_OP_SH, ISS_OP_SW)},
+}, CLASS_ALU)
+
+_ALU_SELECT = _lookup({
+    ISS_OP_ADD: ALU_SEL_ADD, ISS_OP_ADDI: ALU_SEL_ADD,
+    ISS_OP_SUB: ALU_SEL_SUB,
+    ISS_OP_SLL: ALU_SEL_SLL, ISS_OP_SLLI: ALU_SEL_SLL,
+    ISS_OP_XOR: ALU_SEL_XOR, ISS_OP_XORI: ALU_SEL_XOR,
+    ISS_OP_SRL: ALU_SEL_SRL, ISS_OP_SRLI: ALU_SEL_SRL,
+    ISS_OP_SRA: ALU_SEL_SRA, ISS_OP_SRAI: ALU_SEL_SRA,
+    ISS_OP_OR: ALU_SEL_OR, ISS_OP_ORI: ALU_SEL_OR,
+    ISS_OP_AND: ALU_SEL_AND, ISS_OP_ANDI: ALU_SEL_AND,
+}, ALU_SEL_UNKNOWN)
+
+_CMP_SELECT = _lookup({
+    ISS_OP_SLT: CMP_SEL_LT, ISS_OP_SLTI: CMP_SEL_LT,
+    ISS_OP_SLTU: CMP_SEL_LTU, ISS_OP_SLTIU: CMP_SEL_LTU,
+    ISS_OP_BEQ: CMP_SEL_EQ,
+    ISS_OP_BNE: CMP_SEL_NE,
+    ISS_OP_BLT: CMP_SEL_LT,
+    ISS_OP_BGE: CMP_SEL_GE,
+    ISS_OP_BLTU: CMP_SEL_LTU,
+    ISS_OP_BGEU: CMP_SEL_GEU,
+}, CMP_SEL_UNKNOWN)
+
+# R-type ops and branches take their second operand from rs2, everything else from imm
+_USES_RS2 = _lookup({op: 1 for op in (ISS_OP_ADD, ISS_OP_SUB, ISS_OP_SLL, ISS_OP_SLT, ISS_OP_SLTU,
+                                      ISS_OP_XOR, ISS_OP_SRL, ISS_OP_SRA, ISS_OP_OR, ISS_OP_AND,
+                                      ISS_OP_BEQ, ISS_OP_BNE, ISS_OP_BLT, ISS_OP_BGE,
+                                      ISS_OP_BLTU, ISS_OP_BGEU)}, 0).astype(bool)
+
+_ACCESS_BYTES = _lookup({ISS_OP_LB: 1, ISS_OP_LBU: 1, ISS_OP_SB: 1,
+                         ISS_OP_LH: 2, ISS_OP_LHU: 2, ISS_OP_SH: 2,
+                         ISS_OP_LW: 4, ISS_OP_SW: 4}, 0)
+_LOAD_SIGNED = _lookup({ISS_OP_LB: 1, ISS_OP_LH: 1}, 0).astype(bool)
+
+
+def _as_u32(values):
+    """Convert Python ints / signed arrays to uint32 two's complement."""
+    return (np.asarray(values, dtype=np.int64) & 0xFFFFFFFF).astype(np.uint32)
+
+
+def alu_reference(a, b, alu_select):
+    """Vectorised model of arithmetic_logic_unit.v.
+
+    Args:
+        a, b: Operand arrays (any integer dtype, negative values allowed)
+        alu_select: Array of ALU_SEL_* values
+
+    Returns:
+        uint32 array of results (0 for ALU_SEL_UNKNOWN, like the RTL)
+    """
+    a = _as_u32(a)
+    b = _as_u32(b)
+    alu_select = np.asarray(alu_select)
+    shamt = b & np.uint32(0x1F)
+    return np.select(
+        [alu_select == ALU_SEL_ADD, alu_select == ALU_SEL_SUB, alu_select == ALU_SEL_AND,
+         alu_select == ALU_SEL_OR, alu_select == ALU_SEL_XOR, alu_select == ALU_SEL_SLL,
+         alu_select == ALU_SEL_SRL, alu_select == ALU_SEL_SRA],
+        [a + b, a - b, a & b, a | b, a ^ b, a << shamt, a >> shamt,
+         (a.view(np.int32) >> shamt.astype(np.int32)).view(np.uint32)],
+        default=np.uint32(0),
+    ).astype(np.uint32)
+
+
+def comparator_reference(a, b, compare_select):
+    """Vectorised model of comparator_unit.v; returns a uint8 array of 0/1."""
+    a = _as_u32(a)
+    b = _as_u32(b)
+    compare_select = np.asarray(compare_select)
+    signed_a = a.view(np.int32)
+    signed_b = b.view(np.int32)
+    return np.select(
+        [compare_select == CMP_SEL_EQ, compare_select == CMP_SEL_NE,
+         compare_select == CMP_SEL_LTU, compare_select == CMP_SEL_GEU,
+         compare_select == CMP_SEL_LT, compare_select == CMP_SEL_GE],
+        [a == b, a != b, a < b, a >= b, signed_a < signed_b, signed_a >= signed_b],
+        default=False,
+    ).astype(np.uint8)
+
+
+def _sign_extend(values, bits):
+    values = values.astype(np.int64)
+    sign_bit = 1 << (bits - 1)
+    return (values & (sign_bit - 1)) - (values & sign_bit)
+
+
+def decode_batch(programs):
+    """Vectorised equivalent of iss.decode_instruction over an array of words.
+
+    Returns:
+        (op, rd, rs1, rs2, imm) arrays shaped like programs; imm is uint32
+        two's complement, op is ISS_OP_INVALID for unsupported words
+    """
+    words = np.asarray(programs, dtype=np.uint32).astype(np.int64)
+    opcode = words & 0x7F
+    rd = (words >> 7) & 0x1F
+    funct3 = (words >> 12) & 0x7
+    rs1 = (words >> 15) & 0x1F
+    rs2 = (words >> 20) & 0x1F
+    funct7 = words >> 25
+
+    op = np.full(words.shape, ISS_OP_INVALID, dtype=np.int64)
+    imm = np.zeros(words.shape, dtype=np.int64)
+
+    i_imm = _sign_extend(words >> 20, 12)
+    s_imm = _sign_extend(((words >> 25) << 5) | ((words >> 7) & 0x1F), 12)
+    b_imm = _sign_extend((((words >> 31) & 0x1) << 12) | (((words >> 7) & 0x1) << 11)
+                         | (((words >> 25) & 0x3F) << 5) | (((words >> 8) & 0xF) << 1), 13)
+    j_imm = _sign_extend((((words >> 31) & 0x1) << 20) | (((words >> 12) & 0xFF) << 12)
+                         | (((words >> 20) & 0x1) << 11) | (((words >> 21) & 0x3FF) << 1), 21)
+    u_imm = words & 0xFFFFF000
+
+    is_r = opcode == OP_R_TYPE
+    for (funct3_value, alt), iss_op in R_TYPE_OPS.items():
+        op[is_r & (funct3 == funct3_value) & (funct7 == (0b0100000 if alt else 0))] = iss_op
+
+    is_i = opcode == OP_I_TYPE_ALU
+    for funct3_value, iss_op in I_TYPE_ALU_OPS.items():
+        m = is_i & (funct3 == funct3_value)
+        op[m] = iss_op
+        imm[m] = i_imm[m]
+    m = is_i & (funct3 == FUNC3_ALU_SLL) & (funct7 == 0)
+    op[m] = ISS_OP_SLLI
+    imm[m] = rs2[m]
+    m = is_i & (funct3 == FUNC3_ALU_SRL_SRA) & (funct7 == 0)
+    op[m] = ISS_OP_SRLI
+    imm[m] = rs2[m]
+    m = is_i & (funct3 == FUNC3_ALU_SRL_SRA) & (funct7 == 0b0100000)
+    op[m] = ISS_OP_SRAI
+    imm[m] = rs2[m]
+
+    for funct3_value, iss_op in LOAD_OPS.items():
+        m = (opcode == OP_I_TYPE_LOAD) & (funct3 == funct3_value)
+        op[m] = iss_op
+        imm[m] = i_imm[m]
+    for funct3_value, iss_op in STORE_OPS.items():
+        m = (opcode == OP_S_TYPE) & (funct3 == funct3_value)
+        op[m] = iss_op
+        imm[m] = s_imm[m]
+    for funct3_value, iss_op in BRANCH_OPS.items():
+        m = (opcode == OP_B_TYPE) & (funct3 == funct3_value)
+        op[m] = iss_op
+        imm[m] = b_imm[m]
+
+    m = opcode == OP_U_TYPE_LUI
+    op[m] = ISS_OP_LUI
+    imm[m] = u_imm[m]
+    m = opcode == OP_U_TYPE_AUIPC
+    op[m] = ISS_OP_AUIPC
+    imm[m] = u_imm[m]
+    m = opcode == OP_J_TYPE
+    op[m] = ISS_OP_JAL
+    imm[m] = j_imm[m]
+    m = (opcode == OP_I_TYPE_JALR) & (funct3 == 0)
+    op[m] = ISS_OP_JALR
+    imm[m] = i_imm[m]
+
+    # Stores and branches have no rd; keep the field zero so writeback masks stay simple
+    no_rd = (opcode == OP_S_TYPE) | (opcode == OP_B_TYPE)
+    rd = np.where(no_rd, 0, rd)
+
+    return op, rd, rs1, rs2, _as_u32(imm)
+
+
+class BatchRV32ISimulator:
+    """Run N independent RV32I programs in lock-step, one lane per program.
+
+    Args:
+        programs: Array-like of shape (lanes, length) with 32-bit instruction words
+        base_addr: Address of word 0 of every program
+        memory_size: Bytes of private data memory per lane (power of two)
+        record_operations: Keep every ALU/comparator evaluation so it can be
+            replayed through the unit-test harness (see alu_operations())
+
+    A lane halts when its PC leaves its program or it executes a jump to itself.
+    """
+
+    def __init__(self, programs, base_addr=RAM_START_ADDR, memory_size=4096, record_operations=False):
+        programs = np.atleast_2d(np.asarray(programs, dtype=np.uint32))
+        if memory_size & (memory_size - 1):
+            raise ValueError(f"memory_size must be a power of two, got {memory_size}")
+
+        self.lanes, self.length = programs.shape
+        self.base_addr = base_addr
+        self.memory_size = memory_size
+        self.registers = np.zeros((self.lanes, 32), dtype=np.uint32)
+        self.pc = np.full(self.lanes, base_addr, dtype=np.uint32)
+        self.memory = np.zeros((self.lanes, memory_size), dtype=np.uint8)
+        self.halted = np.zeros(self.lanes, dtype=bool)
+        self.retired = np.zeros(self.lanes, dtype=np.int64)
+
+        # One row of decoded fields per instruction so each step needs a single gather
+        op, rd, rs1, rs2, imm = decode_batch(programs)
+        op_class = np.where(op >= 0, _OP_CLASS[op], -1)
+        self._decoded = np.stack([op, op_class, rd, rs1, rs2, imm.astype(np.int64)], axis=-1)
+
+        self.record_operations = record_operations
+        self._alu_trace = []
+        self._cmp_trace = []
+
+    def step(self):
+        """Execute one instruction in every active lane; returns the number executed."""
+        index = (self.pc.astype(np.int64) - self.base_addr) >> 2
+        self.halted |= (index < 0) | (index >= self.length)
+        lanes = np.flatnonzero(~self.halted)
+        if lanes.size == 0:
+            return 0
+
+        op, op_class, rd, rs1, rs2, imm = self._decoded[lanes, index[lanes]].T
+        if np.any(op == ISS_OP_INVALID):
+            bad = lanes[op == ISS_OP_INVALID][0]
+            raise ValueError(f"Lane {bad}: unsupported instruction at {int(self.pc[bad]):#010x}")
+
+        imm = imm.astype(np.uint32)
+        pc = self.pc[lanes]
+        a = self.registers[lanes, rs1]
+        rs2_value = self.registers[lanes, rs2]
+        b = np.where(_USES_RS2[op], rs2_value, imm)
+
+        alu_select = _ALU_SELECT[op]
+        cmp_select = _CMP_SELECT[op]
+        alu_result = alu_reference(a, b, alu_select)
+        cmp_result = comparator_reference(a, b, cmp_select)
+
+        if self.record_operations:
+            uses_alu = op_class == CLASS_ALU
+            uses_cmp = (op_class == CLASS_COMPARE) | (op_class == CLASS_BRANCH)
+            self._alu_trace.append((a[uses_alu], b[uses_alu], alu_select[uses_alu], alu_result[uses_alu]))
+            self._cmp_trace.append((a[uses_cmp], b[uses_cmp], cmp_select[uses_cmp], cmp_result[uses_cmp]))
+
+        pc_next = pc + np.uint32(4)
+        pc_target = pc + imm
+        address = a + imm
+
+        # Loads: gather up to four bytes per lane from its private memory
+        mask = self.memory_size - 1
+        width = _ACCESS_BYTES[op]
+        is_load = op_class == CLASS_LOAD
+        loaded = np.zeros(lanes.size, dtype=np.uint32)
+        if np.any(is_load):
+            load_lanes = lanes[is_load]
+            load_width = width[is_load]
+            offset = address[is_load].astype(np.int64) & mask
+            value = np.zeros(load_lanes.size, dtype=np.uint32)
+            for k in range(4):
+                byte = self.memory[load_lanes, (offset + k) & mask].astype(np.uint32)
+                value |= np.where(k < load_width, byte << np.uint32(8 * k), np.uint32(0))
+            sign_bits = np.where(load_width == 1, 8, 16)
+            loaded[is_load] = np.where(_LOAD_SIGNED[op[is_load]], _as_u32(_sign_extend(value, sign_bits)), value)
+
+        result = np.select(
+            [op_class == CLASS_ALU, op_class == CLASS_COMPARE, op_class == CLASS_LUI,
+             op_class == CLASS_AUIPC, (op_class == CLASS_JAL) | (op_class == CLASS_JALR), is_load],
+            [alu_result, cmp_result.astype(np.uint32), imm, pc_target, pc_next, loaded],
+            default=np.uint32(0),
+        ).astype(np.uint32)
+        new_pc = np.select(
+            [op_class == CLASS_JAL, op_class == CLASS_JALR, (op_class == CLASS_BRANCH) & (cmp_result == 1)],
+            [pc_target, address & np.uint32(0xFFFFFFFE), pc_target],
+            default=pc_next,
+        ).astype(np.uint32)
+
+        # Stores: scatter byte by byte (read before any write, like the scalar ISS)
+        is_store = op_class == CLASS_STORE
+        if np.any(is_store):
+            store_lanes = lanes[is_store]
+            store_width = width[is_store]
+            store_value = rs2_value[is_store]
+            offset = address[is_store].astype(np.int64) & mask
+            for k in range(4):
+                m = k < store_width
+                self.memory[store_lanes[m], (offset[m] + k) & mask] = (store_value[m] >> np.uint32(8 * k)) & np.uint32(0xFF)
+
+        writes = (rd != 0) & ~is_store & (op_class != CLASS_BRANCH)
+        self.registers[lanes[writes], rd[writes]] = result[writes]
+
+        self.halted[lanes[new_pc == pc]] = True
+        self.pc[lanes] = new_pc
+        self.retired[lanes] += 1
+        return lanes.size
+
+    def run(self, max_steps=10_000):
+        """Step until every lane has halted or max_steps is reached; returns total retired."""
+        total = 0
+        for _ in range(max_steps):
+            executed = self.step()
+            if executed == 0:
+                break
+            total += executed
+        return total
+
+    def alu_operations(self):
+        """Recorded ALU evaluations as (a, b, alu_select, result) uint32/int arrays."""
+        return self._concatenate(self._alu_trace)
+
+    def comparator_operations(self):
+        """Recorded comparator evaluations as (a, b, compare_select, result) arrays."""
+        return self._concatenate(self._cmp_trace)
+
+    @staticmethod
+    def _concatenate(trace):
+        if not trace:
+            empty = np.zeros(0, dtype=np.uint32)
+            return empty, empty, np.zeros(0, dtype=np.int64), empty
+        return tuple(np.concatenate(column) for column in zip(*trace))
+
+
+def random_programs(rng, lanes, length, memory_size=4096):
+    """Generate constrained-random RV32I programs, one row per lane.
+
+    Programs mix register-register and immediate ALU ops, SLT family, LUI,
+    loads/stores addressed off x0 into the lane's data memory, and forward
+    branches (so every program terminates). Results land in x1-x31.
+
+    Args:
+        rng: numpy.random.Generator
+        lanes, length: Output shape
+        memory_size: Data memory size the programs will run against
+
+    Returns:
+        uint32 array of shape (lanes, length)
+    """
+    shape = (lanes, length)
+    kind = rng.integers(0, 7, size=shape)
+    rd = rng.integers(1, 32, size=shape)
+    rs1 = rng.integers(0, 32, size=shape)
+    rs2 = rng.integers(0, 32, size=shape)
+    funct3 = rng.integers(0, 8, size=shape)
+    imm12 = rng.integers(-2048, 2048, size=shape)
+    alt = rng.integers(0, 2, size=shape)
+    slot = np.arange(length)[None, :]
+
+    # R-type: the alternate funct7 only exists for ADD/SUB and SRL/SRA
+    r_alt = np.where((funct3 == FUNC3_ALU_ADD_SUB) | (funct3 == FUNC3_ALU_SRL_SRA), alt, 0)
+    r_type = gen_r_type_instruction(rd, funct3, rs1, rs2, r_alt << 5)
+
+    # I-type ALU: shifts need a 5-bit shamt and the SRAI marker in funct7
+    shamt = imm12 & 0x1F
+    i_imm = np.where(funct3 == FUNC3_ALU_SLL, shamt,
+                     np.where(funct3 == FUNC3_ALU_SRL_SRA, shamt | (r_alt << 10), imm12))
+    i_type = gen_i_type_instruction(OP_I_TYPE_ALU, rd, funct3, rs1, i_imm)
+
+    lui = (rng.integers(0, 1 << 20, size=shape) << 12) | (rd << 7) | OP_U_TYPE_LUI
+
+    # Loads/stores off x0, kept inside the lane's memory
+    load_funct3 = rng.choice(list(LOAD_OPS), size=shape)
+    store_funct3 = rng.choice(list(STORE_OPS), size=shape)
+    mem_offset = rng.integers(0, min(memory_size, 2048) - 4, size=shape) & ~0x3
+    load = gen_i_type_instruction(OP_I_TYPE_LOAD, rd, load_funct3, 0, mem_offset)
+    store = gen_s_type_instruction(store_funct3, 0, rs2, mem_offset)
+
+    # Short forward branches only, landing inside the program or just past its end
+    branch_funct3 = rng.choice(list(BRANCH_OPS), size=shape)
+    distance = 4 * rng.integers(1, np.minimum(length - slot, 8) + 1, size=shape)
+    branch = gen_b_type_instruction(branch_funct3, rs1, rs2, distance)
+
+    programs = np.select(
+        [kind == 0, kind == 1, kind == 2, kind == 3, kind == 4, kind == 5],
+        [r_type, i_type, i_type, lui, load, store],
+        default=branch,
+    )
+    return (programs & 0xFFFFFFFF).astype(np.uint32)
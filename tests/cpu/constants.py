@@ -1,3 +1,5 @@
+from debug_client import protocol as debug_protocol
+
 # Constants for immediate types
 IMM_U_TYPE = 0
 IMM_B_TYPE = 1
@@ -104,16 +106,22 @@ CLOCK_FREQUENCY = 81_247_969 # 81.247969 MHz
 UART_BAUD_RATE = 115200
 UART_CLOCKS_PER_BIT = (CLOCK_FREQUENCY / UART_BAUD_RATE)
 
-DEBUG_OP_NOP = 0x00
-DEBUG_OP_RESET = 0x01
-DEBUG_OP_UNRESET = 0x02
-DEBUG_OP_HALT = 0x03
-DEBUG_OP_UNHALT = 0x04
-DEBUG_OP_PING = 0x05
-DEBUG_OP_READ_PC = 0x06
-DEBUG_OP_WRITE_PC = 0x07
-DEBUG_OP_READ_REGISTER = 0x08
-DEBUG_OP_WRITE_REGISTER = 0x09
-DEBUG_OP_DUMP_STATE = 0x0A
-
-PING_RESPONSE_BYTE = 0xAA
\ No newline at end of file
+# Debug protocol opcodes, shared with tools/probe.py through debug_client.protocol
+DEBUG_OP_NOP = debug_protocol.OP_NOP
+DEBUG_OP_RESET = debug_protocol.OP_RESET
+DEBUG_OP_UNRESET = debug_protocol.OP_UNRESET
+DEBUG_OP_HALT = debug_protocol.OP_HALT
+DEBUG_OP_UNHALT = debug_protocol.OP_UNHALT
+DEBUG_OP_PING = debug_protocol.OP_PING
+DEBUG_OP_READ_PC = debug_protocol.OP_READ_PC
+DEBUG_OP_WRITE_PC = debug_protocol.OP_WRITE_PC
+DEBUG_OP_READ_REGISTER = debug_protocol.OP_READ_REGISTER
+DEBUG_OP_WRITE_REGISTER = debug_protocol.OP_WRITE_REGISTER
+DEBUG_OP_DUMP_STATE = debug_protocol.OP_DUMP_STATE
+
+PING_RESPONSE_BYTE = debug_protocol.PING_RESPONSE_BYTE
+
+# How cpu.utils delivers debug commands: shifted through the UART, or handed
+# to debug_peripheral a byte per cycle over the harness backdoor
+DEBUG_TRANSPORT_UART = "uart"
+DEBUG_TRANSPORT_BACKDOOR = "backdoor"
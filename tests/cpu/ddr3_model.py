@@ -0,0 +1,147 @@
+"""DDR3-like timing for the cocotb memory model in cpu/axil_memory.py.
+
+axil_ram answers every request in a couple of cycles, so CPI measured in the
+harness says nothing about the board, where both CPU ports reach the DDR3
+through a SmartConnect and the MIG. Ddr3Controller adds that latency back:
+each request waits for a free slot (the MIG has a limited number of bank
+machines), then for the row-hit, row-empty or row-conflict latency of its
+bank, then the port answers. Share one controller between the data and the
+instruction port so fetches and loads/stores compete for it:
+
+    memory = SparseMemory()
+    controller = Ddr3Controller(dut.i_Clock)
+    ports = [AxiLiteMemory(dut, memory, port, controller) for port in (DATA_PORT, INSTRUCTION_PORT)]
+
+Cycles are CPU/ui_clk cycles (81.25 MHz). The default Ddr3Timing follows
+config/mig_b.prj: 4:1 PHY at 325 MHz, tRCD = tRP = 13.5 ns (2 cycles each),
+2 bank machines, and the MT41K128M16's 8 banks of 2KB rows mapped
+ROW_BANK_COLUMN. The base read/write latencies are estimates of the MIG's
+native-to-AXI path, not measurements.
+"""
+
+from cocotb.triggers import ClockCycles, Event
+
+ROW_HIT = "hit"
+ROW_EMPTY = "empty"
+ROW_CONFLICT = "conflict"
+
+
+class Ddr3Timing:
+    """Latency parameters of Ddr3Controller, in clock cycles.
+
+    Args:
+        read_latency: Cycles from accepting a read to its data on a row hit
+        write_latency: Cycles from accepting a write to its response on a row hit
+        activate_cycles: Extra cycles to open a row in an idle bank (tRCD)
+        precharge_cycles: Extra cycles to close another open row first (tRP)
+        banks: Number of banks
+        row_bytes: Bytes per row (columns x data width)
+        max_outstanding: Requests the controller works on at once; later ones queue
+
+    Raises:
+        ValueError: If a latency is negative, banks or row_bytes is not a
+            power of two, or max_outstanding is less than 1
+    """
+
+    def __init__(self, read_latency=20, write_latency=8, activate_cycles=2, precharge_cycles=2,
+                 banks=8, row_bytes=2048, max_outstanding=2):
+        for name, value in (("read_latency", read_latency), ("write_latency", write_latency),
+                            ("activate_cycles", activate_cycles), ("precharge_cycles", precharge_cycles)):
+            if value < 0:
+                raise ValueError(f"{name} must not be negative, got {value}")
+        for name, value in (("banks", banks), ("row_bytes", row_bytes)):
+            if value < 1 or value & (value - 1):
+                raise ValueError(f"{name} must be a power of two, got {value}")
+        if max_outstanding < 1:
+            raise ValueError(f"max_outstanding must be at least 1, got {max_outstanding}")
+        self.read_latency = read_latency
+        self.write_latency = write_latency
+        self.activate_cycles = activate_cycles
+        self.precharge_cycles = precharge_cycles
+        self.banks = banks
+        self.row_bytes = row_bytes
+        self.max_outstanding = max_outstanding
+
+    def bank_and_row(self, address):
+        """(bank, row) of address with ROW_BANK_COLUMN mapping."""
+        line = address // self.row_bytes
+        return line % self.banks, line // self.banks
+
+
+class Ddr3Controller:
+    """Open-row, outstanding-limited timing model shared by AxiLiteMemory ports.
+
+    Args:
+        clock: Clock the latencies are counted in (the harness i_Clock)
+        timing: Ddr3Timing (the defaults above when omitted)
+    """
+
+    def __init__(self, clock, timing=None):
+        self.clock = clock
+        self.timing = timing if timing is not None else Ddr3Timing()
+        self.open_rows = {}  # bank -> open row
+        self.outstanding = 0
+        self._slot_freed = Event()
+        self.requests = 0
+        self.row_hits = 0
+        self.row_empties = 0
+        self.row_conflicts = 0
+        self.busy_cycles = 0  # sum of request latencies
+        self.queued = 0  # requests that had to wait for a free slot
+
+    def classify(self, address):
+        """Open the row of address and return ROW_HIT, ROW_EMPTY or ROW_CONFLICT."""
+        bank, row = self.timing.bank_and_row(address)
+        open_row = self.open_rows.get(bank)
+        self.open_rows[bank] = row
+        if open_row == row:
+            self.row_hits += 1
+            return ROW_HIT
+        if open_row is None:
+            self.row_empties += 1
+            return ROW_EMPTY
+        self.row_conflicts += 1
+        return ROW_CONFLICT
+
+    def latency(self, address, write):
+        """Cycles to serve a request issued now; updates the open rows."""
+        timing = self.timing
+        cycles = timing.write_latency if write else timing.read_latency
+        state = self.classify(address)
+        if state == ROW_CONFLICT:
+            cycles += timing.precharge_cycles + timing.activate_cycles
+        elif state == ROW_EMPTY:
+            cycles += timing.activate_cycles
+        return cycles
+
+    async def access(self, address, write):
+        """Wait until a request for address would have been served.
+
+        Returns:
+            The request's latency in cycles, not counting time queued for a slot
+        """
+        if self.outstanding >= self.timing.max_outstanding:
+            self.queued += 1
+            while self.outstanding >= self.timing.max_outstanding:
+                self._slot_freed.clear()
+                await self._slot_freed.wait()
+        self.outstanding += 1
+        try:
+            cycles = self.latency(address, write)
+            self.requests += 1
+            self.busy_cycles += cycles
+            if cycles:
+                await ClockCycles(self.clock, cycles, rising=False)
+        finally:
+            self.outstanding -= 1
+            self._slot_freed.set()
+        return cycles
+
+    def reset_stats(self):
+        """Zero the counters (e.g. after boot), keeping the open rows."""
+        self.requests = self.row_hits = self.row_empties = self.row_conflicts = 0
+        self.busy_cycles = self.queued = 0
+
+    @property
+    def row_hit_rate(self):
+        return self.row_hits / self.requests if self.requests else 0.0
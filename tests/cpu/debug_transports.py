@@ -0,0 +1,40 @@
+"""cocotb transports for debug_client.AsyncDebugClient.
+
+Commands reach the debug peripheral over the harness UART or the command
+backdoor (see send_debug_command in cpu/utils.py); replies always come back
+over the UART and are decoded by a UartMonitor:
+
+    client = AsyncDebugClient(CocotbBackdoorTransport(dut))
+    await client.write_registers({1: 0x11, 2: 0x22})
+    values = await client.read_registers([1, 2])
+"""
+
+from cpu.constants import DEBUG_TRANSPORT_BACKDOOR, DEBUG_TRANSPORT_UART
+from cpu.uart_monitor import debug_uart_monitor
+from cpu.utils import send_debug_command
+
+
+class CocotbUartTransport:
+    """Send each command over the harness UART; read replies from the TX line."""
+
+    transport = DEBUG_TRANSPORT_UART
+
+    def __init__(self, dut):
+        self.dut = dut
+        self.monitor = debug_uart_monitor(dut)
+
+    async def write(self, data):
+        await send_debug_command(self.dut, data, self.transport)
+
+    async def read(self, count):
+        """Wait for count reply bytes; each must follow the previous within the monitor's timeout."""
+        return await self.monitor.read_bytes(count)
+
+    def close(self):
+        self.monitor.stop()
+
+
+class CocotbBackdoorTransport(CocotbUartTransport):
+    """Hand commands to the peripheral over the backdoor; replies still use the UART."""
+
+    transport = DEBUG_TRANSPORT_BACKDOOR
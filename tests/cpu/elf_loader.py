@@ -0,0 +1,169 @@
+"""Load RV32I ELF executables into the integration harness.
+
+Toolchain-built programs (see cpu/fixtures/) can run without being turned into
+Python instruction lists: parse_elf() reads the PT_LOAD segments and symbols
+with the standard library only, and load_elf() places each segment with one
+bulk write (cpu/memory_image.py) and points the CPU at the entry address.
+
+Segments at or below ROM_BOUNDARY_ADDR go to the boot ROM array. Segments above
+it go to data_ram; executable ones are also copied to instruction_ram, which
+is what the CPU fetches RAM addresses from in the harness.
+
+    image = await load_elf(dut, "cpu/fixtures/sum_array.elf")
+    await send_unhalt_command(dut)
+"""
+
+import struct
+
+from cpu.constants import ROM_BOUNDARY_ADDR
+from cpu.memory_image import DATA_RAM, INSTRUCTION_RAM, ROM, load_memory
+from cpu.utils import send_halt_command, send_write_pc_command, wait_for_pipeline_flush
+from cpu.waits import wait_for_value
+
+ELF_MAGIC = b"\x7fELF"
+ELFCLASS32 = 1
+ELFDATA2LSB = 1
+EM_RISCV = 243
+
+PT_LOAD = 1
+PF_X = 0x1
+SHT_SYMTAB = 2
+
+WRITE_PC_TIMEOUT_CYCLES = 100
+
+_ELF_HEADER = struct.Struct("<16sHHIIIIIHHHHHH")
+_PROGRAM_HEADER = struct.Struct("<IIIIIIII")
+_SECTION_HEADER = struct.Struct("<IIIIIIIIII")
+_SYMBOL = struct.Struct("<IIIBBH")
+
+
+class ElfSegment:
+    """One PT_LOAD segment, with .bss-style zero fill already appended to data."""
+
+    def __init__(self, address, data, flags):
+        self.address = address
+        self.data = data
+        self.flags = flags
+
+    @property
+    def executable(self):
+        return bool(self.flags & PF_X)
+
+    def __repr__(self):
+        return f"ElfSegment({self.address:#010x}, {len(self.data)} bytes, flags={self.flags:#x})"
+
+
+class ElfImage:
+    """Entry point, loadable segments and symbol addresses of an ELF file."""
+
+    def __init__(self, entry, segments, symbols):
+        self.entry = entry
+        self.segments = segments
+        self.symbols = symbols
+
+
+def _symbols(data, section_offset, section_count, section_size):
+    sections = [
+        _SECTION_HEADER.unpack_from(data, section_offset + i * section_size)
+        for i in range(section_count)
+    ]
+    symbols = {}
+    for _, kind, _, _, offset, size, link, _, _, entry_size in sections:
+        if kind != SHT_SYMTAB:
+            continue
+        strings = sections[link]
+        string_offset, string_size = strings[4], strings[5]
+        for position in range(offset + entry_size, offset + size, entry_size):
+            name, value = _SYMBOL.unpack_from(data, position)[:2]
+            end = data.index(b"\0", string_offset + name, string_offset + string_size)
+            symbol = data[string_offset + name:end].decode()
+            if symbol:
+                symbols.setdefault(symbol, value)
+    return symbols
+
+
+def parse_elf(data):
+    """Parse a little-endian ELF32 RISC-V executable.
+
+    Args:
+        data: The file contents
+
+    Raises:
+        ValueError: If data is not an ELF32 little-endian RISC-V file
+
+    Returns:
+        ElfImage with the non-empty PT_LOAD segments (placed at their physical
+        address) and every named symbol in .symtab
+    """
+    data = bytes(data)
+    if len(data) < _ELF_HEADER.size or data[:4] != ELF_MAGIC:
+        raise ValueError("Not an ELF file")
+    (ident, _, machine, _, entry, ph_offset, sh_offset, _, _,
+     ph_size, ph_count, sh_size, sh_count, _) = _ELF_HEADER.unpack_from(data)
+    if ident[4] != ELFCLASS32 or ident[5] != ELFDATA2LSB:
+        raise ValueError("Only little-endian ELF32 files are supported")
+    if machine != EM_RISCV:
+        raise ValueError(f"Not a RISC-V ELF file (e_machine {machine})")
+
+    segments = []
+    for i in range(ph_count):
+        (kind, offset, _, address, file_size, memory_size, flags, _) = _PROGRAM_HEADER.unpack_from(
+            data, ph_offset + i * ph_size)
+        if kind != PT_LOAD or memory_size == 0:
+            continue
+        contents = data[offset:offset + file_size] + bytes(memory_size - file_size)
+        segments.append(ElfSegment(address, contents, flags))
+
+    symbols = _symbols(data, sh_offset, sh_count, sh_size) if sh_offset else {}
+    return ElfImage(entry, segments, symbols)
+
+
+def read_elf(path):
+    """parse_elf() on the contents of path."""
+    with open(path, "rb") as f:
+        return parse_elf(f.read())
+
+
+async def load_segments(dut, image):
+    """Place every segment of image into the ROM or harness RAM.
+
+    Raises:
+        ValueError: If a segment straddles ROM_BOUNDARY_ADDR or does not fit
+    """
+    for segment in image.segments:
+        end = segment.address + len(segment.data) - 1
+        if segment.address <= ROM_BOUNDARY_ADDR:
+            if end > ROM_BOUNDARY_ADDR:
+                raise ValueError(f"{segment} straddles the ROM boundary {ROM_BOUNDARY_ADDR:#010x}")
+            await load_memory(dut, ROM, segment.address, segment.data)
+            continue
+        await load_memory(dut, DATA_RAM, segment.address, segment.data)
+        if segment.executable:
+            await load_memory(dut, INSTRUCTION_RAM, segment.address, segment.data)
+
+
+async def load_elf(dut, source):
+    """Load an ELF file and set the PC to its entry point through the debug WRITE_PC command.
+
+    The CPU is halted before anything is written, so code left running from
+    the boot ROM cannot execute a half-loaded image. It is left halted at the
+    entry point; send_unhalt_command() starts it.
+
+    Args:
+        dut: The integration test harness DUT
+        source: Path of the ELF file, or an ElfImage
+
+    Returns:
+        The loaded ElfImage
+    """
+    image = source if isinstance(source, ElfImage) else read_elf(source)
+    await send_halt_command(dut)
+    await wait_for_pipeline_flush(dut)
+    await load_segments(dut, image)
+    await send_write_pc_command(dut, image.entry)
+
+    # The PC is written a few cycles after the last command byte
+    if not await wait_for_value(dut.cpu.r_PC, image.entry, dut.i_Clock, WRITE_PC_TIMEOUT_CYCLES):
+        raise AssertionError(f"PC did not reach the entry point {image.entry:#010x}")
+    await wait_for_pipeline_flush(dut)
+    return image
@@ -0,0 +1,34 @@
+# ELF loader fixture (see test_elf_loader.py): boot code in ROM calls a
+# function placed in RAM to sum a .data array and stores the result in .bss.
+
+    .section .text, "ax"
+    .globl _start
+_start:
+    la    a0, array
+    li    a1, 8                     # element count
+    call  sum_words
+    la    t0, result
+    sw    a0, 0(t0)
+done:
+    j     done
+
+    .section .ram_text, "ax"
+# a0 = pointer, a1 = count -> a0 = sum
+sum_words:
+    li    t1, 0
+1:
+    lw    t2, 0(a0)
+    addi  a0, a0, 4                 # independent work fills the load-use slot
+    addi  a1, a1, -1
+    add   t1, t1, t2
+    bnez  a1, 1b
+    mv    a0, t1
+    ret
+
+    .data
+array:
+    .word 1, 2, 3, 5, 8, 13, 21, 34
+
+    .bss
+result:
+    .zero 4
@@ -1,6 +1,10 @@
 `timescale 1ns / 1ps
 
-module cpu_integration_tests_harness ();
+// The debug UART runs at UART_CLKS_PER_BIT instead of the board's baud rate so
+// debug commands cost a few hundred cycles; cpu.utils reads the same parameter.
+module cpu_integration_tests_harness #(
+    parameter UART_CLKS_PER_BIT = 16
+) ();
 
   wire i_Reset;
   wire i_Clock;
@@ -29,8 +33,23 @@ module cpu_integration_tests_harness ();
   wire s_instruction_memory_axil_rvalid;
   wire s_instruction_memory_axil_rready;
 
+  // Debug command backdoor: cpu.utils pulses r_Debug_Cmd_DV for one cycle per
+  // command byte instead of shifting it through the UART. cpu ties the
+  // peripheral's command port off, so it is forced from here rather than
+  // being a pin of the IP; re-forced on every change, as Verilator evaluates
+  // a force's right-hand side only when the force statement runs.
+  reg r_Debug_Cmd_DV = 1'b0;
+  reg [7:0] r_Debug_Cmd_Byte = 8'b0;
+
+  always @(*) begin
+    force cpu.debug_peripheral.i_Cmd_DV = r_Debug_Cmd_DV;
+    force cpu.debug_peripheral.i_Cmd_Byte = r_Debug_Cmd_Byte;
+  end
+
   // verilator lint_off PINMISSING
-  cpu cpu (
+  cpu #(
+      .UART_CLKS_PER_BIT(UART_CLKS_PER_BIT)
+  ) cpu (
       .i_Clock(i_Clock),
       .i_Reset(i_Reset),
       .i_Init_Calib_Complete(1'b1),
@@ -63,40 +82,107 @@ module cpu_integration_tests_harness ();
   wire [31:0] w_axil_data_memory_adjusted_awaddr = s_data_memory_axil_awaddr - 32'h80000000;
   wire [31:0] w_axil_instruction_memory_adjusted_araddr = s_instruction_memory_axil_araddr - 32'h00000000;
 
+  // Optional cocotb-side data memory (see cpu/axil_memory.py). While
+  // r_External_Data_Memory is set, the Python model answers the CPU's data
+  // port through the r_Ext_Data_* registers with the full 32-bit address, and
+  // data_ram sees no requests.
+  reg r_External_Data_Memory = 1'b0;
+  reg r_Ext_Data_Arready = 1'b0;
+  reg [31:0] r_Ext_Data_Rdata = 32'b0;
+  reg r_Ext_Data_Rvalid = 1'b0;
+  reg r_Ext_Data_Awready = 1'b0;
+  reg r_Ext_Data_Wready = 1'b0;
+  reg r_Ext_Data_Bvalid = 1'b0;
+
+  wire w_data_ram_arready;
+  wire [31:0] w_data_ram_rdata;
+  wire w_data_ram_rvalid;
+  wire w_data_ram_awready;
+  wire w_data_ram_wready;
+  wire [1:0] w_data_ram_bresp;
+  wire w_data_ram_bvalid;
+
+  assign s_data_memory_axil_arready = r_External_Data_Memory ? r_Ext_Data_Arready : w_data_ram_arready;
+  assign s_data_memory_axil_rdata = r_External_Data_Memory ? r_Ext_Data_Rdata : w_data_ram_rdata;
+  assign s_data_memory_axil_rvalid = r_External_Data_Memory ? r_Ext_Data_Rvalid : w_data_ram_rvalid;
+  assign s_data_memory_axil_awready = r_External_Data_Memory ? r_Ext_Data_Awready : w_data_ram_awready;
+  assign s_data_memory_axil_wready = r_External_Data_Memory ? r_Ext_Data_Wready : w_data_ram_wready;
+  assign s_data_memory_axil_bresp = r_External_Data_Memory ? 2'b00 : w_data_ram_bresp;
+  assign s_data_memory_axil_bvalid = r_External_Data_Memory ? r_Ext_Data_Bvalid : w_data_ram_bvalid;
+
   // verilator lint_off PINMISSING
   axil_ram data_ram (
       .rst(i_Reset),
       .clk(i_Clock),
       .s_axil_araddr(w_axil_data_memory_adjusted_araddr[15:0]),
-      .s_axil_arvalid(s_data_memory_axil_arvalid),
-      .s_axil_arready(s_data_memory_axil_arready),
-      .s_axil_rdata(s_data_memory_axil_rdata),
-      .s_axil_rvalid(s_data_memory_axil_rvalid),
+      .s_axil_arvalid(s_data_memory_axil_arvalid && !r_External_Data_Memory),
+      .s_axil_arready(w_data_ram_arready),
+      .s_axil_rdata(w_data_ram_rdata),
+      .s_axil_rvalid(w_data_ram_rvalid),
       .s_axil_rready(s_data_memory_axil_rready),
-      .s_axil_awvalid(s_data_memory_axil_awvalid),
+      .s_axil_awvalid(s_data_memory_axil_awvalid && !r_External_Data_Memory),
       .s_axil_awaddr(w_axil_data_memory_adjusted_awaddr[15:0]),
-      .s_axil_awready(s_data_memory_axil_awready),
-      .s_axil_wvalid(s_data_memory_axil_wvalid),
+      .s_axil_awready(w_data_ram_awready),
+      .s_axil_wvalid(s_data_memory_axil_wvalid && !r_External_Data_Memory),
       .s_axil_wdata(s_data_memory_axil_wdata),
       .s_axil_wstrb(s_data_memory_axil_wstrb),
-      .s_axil_wready(s_data_memory_axil_wready),
-      .s_axil_bvalid(s_data_memory_axil_bvalid),
+      .s_axil_wready(w_data_ram_wready),
+      .s_axil_bvalid(w_data_ram_bvalid),
       .s_axil_bready(s_data_memory_axil_bready),
-      .s_axil_bresp(s_data_memory_axil_bresp)
+      .s_axil_bresp(w_data_ram_bresp)
   );
   // verilator lint_off PINMISSING
 
+  // The same for the instruction port: r_External_Instruction_Memory lets the
+  // Python model serve RAM fetches instead of instruction_ram.
+  reg r_External_Instruction_Memory = 1'b0;
+  reg r_Ext_Instruction_Arready = 1'b0;
+  reg [31:0] r_Ext_Instruction_Rdata = 32'b0;
+  reg r_Ext_Instruction_Rvalid = 1'b0;
+
+  wire w_instruction_ram_arready;
+  wire [31:0] w_instruction_ram_rdata;
+  wire w_instruction_ram_rvalid;
+
+  assign s_instruction_memory_axil_arready = r_External_Instruction_Memory ? r_Ext_Instruction_Arready : w_instruction_ram_arready;
+  assign s_instruction_memory_axil_rdata = r_External_Instruction_Memory ? r_Ext_Instruction_Rdata : w_instruction_ram_rdata;
+  assign s_instruction_memory_axil_rvalid = r_External_Instruction_Memory ? r_Ext_Instruction_Rvalid : w_instruction_ram_rvalid;
+
   // verilator lint_off PINMISSING
   axil_ram instruction_ram (
       .rst(i_Reset),
       .clk(i_Clock),
       .s_axil_araddr(w_axil_instruction_memory_adjusted_araddr[15:0]),
-      .s_axil_arvalid(s_instruction_memory_axil_arvalid),
-      .s_axil_arready(s_instruction_memory_axil_arready),
-      .s_axil_rdata(s_instruction_memory_axil_rdata),
-      .s_axil_rvalid(s_instruction_memory_axil_rvalid),
+      .s_axil_arvalid(s_instruction_memory_axil_arvalid && !r_External_Instruction_Memory),
+      .s_axil_arready(w_instruction_ram_arready),
+      .s_axil_rdata(w_instruction_ram_rdata),
+      .s_axil_rvalid(w_instruction_ram_rvalid),
       .s_axil_rready(s_instruction_memory_axil_rready)
   );
   // verilator lint_off PINMISSING
 
+  // Backdoor memory images for the tests (see cpu/memory_image.py). cocotb
+  // writes a $readmemh file, puts its path in r_Image_Path and pulses one of
+  // the strobes, which loads the whole image in a single simulator call
+  // instead of one VPI write per byte.
+  reg [8*256-1:0] r_Image_Path = 0;
+  reg r_Load_Data_Ram = 1'b0;
+  reg r_Load_Instruction_Ram = 1'b0;
+  reg r_Load_Rom = 1'b0;
+  reg r_Dump_Data_Ram = 1'b0;
+  reg r_Dump_Instruction_Ram = 1'b0;
+  reg r_Dump_Rom = 1'b0;
+
+  always @(posedge r_Load_Data_Ram) $readmemh(r_Image_Path, data_ram.mem);
+  always @(posedge r_Load_Instruction_Ram) $readmemh(r_Image_Path, instruction_ram.mem);
+  always @(posedge r_Load_Rom) $readmemh(r_Image_Path, cpu.instruction_memory.rom);
+  always @(posedge r_Dump_Data_Ram) $writememh(r_Image_Path, data_ram.mem);
+  always @(posedge r_Dump_Instruction_Ram) $writememh(r_Image_Path, instruction_ram.mem);
+  always @(posedge r_Dump_Rom) $writememh(r_Image_Path, cpu.instruction_memory.rom);
+
+  // i_Clock cycles since time 0, read at the start and end of every test by
+  // perf_records.py
+  reg [63:0] r_Cycle_Count = 64'd0;
+  always @(posedge i_Clock) r_Cycle_Count <= r_Cycle_Count + 1;
+
 endmodule
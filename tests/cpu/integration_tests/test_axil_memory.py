@@ -0,0 +1,131 @@
+import os
+import time
+
+import cocotb
+import numpy as np
+from cocotb.triggers import ClockCycles
+from cocotb.clock import Clock
+
+from assembler import assemble
+from cpu.axil_memory import AxiLiteMemory, PAGE_SIZE, SparseMemory
+from cpu.constants import FRAMEBUFFER_0_ADDR, RAM_START_ADDR
+from cpu.memory_image import INSTRUCTION_RAM, fill_memory, load_words
+from cpu.utils import send_unhalt_command, send_write_pc_command, wait_for_pipeline_flush
+
+wait_ns = 1
+
+FRAMEBUFFER_BYTES = 640 * 480 * 2
+FRAMEBUFFER_PAGES = -(-FRAMEBUFFER_BYTES // PAGE_SIZE)
+RED_PIXELS = 0xF000F000  # two 16bpp pixels per word
+
+# Simulated cycles between checks for the program reaching its end label
+POLL_CYCLES = 1000
+
+# One store per 4KB page over the whole framebuffer, plus its last word:
+# every page gets allocated at a fraction of the cost of a full fill
+FRAMEBUFFER_PAGES_PROGRAM = f"""
+    li    t0, {FRAMEBUFFER_0_ADDR}
+    li    t1, {FRAMEBUFFER_PAGES - 1}
+    li    t2, {RED_PIXELS}
+    li    t3, {PAGE_SIZE}
+loop:
+    sw    t2, 0(t0)
+    add   t0, t0, t3
+    addi  t1, t1, -1
+    bnez  t1, loop
+    li    t0, {FRAMEBUFFER_0_ADDR + FRAMEBUFFER_BYTES - 4}
+    sw    t2, 0(t0)
+end:
+    j     end
+"""
+
+# assemble.py's fill loop, unrolled 8 words per iteration
+FRAMEBUFFER_FILL_PROGRAM = f"""
+    li    t0, {FRAMEBUFFER_0_ADDR}
+    li    t1, {FRAMEBUFFER_BYTES // 32}
+    li    t2, {RED_PIXELS}
+loop:
+    sw    t2, 0(t0)
+    sw    t2, 4(t0)
+    sw    t2, 8(t0)
+    sw    t2, 12(t0)
+    sw    t2, 16(t0)
+    sw    t2, 20(t0)
+    sw    t2, 24(t0)
+    sw    t2, 28(t0)
+    addi  t0, t0, 32
+    addi  t1, t1, -1
+    bnez  t1, loop
+end:
+    j     end
+"""
+
+
+async def start_program(dut, source):
+    """Assemble source into instruction RAM and leave the CPU halted at its start"""
+    start_address = RAM_START_ADDR + 0x800
+    program = assemble(source, start_address)
+
+    clock = Clock(dut.i_Clock, wait_ns, "ns")
+    cocotb.start_soon(clock.start())
+
+    dut.i_Reset.value = 1
+    await ClockCycles(dut.i_Clock, 1)
+    dut.i_Reset.value = 0
+
+    await send_write_pc_command(dut, start_address)
+    await wait_for_pipeline_flush(dut)
+    await load_words(dut, INSTRUCTION_RAM, start_address, program.words)
+    return program
+
+
+async def run_to_end(dut, program, timeout_cycles):
+    """Unhalt the CPU and wait until it spins on the program's end label"""
+    end_address = program.symbols['end']
+    await send_unhalt_command(dut)
+    for _ in range(0, timeout_cycles, POLL_CYCLES):
+        await ClockCycles(dut.i_Clock, POLL_CYCLES)
+        if dut.cpu.r_PC.value.integer == end_address:
+            # Later tests expect the zeroed RAM the harness starts with
+            await fill_memory(dut, INSTRUCTION_RAM, program.base_addr, 4 * len(program.words))
+            return
+    raise AssertionError(f"Program did not reach 'end' within {timeout_cycles} cycles")
+
+
+@cocotb.test()
+async def test_framebuffer_pages(dut):
+    """Stores across the whole framebuffer reach the sparse model, one 4KB page allocated per page touched"""
+    program = await start_program(dut, FRAMEBUFFER_PAGES_PROGRAM)
+    memory = SparseMemory()
+    slave = AxiLiteMemory(dut, memory)
+    slave.start()
+
+    await run_to_end(dut, program, 20000)
+    slave.stop()
+
+    assert slave.writes == FRAMEBUFFER_PAGES
+    assert memory.allocated_bytes == FRAMEBUFFER_PAGES * PAGE_SIZE
+    for page in range(FRAMEBUFFER_PAGES - 1):
+        assert memory.read_word(FRAMEBUFFER_0_ADDR + page * PAGE_SIZE) == RED_PIXELS
+    assert memory.read_word(FRAMEBUFFER_0_ADDR + FRAMEBUFFER_BYTES - 4) == RED_PIXELS
+    # Nothing aliased into the words between the stores
+    assert memory.read_word(FRAMEBUFFER_0_ADDR + 4) == 0
+
+
+@cocotb.test(skip="FULL_FRAMEBUFFER_FILL" not in os.environ)
+async def test_framebuffer_fill(dut):
+    """A full 640x480x16bpp framebuffer fill (minutes of wall time: set FULL_FRAMEBUFFER_FILL=1 to run it)"""
+    program = await start_program(dut, FRAMEBUFFER_FILL_PROGRAM)
+    memory = SparseMemory()
+    slave = AxiLiteMemory(dut, memory)
+    slave.start()
+
+    started = time.perf_counter()
+    await run_to_end(dut, program, 20 * FRAMEBUFFER_BYTES)
+    slave.stop()
+    dut._log.info(f"{slave.writes} stores in {time.perf_counter() - started:.1f} s")
+
+    assert slave.writes == FRAMEBUFFER_BYTES // 4
+    assert memory.allocated_bytes == FRAMEBUFFER_PAGES * PAGE_SIZE
+    pixels = memory.read_array(FRAMEBUFFER_0_ADDR, FRAMEBUFFER_BYTES).view("<u2")
+    assert np.all(pixels == 0xF000), "Framebuffer not filled with red pixels"
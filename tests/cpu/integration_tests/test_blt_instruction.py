@@ -1,5 +1,5 @@
 import cocotb
-from cocotb.triggers import ClockCycles, RisingEdge
+from cocotb.triggers import ClockCycles
 from cocotb.clock import Clock
 
 from cpu.utils import (
@@ -13,6 +13,7 @@ from cpu.constants import (
     FUNC3_BRANCH_BLT,
     RAM_START_ADDR,
 )
+from cpu.waits import wait_for_value
 
 wait_ns = 1
 
@@ -45,11 +46,7 @@ async def test_blt_instruction_when_lt(dut):
     await send_unhalt_command(dut)
 
     max_cycles = 100
-    for _ in range(max_cycles):
-        await RisingEdge(dut.i_Clock)
-        if dut.cpu.r_PC.value.integer == expected_pc:
-            break
-    else:
+    if not await wait_for_value(dut.cpu.r_PC, expected_pc, dut.i_Clock, max_cycles):
         raise AssertionError("Timeout waiting for BLT taken to reach target PC")
 
     assert dut.cpu.r_PC.value.integer == expected_pc, f"BLT instruction failed: PC is {dut.cpu.r_PC.value.integer:#010x}, expected {expected_pc:#010x}"
@@ -83,11 +80,7 @@ async def test_blt_instruction_when_ge(dut):
     await send_unhalt_command(dut)
 
     max_cycles = 100
-    for _ in range(max_cycles):
-        await RisingEdge(dut.i_Clock)
-        if dut.cpu.r_PC.value.integer == expected_pc:
-            break
-    else:
+    if not await wait_for_value(dut.cpu.r_PC, expected_pc, dut.i_Clock, max_cycles):
         raise AssertionError("Timeout waiting for BLT not-taken to advance PC by 4")
 
     assert dut.cpu.r_PC.value.integer == expected_pc, f"BLT instruction failed: PC is {dut.cpu.r_PC.value.integer:#010x}, expected {expected_pc:#010x}"
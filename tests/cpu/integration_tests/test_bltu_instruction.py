@@ -1,5 +1,5 @@
 import cocotb
-from cocotb.triggers import ClockCycles, RisingEdge
+from cocotb.triggers import ClockCycles
 from cocotb.clock import Clock
 
 from cpu.utils import (
@@ -16,6 +16,7 @@ from cpu.constants import (
     DEBUG_OP_HALT,
     DEBUG_OP_UNHALT,
 )
+from cpu.waits import wait_for_value
 
 wait_ns = 1
 
@@ -48,11 +49,7 @@ async def test_bltu_instruction_when_ltu(dut):
     await send_unhalt_command(dut)
 
     max_cycles = 100
-    for _ in range(max_cycles):
-        await RisingEdge(dut.i_Clock)
-        if dut.cpu.r_PC.value.integer == expected_pc:
-            break
-    else:
+    if not await wait_for_value(dut.cpu.r_PC, expected_pc, dut.i_Clock, max_cycles):
         raise AssertionError("Timeout waiting for BLTU taken to reach target PC")
 
     assert dut.cpu.r_PC.value.integer == expected_pc, f"BLTU instruction failed: PC is {dut.cpu.r_PC.value.integer:#010x}, expected {expected_pc:#010x}"
@@ -85,11 +82,7 @@ async def test_bltu_instruction_when_geu(dut):
     await send_unhalt_command(dut)
     
     max_cycles = 100
-    for _ in range(max_cycles):
-        await RisingEdge(dut.i_Clock)
-        if dut.cpu.r_PC.value.integer == expected_pc:
-            break
-    else:
+    if not await wait_for_value(dut.cpu.r_PC, expected_pc, dut.i_Clock, max_cycles):
         raise AssertionError("Timeout waiting for BLTU not-taken to advance PC by 4")
 
     assert dut.cpu.r_PC.value.integer == expected_pc, f"BLTU instruction failed: PC is {dut.cpu.r_PC.value.integer:#010x}, expected {expected_pc:#010x}"
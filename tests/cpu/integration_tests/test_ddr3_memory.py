@@ -0,0 +1,151 @@
+import cocotb
+import numpy as np
+from cocotb.triggers import ClockCycles
+from cocotb.clock import Clock
+from cocotb.utils import get_sim_time
+
+from assembler import assemble
+from cpu.axil_memory import DATA_PORT, INSTRUCTION_PORT, AxiLiteMemory, SparseMemory
+from cpu.constants import RAM_START_ADDR
+from cpu.ddr3_model import Ddr3Controller, Ddr3Timing
+from cpu.iss import RV32ISimulator
+from cpu.memory_image import INSTRUCTION_RAM, fill_memory, load_words
+from cpu.scoreboard import RetirementScoreboard
+from cpu.utils import (
+    assert_registers_match,
+    send_unhalt_command,
+    send_write_pc_command,
+    wait_for_pipeline_flush,
+)
+
+wait_ns = 1
+
+DATA_ADDR = 0x80010000  # bank 0 with the default 8 x 2KB-row mapping
+NEXT_ROW_SAME_BANK = DATA_ADDR + 2048 * 8
+
+# Loads whose row behaviour is known: empty, hit, hit, conflict, conflict, then a store hit
+ROW_PROGRAM = f"""
+    li    s0, {DATA_ADDR}
+    li    s1, {NEXT_ROW_SAME_BANK}
+    lw    t0, 0(s0)
+    lw    t1, 4(s0)
+    lw    t2, 0x7FC(s0)
+    lw    t3, 0(s1)
+    lw    t4, 8(s0)
+    sw    t0, 12(s0)
+end:
+    j     end
+"""
+
+# Sum an array: one load per five instructions, all fetched from DDR3
+SUM_PROGRAM = f"""
+    li    s0, {DATA_ADDR}
+    li    s1, 32
+    li    a0, 0
+loop:
+    lw    t0, 0(s0)
+    addi  s0, s0, 4
+    add   a0, a0, t0
+    addi  s1, s1, -1
+    bnez  s1, loop
+end:
+    j     end
+"""
+
+ZERO_LATENCY = Ddr3Timing(read_latency=0, write_latency=0, activate_cycles=0, precharge_cycles=0)
+
+
+async def run_on_ddr3(dut, source, timing, data, fetch_from_ddr3=True):
+    """Run source to its end label with the data port (and optionally fetches) on a Ddr3Controller.
+
+    Returns:
+        (cycles from unhalt to the last retirement, controller, scoreboard ISS)
+    """
+    start_address = RAM_START_ADDR + 0x800
+    program = assemble(source, start_address)
+    words = np.asarray(program.words, dtype=np.int64).astype("<u4")
+
+    clock = Clock(dut.i_Clock, wait_ns, "ns")
+    cocotb.start_soon(clock.start())
+
+    dut.i_Reset.value = 1
+    await ClockCycles(dut.i_Clock, 1)
+    dut.i_Reset.value = 0
+
+    await send_write_pc_command(dut, start_address)
+    await wait_for_pipeline_flush(dut)
+
+    memory = SparseMemory()
+    memory.write(DATA_ADDR, data)
+    controller = Ddr3Controller(dut.i_Clock, timing)
+    slaves = [AxiLiteMemory(dut, memory, DATA_PORT, controller)]
+    if fetch_from_ddr3:
+        memory.write(start_address, words)
+        slaves.append(AxiLiteMemory(dut, memory, INSTRUCTION_PORT, controller))
+    else:
+        await load_words(dut, INSTRUCTION_RAM, start_address, program.words)
+    for slave in slaves:
+        slave.start()
+
+    iss = RV32ISimulator(pc=start_address)
+    iss.write_bytes(DATA_ADDR, data.tobytes())
+    iss.load_instructions(start_address, program.words)
+    scoreboard = RetirementScoreboard(dut, iss, until_pc=program.symbols['end'])
+    scoreboard.start()
+    await send_unhalt_command(dut)
+    started = get_sim_time("ns")
+    await scoreboard.wait_until_done(timeout_ns=200000 * wait_ns)
+    cycles = int(get_sim_time("ns") - started) // wait_ns
+    await ClockCycles(dut.i_Clock, 100)  # last writeback reaches the register file
+    assert_registers_match(dut, iss.registers)
+
+    for slave in slaves:
+        slave.stop()
+    if not fetch_from_ddr3:
+        # Later tests expect the zeroed RAM the harness starts with
+        await fill_memory(dut, INSTRUCTION_RAM, start_address, 4 * len(program.words))
+    return cycles, controller, iss
+
+
+@cocotb.test()
+async def test_row_hit_and_miss_timing(dut):
+    """Each load pays the base latency plus tRCD on an idle bank and tRP + tRCD on a row conflict"""
+    data = np.arange(1, 1 + 2048 // 4, dtype="<u4")
+    timing = Ddr3Timing(read_latency=10, write_latency=5, activate_cycles=3, precharge_cycles=4)
+    _, controller, iss = await run_on_ddr3(dut, ROW_PROGRAM, timing, data, fetch_from_ddr3=False)
+
+    assert (controller.row_empties, controller.row_hits, controller.row_conflicts) == (1, 3, 2)
+    assert controller.busy_cycles == 5 * 10 + 5 + 3 + 2 * (4 + 3)
+    assert iss.registers[7] == 2048 // 4  # t2 read the last word of the row
+
+
+@cocotb.test()
+async def test_ddr3_latency_raises_cpi(dut):
+    """Fetching and loading through the DDR3 model costs at least its read latency per instruction"""
+    data = np.arange(32, dtype="<u4") * 3
+    fast_cycles, _, iss = await run_on_ddr3(dut, SUM_PROGRAM, ZERO_LATENCY, data)
+    timing = Ddr3Timing()
+    ddr3_cycles, controller, _ = await run_on_ddr3(dut, SUM_PROGRAM, timing, data)
+
+    instructions = 3 + 5 * 32
+    dut._log.info(
+        f"CPI {fast_cycles / instructions:.1f} without latency, {ddr3_cycles / instructions:.1f} on DDR3 "
+        f"({controller.requests} requests, {controller.row_hit_rate:.0%} row hits)"
+    )
+    assert iss.registers[10] == int(data.sum())
+    assert ddr3_cycles >= fast_cycles + instructions * timing.read_latency
+
+
+@cocotb.test()
+async def test_outstanding_limit_serialises_ports(dut):
+    """With one outstanding request, fetches queue behind loads and the program runs slower"""
+    data = np.arange(32, dtype="<u4")
+    timing = Ddr3Timing(max_outstanding=2)
+    parallel_cycles, parallel, _ = await run_on_ddr3(dut, SUM_PROGRAM, timing, data)
+    timing = Ddr3Timing(max_outstanding=1)
+    serial_cycles, serial, _ = await run_on_ddr3(dut, SUM_PROGRAM, timing, data)
+
+    dut._log.info(f"{parallel_cycles} cycles with 2 outstanding, {serial_cycles} with 1 ({serial.queued} queued)")
+    assert parallel.queued == 0
+    assert serial.queued > 0
+    assert serial_cycles > parallel_cycles
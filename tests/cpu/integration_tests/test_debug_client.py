@@ -0,0 +1,77 @@
+import cocotb
+from cocotb.clock import Clock
+from cocotb.triggers import ClockCycles
+
+from debug_client import AsyncDebugClient, protocol
+from cpu.constants import RAM_START_ADDR
+from cpu.debug_transports import CocotbBackdoorTransport, CocotbUartTransport
+from cpu.utils import read_registers
+
+wait_ns = 1
+
+
+async def reset(dut):
+    clock = Clock(dut.i_Clock, wait_ns, "ns")
+    cocotb.start_soon(clock.start())
+
+    dut.i_Reset.value = 1
+    await ClockCycles(dut.i_Clock, 1)
+    dut.i_Reset.value = 0
+    await ClockCycles(dut.i_Clock, 1)
+
+
+async def check_client(dut, transport):
+    client = AsyncDebugClient(transport)
+
+    assert await client.ping(), "PING not answered"
+
+    await client.write_pc(RAM_START_ADDR + 0x40)
+    assert await client.read_pc() == RAM_START_ADDR + 0x40
+    state = await client.dump_state()
+    assert state["pipeline_flushed"] and state["init_calib"], f"Unexpected state after WRITE_PC: {state}"
+
+    # One batch of 31 writes, one of 32 reads
+    values = {index: (index * 0x01020304) ^ 0xA5A5A5A5 for index in range(1, 32)}
+    await client.write_registers(values)
+    await ClockCycles(dut.i_Clock, 10)  # last write reaches the register file
+    assert read_registers(dut)[1:] == list(values.values())
+    assert await client.read_registers() == [0] + list(values.values())
+
+    # Mixed batch: results come back in command order
+    halted, pc, register, state = await client.execute(
+        [protocol.halt(), protocol.read_pc(), protocol.read_register(31), protocol.dump_state()]
+    )
+    assert (halted, pc, register) == (None, RAM_START_ADDR + 0x40, values[31])
+    transport.close()
+
+
+@cocotb.test()
+async def test_client_over_uart(dut):
+    """DebugClient commands and batches over the harness UART"""
+    await reset(dut)
+    await check_client(dut, CocotbUartTransport(dut))
+
+
+@cocotb.test()
+async def test_client_over_backdoor(dut):
+    """The same commands with requests sent over the backdoor"""
+    await reset(dut)
+    await check_client(dut, CocotbBackdoorTransport(dut))
+
+
+@cocotb.test()
+async def test_probe_batch_over_uart(dut):
+    """tools/probe.py's HALT/READ_PC/DUMP_STATE/UNHALT burst leaves the CPU running"""
+    await reset(dut)
+    transport = CocotbUartTransport(dut)
+    client = AsyncDebugClient(transport)
+
+    halted, pc, state, unhalted = await client.execute(
+        [protocol.halt(), protocol.read_pc(), protocol.dump_state(), protocol.unhalt()]
+    )
+    transport.close()
+    assert state["pipeline_flushed"], f"DUMP_STATE should see the halted pipeline: {state}"
+    # UNHALT went out before the replies finished; the CPU is already running again
+    assert dut.cpu.debug_peripheral.o_Halt_Cpu.value.integer == 0
+    await ClockCycles(dut.i_Clock, 100)
+    assert dut.cpu.r_PC.value.integer != pc, f"CPU should run past the sampled PC {pc:#010x}"
@@ -1,5 +1,6 @@
 import cocotb
-from cpu.utils import uart_send_byte, uart_wait_for_byte
+from cpu.uart_monitor import debug_uart_monitor
+from cpu.utils import uart_send_byte
 from cpu.constants import DEBUG_OP_HALT, DEBUG_OP_DUMP_STATE
 from cocotb.clock import Clock
 from cocotb.triggers import ClockCycles
@@ -12,6 +13,7 @@ async def test_dump_state_command(dut):
 
     clock = Clock(dut.i_Clock, wait_ns, "ns")
     cocotb.start_soon(clock.start())
+    monitor = debug_uart_monitor(dut)
 
     dut.i_Reset.value = 1
     await ClockCycles(dut.i_Clock, 1)
@@ -47,19 +49,10 @@ async def test_dump_state_command(dut):
 
     # Send DUMP_STATE command
     await uart_send_byte(dut.i_Clock, dut.cpu.i_Uart_Tx_In, dut.cpu.debug_peripheral.uart_receiver.o_Rx_DV, DEBUG_OP_DUMP_STATE)
-    await ClockCycles(dut.i_Clock, 6)
 
     # Receive 2-byte response
-    byte0 = await uart_wait_for_byte(
-        dut.i_Clock,
-        dut.cpu.o_Uart_Rx_Out,
-        dut.cpu.debug_peripheral.uart_transmitter.o_Tx_Done
-    )
-    byte1 = await uart_wait_for_byte(
-        dut.i_Clock,
-        dut.cpu.o_Uart_Rx_Out,
-        dut.cpu.debug_peripheral.uart_transmitter.o_Tx_Done
-    )
+    byte0 = await monitor.read_byte()
+    byte1 = await monitor.read_byte()
 
     assert byte0 == expected_byte0, (
         f"DUMP_STATE byte0 mismatch. Expected 0x{expected_byte0:02X}, got 0x{byte0:02X}\n"
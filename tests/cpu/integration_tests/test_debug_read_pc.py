@@ -1,8 +1,9 @@
 import cocotb
-from cpu.utils import uart_send_byte, uart_wait_for_byte
+from cpu.uart_monitor import debug_uart_monitor
+from cpu.utils import uart_send_byte
 from cpu.constants import DEBUG_OP_READ_PC, DEBUG_OP_HALT
 from cocotb.clock import Clock
-from cocotb.triggers import ClockCycles
+from cocotb.triggers import ClockCycles, RisingEdge
 
 wait_ns = 1
 
@@ -12,6 +13,7 @@ async def test_read_pc_command(dut):
 
     clock = Clock(dut.i_Clock, wait_ns, "ns")
     cocotb.start_soon(clock.start())
+    monitor = debug_uart_monitor(dut)
 
     dut.i_Reset.value = 1
     await ClockCycles(dut.i_Clock, 1)
@@ -27,32 +29,15 @@ async def test_read_pc_command(dut):
     
     # Send READ_PC command
     await uart_send_byte(dut.i_Clock, dut.cpu.i_Uart_Tx_In, dut.cpu.debug_peripheral.uart_receiver.o_Rx_DV, DEBUG_OP_READ_PC)
-    await ClockCycles(dut.i_Clock, 6)
 
     # Receive 4 bytes in little-endian format
-    byte0 = await uart_wait_for_byte(
-        dut.i_Clock,
-        dut.cpu.o_Uart_Rx_Out,
-        dut.cpu.debug_peripheral.uart_transmitter.o_Tx_Done
-    )
-
-    byte1 = await uart_wait_for_byte(
-        dut.i_Clock,
-        dut.cpu.o_Uart_Rx_Out,
-        dut.cpu.debug_peripheral.uart_transmitter.o_Tx_Done
-    )
-
-    byte2 = await uart_wait_for_byte(
-        dut.i_Clock,
-        dut.cpu.o_Uart_Rx_Out,
-        dut.cpu.debug_peripheral.uart_transmitter.o_Tx_Done
-    )
-
-    byte3 = await uart_wait_for_byte(
-        dut.i_Clock,
-        dut.cpu.o_Uart_Rx_Out,
-        dut.cpu.debug_peripheral.uart_transmitter.o_Tx_Done
-    )
+    byte0 = await monitor.read_byte()
+
+    byte1 = await monitor.read_byte()
+
+    byte2 = await monitor.read_byte()
+
+    byte3 = await monitor.read_byte()
 
     # Reconstruct PC from little-endian bytes
     received_pc = byte0 | (byte1 << 8) | (byte2 << 16) | (byte3 << 24)
@@ -70,3 +55,49 @@ async def test_read_pc_command(dut):
 
     for i, (expected, received) in enumerate(zip(expected_bytes, received_bytes)):
         assert expected == received, f"Byte {i} mismatch: expected {expected:#04x}, got {received:#04x}"
+
+
+@cocotb.test()
+async def test_read_pc_while_running(dut):
+    """READ_PC samples a running CPU without halting it and returns a PC it actually held"""
+
+    clock = Clock(dut.i_Clock, wait_ns, "ns")
+    cocotb.start_soon(clock.start())
+    monitor = debug_uart_monitor(dut)
+
+    dut.i_Reset.value = 1
+    await ClockCycles(dut.i_Clock, 1)
+    dut.i_Reset.value = 0
+    await ClockCycles(dut.i_Clock, 1)
+
+    pcs = set()
+    accepted_pc = None
+    halted = False
+
+    async def watch_cpu():
+        nonlocal accepted_pc, halted
+        peripheral = dut.cpu.debug_peripheral
+        while True:
+            # Values read here are the ones the flops sample on this edge
+            await RisingEdge(dut.i_Clock)
+            pcs.add(dut.cpu.r_PC.value.integer)
+            if peripheral.w_Cmd_DV.value.integer and peripheral.r_State.value.integer == 0:
+                accepted_pc = dut.cpu.r_PC.value.integer
+            halted |= bool(peripheral.o_Halt_Cpu.value.integer)
+
+    watcher = cocotb.start_soon(watch_cpu())
+    # The PC does not move every cycle: shift each command by one more cycle so
+    # a reply assembled from later cycles cannot match by luck
+    for phase in range(4):
+        await ClockCycles(dut.i_Clock, phase + 1)
+        await uart_send_byte(dut.i_Clock, dut.cpu.i_Uart_Tx_In, dut.cpu.debug_peripheral.uart_receiver.o_Rx_DV, DEBUG_OP_READ_PC)
+        received_pc = int.from_bytes(await monitor.read_bytes(4), "little")
+        # All four bytes come from the PC of the cycle the opcode was accepted
+        assert received_pc == accepted_pc, (
+            f"READ_PC should return the PC sampled when the command was accepted ({accepted_pc:#010x}), got {received_pc:#010x}"
+        )
+    watcher.kill()
+    monitor.stop()
+
+    assert not halted, "READ_PC should not halt the CPU"
+    assert len(pcs) > 1, "CPU should keep running while READ_PC is answered"
@@ -1,5 +1,6 @@
 import cocotb
-from cpu.utils import uart_send_byte, uart_wait_for_byte, wait_for_pipeline_flush
+from cpu.uart_monitor import debug_uart_monitor
+from cpu.utils import uart_send_byte, wait_for_pipeline_flush
 from cpu.constants import DEBUG_OP_READ_REGISTER, DEBUG_OP_WRITE_REGISTER, DEBUG_OP_HALT, DEBUG_OP_UNHALT
 from cocotb.clock import Clock
 from cocotb.triggers import ClockCycles
@@ -15,6 +16,7 @@ async def test_read_register_basic(dut):
 
     clock = Clock(dut.i_Clock, wait_ns, "ns")
     cocotb.start_soon(clock.start())
+    monitor = debug_uart_monitor(dut)
 
     dut.i_Reset.value = 1
     await ClockCycles(dut.i_Clock, 1)
@@ -39,32 +41,15 @@ async def test_read_register_basic(dut):
     # Send READ_REGISTER command (CPU is already halted, no need to UNHALT first)
     await uart_send_byte(dut.i_Clock, dut.cpu.i_Uart_Tx_In, dut.cpu.debug_peripheral.uart_receiver.o_Rx_DV, DEBUG_OP_READ_REGISTER)
     await uart_send_byte(dut.i_Clock, dut.cpu.i_Uart_Tx_In, dut.cpu.debug_peripheral.uart_receiver.o_Rx_DV, test_register)
-    await ClockCycles(dut.i_Clock, 6)
 
     # Receive 4 bytes in little-endian format
-    byte0 = await uart_wait_for_byte(
-        dut.i_Clock,
-        dut.cpu.o_Uart_Rx_Out,
-        dut.cpu.debug_peripheral.uart_transmitter.o_Tx_Done
-    )
-
-    byte1 = await uart_wait_for_byte(
-        dut.i_Clock,
-        dut.cpu.o_Uart_Rx_Out,
-        dut.cpu.debug_peripheral.uart_transmitter.o_Tx_Done
-    )
-
-    byte2 = await uart_wait_for_byte(
-        dut.i_Clock,
-        dut.cpu.o_Uart_Rx_Out,
-        dut.cpu.debug_peripheral.uart_transmitter.o_Tx_Done
-    )
-
-    byte3 = await uart_wait_for_byte(
-        dut.i_Clock,
-        dut.cpu.o_Uart_Rx_Out,
-        dut.cpu.debug_peripheral.uart_transmitter.o_Tx_Done
-    )
+    byte0 = await monitor.read_byte()
+
+    byte1 = await monitor.read_byte()
+
+    byte2 = await monitor.read_byte()
+
+    byte3 = await monitor.read_byte()
 
     # Reconstruct register value from little-endian bytes
     received_reg_value = byte0 | (byte1 << 8) | (byte2 << 16) | (byte3 << 24)
@@ -93,6 +78,7 @@ async def test_read_register_doesnt_break_cpu(dut):
 
     clock = Clock(dut.i_Clock, wait_ns, "ns")
     cocotb.start_soon(clock.start())
+    monitor = debug_uart_monitor(dut)
 
     dut.i_Reset.value = 1
     await ClockCycles(dut.i_Clock, 1)
@@ -122,15 +108,10 @@ async def test_read_register_doesnt_break_cpu(dut):
     test_register = 2
     await uart_send_byte(dut.i_Clock, dut.cpu.i_Uart_Tx_In, dut.cpu.debug_peripheral.uart_receiver.o_Rx_DV, DEBUG_OP_READ_REGISTER)
     await uart_send_byte(dut.i_Clock, dut.cpu.i_Uart_Tx_In, dut.cpu.debug_peripheral.uart_receiver.o_Rx_DV, test_register)
-    await ClockCycles(dut.i_Clock, 6)
 
     # Consume the 4 response bytes (don't need to verify content here)
     for _ in range(4):
-        await uart_wait_for_byte(
-            dut.i_Clock,
-            dut.cpu.o_Uart_Rx_Out,
-            dut.cpu.debug_peripheral.uart_transmitter.o_Tx_Done
-        )
+        await monitor.read_byte()
 
     # Verify all register values unchanged (CPU still halted)
     for reg_addr, expected_value in test_values.items():
@@ -149,6 +130,7 @@ async def test_read_register_loop_ready(dut):
 
     clock = Clock(dut.i_Clock, wait_ns, "ns")
     cocotb.start_soon(clock.start())
+    monitor = debug_uart_monitor(dut)
 
     dut.i_Reset.value = 1
     await ClockCycles(dut.i_Clock, 1)
@@ -184,16 +166,11 @@ async def test_read_register_loop_ready(dut):
         # Send READ_REGISTER command: opcode + register address
         await uart_send_byte(dut.i_Clock, dut.cpu.i_Uart_Tx_In, dut.cpu.debug_peripheral.uart_receiver.o_Rx_DV, DEBUG_OP_READ_REGISTER)
         await uart_send_byte(dut.i_Clock, dut.cpu.i_Uart_Tx_In, dut.cpu.debug_peripheral.uart_receiver.o_Rx_DV, reg_addr)
-        await ClockCycles(dut.i_Clock, 6)
 
         # Receive 4 bytes
         bytes_received = []
         for _ in range(4):
-            byte_val = await uart_wait_for_byte(
-                dut.i_Clock,
-                dut.cpu.o_Uart_Rx_Out,
-                dut.cpu.debug_peripheral.uart_transmitter.o_Tx_Done
-            )
+            byte_val = await monitor.read_byte()
             bytes_received.append(byte_val)
 
         # Reconstruct value
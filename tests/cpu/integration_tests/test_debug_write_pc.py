@@ -1,6 +1,13 @@
 import cocotb
-from cpu.utils import uart_send_byte, uart_wait_for_byte, wait_for_pipeline_flush
-from cpu.constants import DEBUG_OP_WRITE_PC, DEBUG_OP_READ_PC, DEBUG_OP_UNHALT
+from cpu.uart_monitor import debug_uart_monitor
+from cpu.utils import send_debug_command, uart_send_byte, wait_for_pipeline_flush
+from cpu.constants import (
+    DEBUG_OP_WRITE_PC,
+    DEBUG_OP_READ_PC,
+    DEBUG_OP_UNHALT,
+    DEBUG_TRANSPORT_BACKDOOR,
+    DEBUG_TRANSPORT_UART,
+)
 from cocotb.clock import Clock
 from cocotb.triggers import ClockCycles
 
@@ -30,19 +37,16 @@ async def send_write_pc_command(dut, pc_value):
 
 async def read_pc_value(dut):
     """Read current PC value using READ_PC command"""
+    monitor = debug_uart_monitor(dut)
     await uart_send_byte(dut.i_Clock, dut.cpu.i_Uart_Tx_In, dut.cpu.debug_peripheral.uart_receiver.o_Rx_DV, DEBUG_OP_READ_PC)
-    await ClockCycles(dut.i_Clock, 20)  # Wait for command processing
 
     # Receive 4 bytes in little-endian format
     bytes_received = []
     for _ in range(4):
-        byte_val = await uart_wait_for_byte(
-            dut.i_Clock,
-            dut.cpu.o_Uart_Rx_Out,
-            dut.cpu.debug_peripheral.uart_transmitter.o_Tx_Done
-        )
+        byte_val = await monitor.read_byte()
         bytes_received.append(byte_val)
 
+    monitor.stop()
     return bytes_received[0] | (bytes_received[1] << 8) | (bytes_received[2] << 16) | (bytes_received[3] << 24)
 
 @cocotb.test()
@@ -135,3 +139,23 @@ async def test_write_pc_data_patterns(dut):
 
         for j, (expected, received) in enumerate(zip(expected_bytes, received_bytes)):
             assert expected == received, f"Pattern {i}, byte {j}: expected {expected:#04x}, got {received:#04x}"
+
+
+@cocotb.test()
+async def test_write_pc_over_each_transport(dut):
+    """The backdoor and the UART deliver the same WRITE_PC command"""
+
+    clock = Clock(dut.i_Clock, wait_ns, "ns")
+    cocotb.start_soon(clock.start())
+
+    dut.i_Reset.value = 1
+    await ClockCycles(dut.i_Clock, 1)
+    dut.i_Reset.value = 0
+    await ClockCycles(dut.i_Clock, 1)
+
+    for transport, test_pc in ((DEBUG_TRANSPORT_UART, 0x0000BEEF), (DEBUG_TRANSPORT_BACKDOOR, 0xCAFEBABE)):
+        await send_debug_command(dut, [DEBUG_OP_WRITE_PC, *test_pc.to_bytes(4, "little")], transport)
+        await ClockCycles(dut.i_Clock, 50)
+
+        direct_pc = dut.cpu.r_PC.value.integer
+        assert direct_pc == test_pc, f"WRITE_PC over {transport}: wrote {test_pc:#010x}, got {direct_pc:#010x}"
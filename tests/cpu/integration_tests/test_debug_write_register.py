@@ -1,5 +1,6 @@
 import cocotb
-from cpu.utils import uart_send_byte, uart_wait_for_byte, wait_for_pipeline_flush
+from cpu.uart_monitor import debug_uart_monitor
+from cpu.utils import uart_send_byte, wait_for_pipeline_flush
 from cpu.constants import DEBUG_OP_WRITE_REGISTER, DEBUG_OP_READ_REGISTER, DEBUG_OP_HALT, DEBUG_OP_UNHALT
 from cocotb.clock import Clock
 from cocotb.triggers import ClockCycles
@@ -22,20 +23,17 @@ async def send_write_register_command(dut, reg_addr, value):
 
 async def read_register_value(dut, reg_addr):
     """Read register value using READ_REGISTER command"""
+    monitor = debug_uart_monitor(dut)
     await uart_send_byte(dut.i_Clock, dut.cpu.i_Uart_Tx_In, dut.cpu.debug_peripheral.uart_receiver.o_Rx_DV, DEBUG_OP_READ_REGISTER)
     await uart_send_byte(dut.i_Clock, dut.cpu.i_Uart_Tx_In, dut.cpu.debug_peripheral.uart_receiver.o_Rx_DV, reg_addr)
-    await ClockCycles(dut.i_Clock, 20)  # Increased delay for read operation
 
     # Receive 4 bytes in little-endian format
     bytes_received = []
     for _ in range(4):
-        byte_val = await uart_wait_for_byte(
-            dut.i_Clock,
-            dut.cpu.o_Uart_Rx_Out,
-            dut.cpu.debug_peripheral.uart_transmitter.o_Tx_Done
-        )
+        byte_val = await monitor.read_byte()
         bytes_received.append(byte_val)
 
+    monitor.stop()
     return bytes_received[0] | (bytes_received[1] << 8) | (bytes_received[2] << 16) | (bytes_received[3] << 24)
 
 @cocotb.test()
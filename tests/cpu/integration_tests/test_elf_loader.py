@@ -0,0 +1,47 @@
+import os
+
+import cocotb
+from cocotb.triggers import ClockCycles
+from cocotb.clock import Clock
+
+from cpu.elf_loader import load_elf, read_elf
+from cpu.iss import RV32ISimulator
+from cpu.scoreboard import RetirementScoreboard
+from cpu.utils import assert_registers_match, send_unhalt_command
+
+wait_ns = 1
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "..", "fixtures")
+SUM_ARRAY_ELF = os.path.join(FIXTURES, "sum_array.elf")
+
+
+@cocotb.test()
+async def test_sum_array_elf(dut):
+    """Run a linked ELF with boot code in ROM, a function in RAM and .data/.bss segments"""
+    image = read_elf(SUM_ARRAY_ELF)
+    end_address = image.symbols["done"]
+    result_address = image.symbols["result"]
+
+    clock = Clock(dut.i_Clock, wait_ns, "ns")
+    cocotb.start_soon(clock.start())
+
+    dut.i_Reset.value = 1
+    await ClockCycles(dut.i_Clock, 1)
+    dut.i_Reset.value = 0
+
+    await load_elf(dut, image)
+    offset = result_address - 0x80000000
+
+    scoreboard_iss = RV32ISimulator(pc=image.entry)
+    for segment in image.segments:
+        scoreboard_iss.write_bytes(segment.address, segment.data)
+    scoreboard = RetirementScoreboard(dut, scoreboard_iss, until_pc=end_address)
+    scoreboard.start()
+    await send_unhalt_command(dut)
+    await scoreboard.wait_until_done(timeout_ns=2000 * wait_ns)
+    await ClockCycles(dut.i_Clock, 20)
+
+    assert scoreboard_iss.read_word(result_address) == 87, "ISS did not run the program as intended"
+    result = sum(dut.data_ram.mem[offset + i].value.integer << (8 * i) for i in range(4))
+    assert result == 87, f"result is {result}, expected 87"
+    assert_registers_match(dut, scoreboard_iss.registers)
@@ -0,0 +1,155 @@
+import time
+
+import cocotb
+import numpy as np
+from cocotb.triggers import ClockCycles
+from cocotb.clock import Clock
+
+from assembler import assemble
+from cpu.constants import CPU_BASE_ADDR, RAM_START_ADDR
+from cpu.iss import RV32ISimulator
+from cpu.memory_image import (
+    DATA_RAM,
+    HARNESS_RAM_SIZE,
+    INSTRUCTION_RAM,
+    ROM,
+    assert_memory_equal,
+    diff_ranges,
+    fill_memory,
+    load_memory,
+    load_words,
+    read_memory,
+)
+from cpu.scoreboard import RetirementScoreboard
+from cpu.utils import (
+    assert_registers_match,
+    send_unhalt_command,
+    send_write_pc_command,
+    wait_for_pipeline_flush,
+)
+
+wait_ns = 1
+
+# Sum words spread over the whole 64KB data RAM
+READ_BACK_PROGRAM = """
+    li    s0, 0x80000000
+    li    s1, 0x80000000 + 0x10000
+    li    a0, 0
+loop:
+    lw    t0, 0(s0)
+    li    t1, 0x1FFC                # stride, fills the load-use slot
+    add   a0, a0, t0
+    add   s0, s0, t1
+    bltu  s0, s1, loop
+end:
+    j     end
+"""
+
+# Store an incrementing word pattern over a 1KB buffer
+FILL_PROGRAM = """
+    li    s0, 0x80003000
+    li    s1, 256                   # words
+    li    t0, 0x01020304
+    li    t1, 0x01010101
+loop:
+    sw    t0, 0(s0)
+    add   t0, t0, t1
+    addi  s0, s0, 4
+    addi  s1, s1, -1
+    bnez  s1, loop
+end:
+    j     end
+"""
+FILL_BUFFER_ADDR = 0x80003000
+
+
+@cocotb.test()
+async def test_bulk_load_data_ram(dut):
+    """A full 64KB random image loaded in one call is what the CPU reads back"""
+    rng = np.random.default_rng(0)
+    image = rng.integers(0, 256, HARNESS_RAM_SIZE, dtype=np.uint8)
+
+    start_address = RAM_START_ADDR + 0x800
+    program = assemble(READ_BACK_PROGRAM, start_address)
+    end_address = program.symbols['end']
+
+    clock = Clock(dut.i_Clock, wait_ns, "ns")
+    cocotb.start_soon(clock.start())
+
+    dut.i_Reset.value = 1
+    await ClockCycles(dut.i_Clock, 1)
+    dut.i_Reset.value = 0
+
+    await send_write_pc_command(dut, start_address)
+    await wait_for_pipeline_flush(dut)
+
+    started = time.perf_counter()
+    await load_memory(dut, DATA_RAM, CPU_BASE_ADDR, image)
+    dut._log.info(f"Loaded {len(image)} bytes in {(time.perf_counter() - started) * 1000:.1f} ms")
+    await load_words(dut, INSTRUCTION_RAM, start_address, program.words)
+
+    for index in rng.integers(0, HARNESS_RAM_SIZE, 64):
+        assert dut.data_ram.mem[int(index)].value.integer == image[index], f"data_ram[{index:#x}] not loaded"
+
+    scoreboard_iss = RV32ISimulator(pc=start_address)
+    scoreboard_iss.write_bytes(CPU_BASE_ADDR, image.tobytes())
+    scoreboard_iss.load_instructions(start_address, program.words)
+    scoreboard = RetirementScoreboard(dut, scoreboard_iss, until_pc=end_address)
+    scoreboard.start()
+    await send_unhalt_command(dut)
+    await scoreboard.wait_until_done(timeout_ns=5000 * wait_ns)
+    await ClockCycles(dut.i_Clock, 20)  # last writeback reaches the register file
+
+    words = image.view("<u4")
+    expected = int(words[::0x1FFC // 4].sum(dtype=np.uint64)) & 0xFFFFFFFF
+    assert scoreboard_iss.registers[10] == expected, "ISS did not run the program as intended"
+    assert_registers_match(dut, scoreboard_iss.registers)
+
+    # Later tests expect the zeroed RAM the harness starts with
+    await fill_memory(dut, DATA_RAM, CPU_BASE_ADDR, HARNESS_RAM_SIZE)
+
+
+@cocotb.test()
+async def test_snapshot_after_buffer_fill(dut):
+    """One snapshot of data_ram shows the filled buffer and nothing else changed"""
+    start_address = RAM_START_ADDR + 0x800
+    program = assemble(FILL_PROGRAM, start_address)
+    end_address = program.symbols['end']
+
+    clock = Clock(dut.i_Clock, wait_ns, "ns")
+    cocotb.start_soon(clock.start())
+
+    dut.i_Reset.value = 1
+    await ClockCycles(dut.i_Clock, 1)
+    dut.i_Reset.value = 0
+
+    await send_write_pc_command(dut, start_address)
+    await wait_for_pipeline_flush(dut)
+    await load_words(dut, INSTRUCTION_RAM, start_address, program.words)
+    before = await read_memory(dut, DATA_RAM)
+
+    scoreboard_iss = RV32ISimulator(pc=start_address)
+    scoreboard_iss.load_instructions(start_address, program.words)
+    scoreboard = RetirementScoreboard(dut, scoreboard_iss, until_pc=end_address)
+    scoreboard.start()
+    await send_unhalt_command(dut)
+    await scoreboard.wait_until_done(timeout_ns=20000 * wait_ns)
+    await ClockCycles(dut.i_Clock, 20)
+
+    words = (0x01020304 + 0x01010101 * np.arange(256, dtype=np.uint64)) & 0xFFFFFFFF
+    offset = FILL_BUFFER_ADDR - CPU_BASE_ADDR
+    expected = before.copy()
+    expected[offset:offset + 1024] = words.astype("<u4").view(np.uint8)
+    after = await read_memory(dut, DATA_RAM)
+    assert_memory_equal(after, expected)
+    changed = diff_ranges(after, before)
+    assert all(offset <= start and end <= offset + 1024 for start, end in changed), f"Writes outside the buffer: {changed}"
+
+    buffer = await read_memory(dut, DATA_RAM, FILL_BUFFER_ADDR, 1024)
+    assert np.array_equal(buffer.view("<u4"), words), "Ranged snapshot does not match"
+
+    rom = await read_memory(dut, ROM)
+    for index in (0, 1, 128, 1023):
+        assert rom[index] == dut.cpu.instruction_memory.rom[index].value.integer, f"rom[{index}] readback differs"
+
+    await fill_memory(dut, DATA_RAM, FILL_BUFFER_ADDR, 1024)
@@ -0,0 +1,179 @@
+import time
+
+import cocotb
+import numpy as np
+from cocotb.triggers import ClockCycles
+from cocotb.clock import Clock
+
+from assembler import assemble
+from cpu.axil_memory import DATA_PORT, INSTRUCTION_PORT, PAGE_SHIFT, AxiLiteMemory, SparseMemory
+from cpu.constants import RAM_START_ADDR
+from cpu.utils import read_registers, send_unhalt_command, send_write_pc_command, wait_for_pipeline_flush
+
+wait_ns = 1
+
+IMAGE_ADDR = RAM_START_ADDR + 0x800
+TABLE_ADDR = 0x80020000
+TABLE_WORDS = 1024  # one 4KB page
+RESULT_ADDR = 0x80030000
+SCALED_WORDS = 64
+
+# The "boot" builds a table the kernels below share; each test runs one kernel
+IMAGE = f"""
+init:
+    li    s0, {TABLE_ADDR}
+    li    s1, {TABLE_WORDS}
+    li    t0, 0
+init_loop:
+    sw    t0, 0(s0)
+    addi  t0, t0, 3
+    addi  s0, s0, 4
+    addi  s1, s1, -1
+    bnez  s1, init_loop
+init_end:
+    j     init_end
+
+scale:
+    li    s0, {TABLE_ADDR}
+    li    s1, {SCALED_WORDS}
+scale_loop:
+    lw    t0, 0(s0)
+    addi  s1, s1, -1
+    slli  t0, t0, 1
+    sw    t0, 0(s0)
+    addi  s0, s0, 4
+    bnez  s1, scale_loop
+scale_end:
+    j     scale_end
+
+sum:
+    li    s0, {TABLE_ADDR}
+    li    s1, {TABLE_WORDS}
+    li    a0, 0
+sum_loop:
+    lw    t0, 0(s0)
+    addi  s1, s1, -1
+    add   a0, a0, t0
+    addi  s0, s0, 4
+    bnez  s1, sum_loop
+    li    t1, {RESULT_ADDR}
+    sw    a0, 0(t1)
+sum_end:
+    j     sum_end
+"""
+
+BOOTED_TABLE = np.arange(TABLE_WORDS, dtype="<u4") * 3
+
+# One memory per module: the first test boots it, every test restores the booted snapshot
+program = assemble(IMAGE, IMAGE_ADDR)
+memory = SparseMemory()
+booted = None
+
+
+async def run_until(dut, label, timeout_cycles=100000):
+    """Unhalt the CPU and wait until it spins on the routine's "<label>_end" loop"""
+    end_address = program.symbols[f"{label}_end"]
+    await send_unhalt_command(dut)
+    for _ in range(0, timeout_cycles, 100):
+        await ClockCycles(dut.i_Clock, 100)
+        if dut.cpu.r_PC.value.integer == end_address:
+            return
+    raise AssertionError(f"'{label}' did not reach '{label}_end' within {timeout_cycles} cycles")
+
+
+async def fork_booted(dut, label):
+    """Reset, restore the booted memory (booting it the first time) and leave the CPU halted at label.
+
+    How many pages the restore puts back depends on which tests ran before,
+    so it is only logged; tests that check the count dirty pages themselves.
+
+    Returns:
+        The started AxiLiteMemory ports
+    """
+    global booted
+    clock = Clock(dut.i_Clock, wait_ns, "ns")
+    cocotb.start_soon(clock.start())
+
+    dut.i_Reset.value = 1
+    await ClockCycles(dut.i_Clock, 1)
+    dut.i_Reset.value = 0
+
+    # Halt before handing the ports over, so nothing runs the image after reset
+    entry = program.symbols['init'] if booted is None else program.symbols[label]
+    await send_write_pc_command(dut, entry)
+    await wait_for_pipeline_flush(dut)
+    slaves = [AxiLiteMemory(dut, memory, port) for port in (DATA_PORT, INSTRUCTION_PORT)]
+    for slave in slaves:
+        slave.start()
+
+    if booted is None:
+        started = time.perf_counter()
+        memory.write(IMAGE_ADDR, np.asarray(program.words, dtype=np.int64).astype("<u4"))
+        await run_until(dut, "init")
+        booted = memory.snapshot()
+        dut._log.info(f"Booted {booted.allocated_bytes // 1024}KB image in {time.perf_counter() - started:.2f} s")
+        await send_write_pc_command(dut, program.symbols[label])
+        await wait_for_pipeline_flush(dut)
+
+    started = time.perf_counter()
+    restored = memory.restore(booted)
+    dut._log.info(f"Restored {restored} page(s) in {(time.perf_counter() - started) * 1e6:.0f} us")
+    return slaves
+
+
+def table():
+    return memory.read_array(TABLE_ADDR, 4 * TABLE_WORDS).view("<u4")
+
+
+@cocotb.test()
+async def test_scale_table_in_place(dut):
+    """A kernel that rewrites part of the table dirties only the table's page"""
+    slaves = await fork_booted(dut, "scale")
+    assert np.array_equal(table(), BOOTED_TABLE), "Booted table not restored"
+
+    await run_until(dut, "scale")
+    expected = BOOTED_TABLE.copy()
+    expected[:SCALED_WORDS] *= 2
+    assert np.array_equal(table(), expected)
+    assert memory.dirty_pages == [TABLE_ADDR >> PAGE_SHIFT]
+    # The snapshot still holds the booted page
+    booted_page = np.frombuffer(booted.pages[TABLE_ADDR >> PAGE_SHIFT], dtype="<u4")
+    assert np.array_equal(booted_page, BOOTED_TABLE)
+
+    for slave in slaves:
+        slave.stop()
+
+
+@cocotb.test()
+async def test_sum_table_after_fork(dut):
+    """A fork starts from the booted table, not from what an earlier kernel left"""
+    slaves = await fork_booted(dut, "sum")
+    # Stand in for an earlier kernel: overwrite the table while the CPU is halted
+    memory.write(TABLE_ADDR, np.zeros(TABLE_WORDS, dtype="<u4"))
+    assert memory.dirty_pages == [TABLE_ADDR >> PAGE_SHIFT]
+    assert memory.restore(booted) == 1, "Only the overwritten table page should need restoring"
+    assert np.array_equal(table(), BOOTED_TABLE)
+
+    await run_until(dut, "sum")
+    expected = int(BOOTED_TABLE.sum())
+    assert read_registers(dut)[10] == expected
+    assert memory.read_word(RESULT_ADDR) == expected
+    assert memory.dirty_pages == [RESULT_ADDR >> PAGE_SHIFT]
+
+    for slave in slaves:
+        slave.stop()
+
+
+@cocotb.test()
+async def test_restore_drops_pages_allocated_after_snapshot(dut):
+    """Restoring frees pages first written after the snapshot, so the result page is gone again"""
+    slaves = await fork_booted(dut, "scale")
+    for slave in slaves:
+        slave.stop()
+    assert RESULT_ADDR >> PAGE_SHIFT not in booted.pages
+    memory.write_word(RESULT_ADDR, 1)
+    memory.write_word(TABLE_ADDR, 1)
+    assert memory.restore(booted) == 2
+    assert RESULT_ADDR >> PAGE_SHIFT not in memory.pages
+    assert np.array_equal(table(), BOOTED_TABLE)
+    assert memory.allocated_bytes == booted.allocated_bytes
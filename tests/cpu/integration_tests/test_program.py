@@ -10,7 +10,10 @@ from cpu.constants import (
 
     RAM_START_ADDR,
 )
+from cpu.iss import RV32ISimulator
+from cpu.scoreboard import RetirementScoreboard
 from cpu.utils import (
+    assert_registers_match,
     gen_i_type_instruction,
     gen_b_type_instruction,
     gen_r_type_instruction,
@@ -45,6 +48,10 @@ async def test_sum_loop_ram(dut):
     haltInstructions = 100
     endAddress = start_address + len(instructions) * 4
 
+    iss = RV32ISimulator(pc=start_address)
+    iss.load_instructions(start_address, instructions)
+    iss.run(until_pc=endAddress)
+
     clock = Clock(dut.i_Clock, wait_ns, "ns")
     cocotb.start_soon(clock.start())
 
@@ -54,16 +61,20 @@ async def test_sum_loop_ram(dut):
 
     await send_write_pc_command(dut, start_address)
     await wait_for_pipeline_flush(dut)
-    await send_unhalt_command(dut)
 
-    while dut.cpu.r_PC.value.integer < endAddress and haltInstructions > 0:
-        await ClockCycles(dut.i_Clock, 4)
-        haltInstructions -= 1
+    scoreboard_iss = RV32ISimulator(pc=start_address)
+    scoreboard_iss.load_instructions(start_address, instructions)
+    scoreboard = RetirementScoreboard(dut, scoreboard_iss, until_pc=endAddress)
+    scoreboard.start()
+    await send_unhalt_command(dut)
+    await scoreboard.wait_until_done(timeout_ns=haltInstructions * 4 * wait_ns)
 
     # After executing the program, $v0 should contain the sum of first 10 natural numbers
     expected_sum = sum(range(1, 11))  # 55
+    assert iss.registers[2] == expected_sum, f"ISS disagrees with hand-computed sum: {iss.registers[2]}"
     actual_sum = dut.cpu.reg_file.Registers[2].value.integer  # $v0 is register 2
     assert actual_sum == expected_sum, f"Program execution failed: got sum {actual_sum}, expected {expected_sum}"
+    assert_registers_match(dut, iss.registers)
     dut._log.info("Multiple instruction fetch test completed successfully")
 
 
@@ -90,6 +101,10 @@ async def test_sum_loop_rom_file(dut):
     haltInstructions = 100
     endAddress = start_address + len(instructions) * 4
 
+    iss = RV32ISimulator(pc=start_address)
+    iss.load_instructions(start_address, instructions)
+    iss.run(until_pc=endAddress)
+
     clock = Clock(dut.i_Clock, wait_ns, "ns")
     cocotb.start_soon(clock.start())
 
@@ -99,14 +114,18 @@ async def test_sum_loop_rom_file(dut):
 
     await send_write_pc_command(dut, start_address)
     await wait_for_pipeline_flush(dut)
-    await send_unhalt_command(dut)
 
-    while dut.cpu.r_PC.value.integer < endAddress and haltInstructions > 0:
-        await ClockCycles(dut.i_Clock, 4)
-        haltInstructions -= 1
+    scoreboard_iss = RV32ISimulator(pc=start_address)
+    scoreboard_iss.load_instructions(start_address, instructions)
+    scoreboard = RetirementScoreboard(dut, scoreboard_iss, until_pc=endAddress)
+    scoreboard.start()
+    await send_unhalt_command(dut)
+    await scoreboard.wait_until_done(timeout_ns=haltInstructions * 4 * wait_ns)
 
     # After executing the program, $v0 should contain the sum of first 10 natural numbers
     expected_sum = sum(range(1, 11))  # 55
+    assert iss.registers[2] == expected_sum, f"ISS disagrees with hand-computed sum: {iss.registers[2]}"
     actual_sum = dut.cpu.reg_file.Registers[2].value.integer  # $v0 is register 2
     assert actual_sum == expected_sum, f"Program execution failed: got sum {actual_sum}, expected {expected_sum}"
+    assert_registers_match(dut, iss.registers)
     dut._log.info("Multiple instruction fetch test completed successfully")
\ No newline at end of file
@@ -10,6 +10,7 @@ from cpu.utils import (
     uart_send_byte,
     wait_for_pipeline_flush,
 )
+from cpu.memory_image import DATA_RAM, assert_memory_equal, read_memory
 from cpu.constants import (
     FUNC3_LS_B,
     
@@ -50,11 +51,13 @@ async def test_sb_instruction(dut):
 
     await send_write_pc_command(dut, start_address)
     await wait_for_pipeline_flush(dut)
+    before = await read_memory(dut, DATA_RAM)
     dut.cpu.reg_file.Registers[rs1].value = rs1_value
     dut.cpu.reg_file.Registers[rs2].value = rs2_value
     await send_unhalt_command(dut)
 
     await ClockCycles(dut.i_Clock, PIPELINE_CYCLES)
 
-    expected = rs2_value & 0xFF
-    assert dut.data_ram.mem[word_index].value == expected, f"SB instruction failed: Memory byte {word_index} is {dut.data_ram.mem[word_index].value.integer:#04x}, expected {expected:#04x}"
+    expected = before.copy()
+    expected[word_index] = rs2_value & 0xFF
+    assert_memory_equal(await read_memory(dut, DATA_RAM), expected)
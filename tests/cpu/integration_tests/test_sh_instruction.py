@@ -9,6 +9,7 @@ from cpu.utils import (
     wait_for_pipeline_flush,
     write_word_to_mem,
 )
+from cpu.memory_image import DATA_RAM, assert_memory_equal, read_memory
 from cpu.constants import (
     FUNC3_LS_H,
 
@@ -44,6 +45,7 @@ async def test_sh_instruction(dut):
 
     await send_write_pc_command(dut, start_address)
     await wait_for_pipeline_flush(dut)
+    before = await read_memory(dut, DATA_RAM)
     write_word_to_mem(dut.instruction_ram.mem, start_address, sh_instruction)
     dut.cpu.reg_file.Registers[rs1].value = rs1_value
     dut.cpu.reg_file.Registers[rs2].value = rs2_value
@@ -51,7 +53,7 @@ async def test_sh_instruction(dut):
 
     await ClockCycles(dut.i_Clock, PIPELINE_CYCLES)
 
-    expected_low  = rs2_value & 0xFF
-    expected_high = (rs2_value >> 8) & 0xFF
-    assert dut.data_ram.mem[low_byte_addr].value == expected_low, f"SH instruction failed: low byte {low_byte_addr} is {dut.data_ram.mem[low_byte_addr].value.integer:#04x}, expected {expected_low:#04x}"
-    assert dut.data_ram.mem[high_byte_addr].value == expected_high, f"SH instruction failed: high byte {high_byte_addr} is {dut.data_ram.mem[high_byte_addr].value.integer:#04x}, expected {expected_high:#04x}"
\ No newline at end of file
+    expected = before.copy()
+    expected[low_byte_addr]  = rs2_value & 0xFF
+    expected[high_byte_addr] = (rs2_value >> 8) & 0xFF
+    assert_memory_equal(await read_memory(dut, DATA_RAM), expected)
\ No newline at end of file
@@ -9,6 +9,7 @@ from cpu.utils import (
     wait_for_pipeline_flush,
     send_unhalt_command,
 )
+from cpu.memory_image import DATA_RAM, assert_memory_equal, read_memory
 from cpu.constants import (
     FUNC3_LS_W,
 
@@ -44,13 +45,15 @@ async def test_sw_instruction(dut):
 
     await send_write_pc_command(dut, start_address)
     await wait_for_pipeline_flush(dut)
+    before = await read_memory(dut, DATA_RAM)
     dut.cpu.reg_file.Registers[rs1].value = rs1_value
     dut.cpu.reg_file.Registers[rs2].value = rs2_value
     await send_unhalt_command(dut)
 
     await ClockCycles(dut.i_Clock, PIPELINE_CYCLES)
 
+    # Whole-RAM snapshot: also catches bytes written outside the stored word
+    expected = before.copy()
     for i in range(4):
-        expected_byte = (rs2_value >> (8*i)) & 0xFF
-        assert dut.data_ram.mem[mem_address + i].value == expected_byte, (
-            f"SW instruction failed: byte {mem_address+i} is {dut.data_ram.mem[mem_address+i].value.integer:#04x}, expected {expected_byte:#04x}")
\ No newline at end of file
+        expected[mem_address + i] = (rs2_value >> (8*i)) & 0xFF
+    assert_memory_equal(await read_memory(dut, DATA_RAM), expected)
\ No newline at end of file
@@ -0,0 +1,461 @@
+"""Pure-Python RV32I instruction-set simulator used as a golden model.
+
+The simulator executes the same instruction words the cocotb tests build with
+gen_i_type_instruction, gen_r_type_instruction and friends, so a test can
+compute the expected architectural state up front and compare the RTL once at
+the end of the run instead of stepping it from Python.
+
+Instructions are decoded once per address and cached, which keeps the
+interpreter loop to a handful of list/dict operations per instruction.
+
+The model is architectural: it has no notion of the pipeline, so programs
+with unpadded RAW hazards (see docs/architecture.md) will disagree with the
+RTL. Memory is a flat, sparse 32-bit address space; it does not reproduce the
+16-bit address truncation of the integration harness.
+"""
+
+from cpu.constants import (
+    OP_J_TYPE,
+    OP_B_TYPE,
+    OP_S_TYPE,
+    OP_R_TYPE,
+    OP_U_TYPE_LUI,
+    OP_U_TYPE_AUIPC,
+    OP_I_TYPE_JALR,
+    OP_I_TYPE_LOAD,
+    OP_I_TYPE_ALU,
+
+    FUNC3_ALU_ADD_SUB,
+    FUNC3_ALU_SLL,
+    FUNC3_ALU_SLT,
+    FUNC3_ALU_SLTU,
+    FUNC3_ALU_XOR,
+    FUNC3_ALU_SRL_SRA,
+    FUNC3_ALU_OR,
+    FUNC3_ALU_AND,
+
+    FUNC3_LS_B,
+    FUNC3_LS_H,
+    FUNC3_LS_W,
+    FUNC3_LS_BU,
+    FUNC3_LS_HU,
+
+    FUNC3_BRANCH_BEQ,
+    FUNC3_BRANCH_BNE,
+    FUNC3_BRANCH_BLT,
+    FUNC3_BRANCH_BGE,
+    FUNC3_BRANCH_BLTU,
+    FUNC3_BRANCH_BGEU,
+
+    CPU_BASE_ADDR,
+)
+
+MASK_32 = 0xFFFFFFFF
+PAGE_SIZE = 4096
+PAGE_MASK = PAGE_SIZE - 1
+
+# Internal operation ids produced by decode_instruction
+ISS_OP_ADD = 0
+ISS_OP_SUB = 1
+ISS_OP_SLL = 2
+ISS_OP_SLT = 3
+ISS_OP_SLTU = 4
+ISS_OP_XOR = 5
+ISS_OP_SRL = 6
+ISS_OP_SRA = 7
+ISS_OP_OR = 8
+ISS_OP_AND = 9
+ISS_OP_ADDI = 10
+ISS_OP_SLLI = 11
+ISS_OP_SLTI = 12
+ISS_OP_SLTIU = 13
+ISS_OP_XORI = 14
+ISS_OP_SRLI = 15
+ISS_OP_SRAI = 16
+ISS_OP_ORI = 17
+ISS_OP_ANDI = 18
+ISS_OP_LUI = 19
+ISS_OP_AUIPC = 20
+ISS_OP_JAL = 21
+ISS_OP_JALR = 22
+ISS_OP_BEQ = 23
+ISS_OP_BNE = 24
+ISS_OP_BLT = 25
+ISS_OP_BGE = 26
+ISS_OP_BLTU = 27
+ISS_OP_BGEU = 28
+ISS_OP_LB = 29
+ISS_OP_LH = 30
+ISS_OP_LW = 31
+ISS_OP_LBU = 32
+ISS_OP_LHU = 33
+ISS_OP_SB = 34
+ISS_OP_SH = 35
+ISS_OP_SW = 36
+
+R_TYPE_OPS = {
+    (FUNC3_ALU_ADD_SUB, 0): ISS_OP_ADD,
+    (FUNC3_ALU_ADD_SUB, 1): ISS_OP_SUB,
+    (FUNC3_ALU_SLL, 0): ISS_OP_SLL,
+    (FUNC3_ALU_SLT, 0): ISS_OP_SLT,
+    (FUNC3_ALU_SLTU, 0): ISS_OP_SLTU,
+    (FUNC3_ALU_XOR, 0): ISS_OP_XOR,
+    (FUNC3_ALU_SRL_SRA, 0): ISS_OP_SRL,
+    (FUNC3_ALU_SRL_SRA, 1): ISS_OP_SRA,
+    (FUNC3_ALU_OR, 0): ISS_OP_OR,
+    (FUNC3_ALU_AND, 0): ISS_OP_AND,
+}
+
+I_TYPE_ALU_OPS = {
+    FUNC3_ALU_ADD_SUB: ISS_OP_ADDI,
+    FUNC3_ALU_SLT: ISS_OP_SLTI,
+    FUNC3_ALU_SLTU: ISS_OP_SLTIU,
+    FUNC3_ALU_XOR: ISS_OP_XORI,
+    FUNC3_ALU_OR: ISS_OP_ORI,
+    FUNC3_ALU_AND: ISS_OP_ANDI,
+}
+
+BRANCH_OPS = {
+    FUNC3_BRANCH_BEQ: ISS_OP_BEQ,
+    FUNC3_BRANCH_BNE: ISS_OP_BNE,
+    FUNC3_BRANCH_BLT: ISS_OP_BLT,
+    FUNC3_BRANCH_BGE: ISS_OP_BGE,
+    FUNC3_BRANCH_BLTU: ISS_OP_BLTU,
+    FUNC3_BRANCH_BGEU: ISS_OP_BGEU,
+}
+
+LOAD_OPS = {
+    FUNC3_LS_B: ISS_OP_LB,
+    FUNC3_LS_H: ISS_OP_LH,
+    FUNC3_LS_W: ISS_OP_LW,
+    FUNC3_LS_BU: ISS_OP_LBU,
+    FUNC3_LS_HU: ISS_OP_LHU,
+}
+
+STORE_OPS = {
+    FUNC3_LS_B: ISS_OP_SB,
+    FUNC3_LS_H: ISS_OP_SH,
+    FUNC3_LS_W: ISS_OP_SW,
+}
+
+
+def sign_extend(value, bits):
+    """Sign-extend the low `bits` bits of value to a Python int."""
+    sign_bit = 1 << (bits - 1)
+    return (value & (sign_bit - 1)) - (value & sign_bit)
+
+
+def to_signed(value):
+    """Interpret a 32-bit unsigned value as two's complement."""
+    return value - 0x100000000 if value & 0x80000000 else value
+
+
+def writes_register(op):
+    """True if the ISS_OP_* operation writes rd (everything but branches and stores)."""
+    return not (ISS_OP_BEQ <= op <= ISS_OP_BGEU or op >= ISS_OP_SB)
+
+
+def decode_instruction(instruction):
+    """Decode a 32-bit RV32I instruction word.
+
+    Returns a tuple (op, rd, rs1, rs2, imm) where op is one of the ISS_OP_*
+    constants and imm is already sign-extended (U-type immediates are the
+    final upper value, shift amounts are in imm for SLLI/SRLI/SRAI).
+
+    Raises:
+        ValueError: If the word is not a supported RV32I instruction
+    """
+    opcode = instruction & 0x7F
+    rd = (instruction >> 7) & 0x1F
+    funct3 = (instruction >> 12) & 0x7
+    rs1 = (instruction >> 15) & 0x1F
+    rs2 = (instruction >> 20) & 0x1F
+    funct7 = instruction >> 25
+
+    if opcode == OP_R_TYPE:
+        op = R_TYPE_OPS.get((funct3, funct7 >> 5)) if funct7 in (0, 0b0100000) else None
+        if op is not None:
+            return (op, rd, rs1, rs2, 0)
+    elif opcode == OP_I_TYPE_ALU:
+        imm = sign_extend(instruction >> 20, 12)
+        if funct3 == FUNC3_ALU_SLL and funct7 == 0:
+            return (ISS_OP_SLLI, rd, rs1, 0, rs2)
+        if funct3 == FUNC3_ALU_SRL_SRA and funct7 in (0, 0b0100000):
+            return (ISS_OP_SRAI if funct7 else ISS_OP_SRLI, rd, rs1, 0, rs2)
+        op = I_TYPE_ALU_OPS.get(funct3)
+        if op is not None:
+            return (op, rd, rs1, 0, imm)
+    elif opcode == OP_I_TYPE_LOAD:
+        op = LOAD_OPS.get(funct3)
+        if op is not None:
+            return (op, rd, rs1, 0, sign_extend(instruction >> 20, 12))
+    elif opcode == OP_S_TYPE:
+        op = STORE_OPS.get(funct3)
+        if op is not None:
+            imm = ((instruction >> 25) << 5) | ((instruction >> 7) & 0x1F)
+            return (op, 0, rs1, rs2, sign_extend(imm, 12))
+    elif opcode == OP_B_TYPE:
+        op = BRANCH_OPS.get(funct3)
+        if op is not None:
+            imm = (((instruction >> 31) & 0x1) << 12) \
+                | (((instruction >> 7) & 0x1) << 11) \
+                | (((instruction >> 25) & 0x3F) << 5) \
+                | (((instruction >> 8) & 0xF) << 1)
+            return (op, 0, rs1, rs2, sign_extend(imm, 13))
+    elif opcode == OP_U_TYPE_LUI:
+        return (ISS_OP_LUI, rd, 0, 0, instruction & 0xFFFFF000)
+    elif opcode == OP_U_TYPE_AUIPC:
+        return (ISS_OP_AUIPC, rd, 0, 0, instruction & 0xFFFFF000)
+    elif opcode == OP_J_TYPE:
+        imm = (((instruction >> 31) & 0x1) << 20) \
+            | (((instruction >> 12) & 0xFF) << 12) \
+            | (((instruction >> 20) & 0x1) << 11) \
+            | (((instruction >> 21) & 0x3FF) << 1)
+        return (ISS_OP_JAL, rd, 0, 0, sign_extend(imm, 21))
+    elif opcode == OP_I_TYPE_JALR and funct3 == 0:
+        return (ISS_OP_JALR, rd, rs1, 0, sign_extend(instruction >> 20, 12))
+
+    raise ValueError(f"Unsupported instruction {instruction:#010x}")
+
+
+class RV32ISimulator:
+    """Architectural RV32I model: 32 registers, a PC and sparse byte memory.
+
+    Typical use from a cocotb test:
+
+        iss = RV32ISimulator(pc=start_address)
+        iss.load_instructions(start_address, instructions)
+        iss.registers[1] = 5
+        iss.run(until_pc=start_address + len(instructions) * 4)
+        ... run the RTL, then compare against iss.registers once ...
+    """
+
+    def __init__(self, pc=CPU_BASE_ADDR):
+        self.registers = [0] * 32
+        self.pc = pc & MASK_32
+        self.retired = 0
+        self._pages = {}
+        self._decoded = {}
+
+    # ---------------------------------------------------------------- memory
+
+    def _page(self, addr):
+        page = self._pages.get(addr >> 12)
+        if page is None:
+            page = self._pages[addr >> 12] = bytearray(PAGE_SIZE)
+        return page
+
+    def read_byte(self, addr):
+        page = self._pages.get((addr & MASK_32) >> 12)
+        return page[addr & PAGE_MASK] if page is not None else 0
+
+    def read_half(self, addr):
+        return self.read_byte(addr) | (self.read_byte(addr + 1) << 8)
+
+    def read_word(self, addr):
+        addr &= MASK_32
+        offset = addr & PAGE_MASK
+        if offset <= PAGE_SIZE - 4:
+            page = self._pages.get(addr >> 12)
+            return int.from_bytes(page[offset:offset + 4], "little") if page is not None else 0
+        return self.read_half(addr) | (self.read_half(addr + 2) << 16)
+
+    def write_byte(self, addr, value):
+        addr &= MASK_32
+        self._page(addr)[addr & PAGE_MASK] = value & 0xFF
+        self._decoded.pop(addr & ~0x3, None)
+
+    def write_half(self, addr, value):
+        self.write_byte(addr, value)
+        self.write_byte(addr + 1, value >> 8)
+
+    def write_word(self, addr, value):
+        addr &= MASK_32
+        offset = addr & PAGE_MASK
+        if offset & 0x3 == 0:
+            self._page(addr)[offset:offset + 4] = (value & MASK_32).to_bytes(4, "little")
+            self._decoded.pop(addr, None)
+        else:
+            self.write_half(addr, value)
+            self.write_half(addr + 2, value >> 16)
+
+    def write_bytes(self, addr, data):
+        """Copy a bytes-like buffer into memory starting at addr."""
+        addr &= MASK_32
+        data = memoryview(bytes(data))
+        while data:
+            offset = addr & PAGE_MASK
+            chunk = min(len(data), PAGE_SIZE - offset)
+            self._page(addr)[offset:offset + chunk] = data[:chunk]
+            for word_addr in range(addr & ~0x3, addr + chunk, 4):
+                self._decoded.pop(word_addr, None)
+            data = data[chunk:]
+            addr = (addr + chunk) & MASK_32
+
+    def load_instructions(self, base_addr, instructions):
+        """Write a list of 32-bit instructions at word stride (4 bytes)."""
+        for i, ins in enumerate(instructions):
+            self.write_word(base_addr + 4*i, ins)
+
+    # ------------------------------------------------------------- execution
+
+    def decode(self, pc):
+        """Return the cached decode tuple (op, rd, rs1, rs2, imm) for the word at pc."""
+        entry = self._decoded.get(pc)
+        if entry is None:
+            entry = self._decoded[pc] = decode_instruction(self.read_word(pc))
+        return entry
+
+    def step(self):
+        """Execute a single instruction.
+
+        Returns:
+            (pc, rd) of the retired instruction, where rd is None for
+            instructions that do not write the register file (branches, stores)
+        """
+        pc = self.pc
+        op, rd = self.decode(pc)[:2]
+        self.run(max_instructions=1)
+        return pc, (rd if writes_register(op) else None)
+
+    def run(self, max_instructions=1_000_000, until_pc=None):
+        """Execute until until_pc is reached, a self-loop is hit or the budget runs out.
+
+        A jump to itself (`jal x0, 0`, the halt idiom used by assemble.py) stops
+        the run after the jump retires.
+
+        Args:
+            max_instructions: Maximum number of instructions to retire
+            until_pc: Stop before executing the instruction at this address
+
+        Returns:
+            The number of instructions retired by this call
+        """
+        regs = self.registers
+        decoded = self._decoded
+        pages = self._pages
+        read_word = self.read_word
+        pc = self.pc
+        executed = 0
+
+        while executed < max_instructions and pc != until_pc:
+            entry = decoded.get(pc)
+            if entry is None:
+                entry = decoded[pc] = decode_instruction(read_word(pc))
+            op, rd, rs1, rs2, imm = entry
+            next_pc = (pc + 4) & MASK_32
+            executed += 1
+
+            if op <= ISS_OP_AND:
+                a = regs[rs1]
+                b = regs[rs2]
+                if op == ISS_OP_ADD:
+                    value = (a + b) & MASK_32
+                elif op == ISS_OP_SUB:
+                    value = (a - b) & MASK_32
+                elif op == ISS_OP_SLL:
+                    value = (a << (b & 0x1F)) & MASK_32
+                elif op == ISS_OP_SLT:
+                    value = int(to_signed(a) < to_signed(b))
+                elif op == ISS_OP_SLTU:
+                    value = int(a < b)
+                elif op == ISS_OP_XOR:
+                    value = a ^ b
+                elif op == ISS_OP_SRL:
+                    value = a >> (b & 0x1F)
+                elif op == ISS_OP_SRA:
+                    value = (to_signed(a) >> (b & 0x1F)) & MASK_32
+                elif op == ISS_OP_OR:
+                    value = a | b
+                else:
+                    value = a & b
+            elif op <= ISS_OP_ANDI:
+                a = regs[rs1]
+                if op == ISS_OP_ADDI:
+                    value = (a + imm) & MASK_32
+                elif op == ISS_OP_SLLI:
+                    value = (a << imm) & MASK_32
+                elif op == ISS_OP_SLTI:
+                    value = int(to_signed(a) < imm)
+                elif op == ISS_OP_SLTIU:
+                    value = int(a < (imm & MASK_32))
+                elif op == ISS_OP_XORI:
+                    value = (a ^ imm) & MASK_32
+                elif op == ISS_OP_SRLI:
+                    value = a >> imm
+                elif op == ISS_OP_SRAI:
+                    value = (to_signed(a) >> imm) & MASK_32
+                elif op == ISS_OP_ORI:
+                    value = (a | imm) & MASK_32
+                else:
+                    value = a & imm & MASK_32
+            elif op >= ISS_OP_BEQ and op <= ISS_OP_BGEU:
+                a = regs[rs1]
+                b = regs[rs2]
+                if op == ISS_OP_BEQ:
+                    taken = a == b
+                elif op == ISS_OP_BNE:
+                    taken = a != b
+                elif op == ISS_OP_BLT:
+                    taken = to_signed(a) < to_signed(b)
+                elif op == ISS_OP_BGE:
+                    taken = to_signed(a) >= to_signed(b)
+                elif op == ISS_OP_BLTU:
+                    taken = a < b
+                else:
+                    taken = a >= b
+                if taken:
+                    next_pc = (pc + imm) & MASK_32
+                pc = next_pc
+                continue
+            elif op == ISS_OP_LUI:
+                value = imm
+            elif op == ISS_OP_AUIPC:
+                value = (pc + imm) & MASK_32
+            elif op == ISS_OP_JAL or op == ISS_OP_JALR:
+                value = next_pc
+                if op == ISS_OP_JAL:
+                    next_pc = (pc + imm) & MASK_32
+                else:
+                    next_pc = (regs[rs1] + imm) & MASK_32 & ~0x1
+                if rd:
+                    regs[rd] = value
+                if next_pc == pc:
+                    break
+                pc = next_pc
+                continue
+            elif op <= ISS_OP_LHU:
+                addr = (regs[rs1] + imm) & MASK_32
+                if op == ISS_OP_LW:
+                    page = pages.get(addr >> 12)
+                    offset = addr & PAGE_MASK
+                    if page is not None and offset <= PAGE_SIZE - 4:
+                        value = int.from_bytes(page[offset:offset + 4], "little")
+                    else:
+                        value = read_word(addr)
+                elif op == ISS_OP_LBU:
+                    value = self.read_byte(addr)
+                elif op == ISS_OP_LB:
+                    value = sign_extend(self.read_byte(addr), 8) & MASK_32
+                elif op == ISS_OP_LHU:
+                    value = self.read_half(addr)
+                else:
+                    value = sign_extend(self.read_half(addr), 16) & MASK_32
+            else:
+                addr = (regs[rs1] + imm) & MASK_32
+                if op == ISS_OP_SW:
+                    self.write_word(addr, regs[rs2])
+                elif op == ISS_OP_SH:
+                    self.write_half(addr, regs[rs2])
+                else:
+                    self.write_byte(addr, regs[rs2])
+                pc = next_pc
+                continue
+
+            if rd:
+                regs[rd] = value
+            pc = next_pc
+
+        self.pc = pc
+        self.retired += executed
+        return executed
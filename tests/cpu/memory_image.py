@@ -0,0 +1,260 @@
+"""Backdoor loading and readback of memory images in the integration harness.
+
+Assigning dut.data_ram.mem[i].value costs one VPI call per byte, so seeding
+the 64KB harness RAM through write_word_to_mem takes seconds.
+cpu_integration_tests_harness.v instead has $readmemh strobes: load_memory()
+writes the image to a temporary file as "@offset" records (so only the loaded
+addresses change) and pulses the strobe of the target memory, and the
+simulator reads the whole file in one call. The file is formatted with NumPy,
+so a full 64KB image loads in a few milliseconds.
+
+    await load_memory(dut, DATA_RAM, 0x80004000, data)          # bytes or uint8 array
+    await load_words(dut, INSTRUCTION_RAM, RAM_START_ADDR, program.words)
+    await fill_memory(dut, DATA_RAM, RAM_START_ADDR, 0x4000)     # zero a region
+
+Readback works the other way round: read_memory() pulses a $writememh strobe
+and parses the dump into a NumPy array (uint8 for the RAMs, uint32 words for
+the ROM), and assert_memory_equal() reports only the address ranges that
+differ instead of one failure per byte.
+
+    framebuffer = await read_memory(dut, DATA_RAM, buffer_address, 4096)
+    assert_memory_equal(framebuffer, expected, buffer_address)
+"""
+
+import atexit
+import os
+import shutil
+import tempfile
+
+import numpy as np
+from cocotb.triggers import Timer
+
+from cpu.constants import CPU_BASE_ADDR, ROM_BOUNDARY_ADDR
+
+DATA_RAM = "data_ram"
+INSTRUCTION_RAM = "instruction_ram"
+ROM = "rom"
+
+# The harness feeds each axil_ram only the low 16 address bits
+HARNESS_RAM_SIZE = 0x10000
+ROM_SIZE = ROM_BOUNDARY_ADDR - CPU_BASE_ADDR + 1
+
+_LOAD_STROBES = {
+    DATA_RAM: "r_Load_Data_Ram",
+    INSTRUCTION_RAM: "r_Load_Instruction_Ram",
+    ROM: "r_Load_Rom",
+}
+_DUMP_STROBES = {
+    DATA_RAM: "r_Dump_Data_Ram",
+    INSTRUCTION_RAM: "r_Dump_Instruction_Ram",
+    ROM: "r_Dump_Rom",
+}
+_PATH_BYTES = 256  # width of r_Image_Path
+_HEX_BYTES = np.array([f"{value:02x}\n".encode() for value in range(256)], dtype="S3")
+_HEX_DIGITS = np.frombuffer(b"0123456789abcdef", dtype="S1")
+_HEX_VALUES = np.zeros(256, dtype=np.uint32)  # ASCII hex digit -> value
+_HEX_VALUES[np.frombuffer(b"0123456789abcdef", dtype=np.uint8)] = np.arange(16)
+_HEX_VALUES[np.frombuffer(b"ABCDEF", dtype=np.uint8)] = np.arange(10, 16)
+
+# Elements shown per side when describing a mismatching range
+DIFF_PREVIEW_LENGTH = 8
+
+_image_dir = None
+
+
+def _image_path(name):
+    global _image_dir
+    if _image_dir is None:
+        _image_dir = tempfile.mkdtemp(prefix="cpu_memory_images_")
+        atexit.register(shutil.rmtree, _image_dir, ignore_errors=True)
+    path = os.path.join(_image_dir, name)
+    if len(path) > _PATH_BYTES:
+        raise ValueError(f"Image path {path} is longer than {_PATH_BYTES} characters")
+    return path
+
+
+def memory_index(memory, address, length):
+    """Index of address in the harness array of memory, checking length fits.
+
+    ROM indices are words (instruction_memory_axi.v), RAM indices bytes at the
+    harness' 16-bit truncated offset.
+
+    Raises:
+        ValueError: If the range does not fit the memory or the ROM range is unaligned
+    """
+    offset = address - CPU_BASE_ADDR
+    if memory == ROM:
+        if offset < 0 or offset % 4 or offset + length > ROM_SIZE:
+            raise ValueError(f"{length} bytes at {address:#010x} do not fit the ROM word-aligned")
+        return offset // 4
+    if memory not in _LOAD_STROBES:
+        raise ValueError(f"Unknown memory '{memory}'")
+    index = offset & (HARNESS_RAM_SIZE - 1)
+    if index + length > HARNESS_RAM_SIZE:
+        raise ValueError(f"{length} bytes at {address:#010x} run past the {HARNESS_RAM_SIZE:#x}-byte harness RAM")
+    return index
+
+
+async def _pulse(dut, strobe, path):
+    """Point the harness at path and raise one of its strobes for a simulator step."""
+    dut.r_Image_Path.value = int.from_bytes(path.encode(), "big")
+    signal = getattr(dut, strobe)
+    signal.value = 1
+    await Timer(1, "step")
+    signal.value = 0
+    await Timer(1, "step")
+
+
+def as_bytes(data):
+    """Flatten bytes-like data or a NumPy array of any integer dtype to little-endian bytes."""
+    if isinstance(data, np.ndarray):
+        return np.ascontiguousarray(data, dtype=data.dtype.newbyteorder("<")).tobytes()
+    return bytes(data)
+
+
+def _hex_words(words):
+    """$readmemh lines for a uint32 array: eight hex digits and a newline per word."""
+    digits = np.empty((len(words), 9), dtype="S1")
+    for position in range(8):
+        digits[:, position] = _HEX_DIGITS[(words >> (28 - 4 * position)) & 0xF]
+    digits[:, 8] = b"\n"
+    return digits.tobytes()
+
+
+async def load_memory(dut, memory, address, data):
+    """Load an image into DATA_RAM, INSTRUCTION_RAM or ROM with a single $readmemh.
+
+    Args:
+        dut: The integration test harness DUT
+        memory: DATA_RAM, INSTRUCTION_RAM or ROM
+        address: CPU address of the first byte (word-aligned for the ROM)
+        data: bytes-like or NumPy array, stored little-endian; ROM images are
+            padded to whole words
+
+    Raises:
+        ValueError: If the image does not fit the memory
+    """
+    data = as_bytes(data)
+    if memory == ROM:
+        data += bytes(-len(data) % 4)
+    index = memory_index(memory, address, len(data))
+    if not data:
+        return
+
+    if memory == ROM:
+        body = _hex_words(np.frombuffer(data, dtype="<u4"))
+    else:
+        body = _HEX_BYTES[np.frombuffer(data, dtype=np.uint8)].tobytes()
+    path = _image_path(f"{memory}.hex")
+    with open(path, "wb") as f:
+        f.write(f"@{index:x}\n".encode())
+        f.write(body)
+    await _pulse(dut, _LOAD_STROBES[memory], path)
+
+
+async def load_words(dut, memory, address, words):
+    """load_memory() for a list of 32-bit words, e.g. assembled instructions."""
+    await load_memory(dut, memory, address, np.asarray(words, dtype=np.int64).astype("<u4"))
+
+
+async def fill_memory(dut, memory, address, length, value=0):
+    """Set length bytes starting at address to value (e.g. to clear a buffer between tests)."""
+    await load_memory(dut, memory, address, np.full(length, value, dtype=np.uint8))
+
+
+def _parse_dump(text, digits):
+    """Values of a $writememh dump with fixed-width lines of digits hex digits."""
+    width = digits + 1
+    if len(text) % width:
+        raise ValueError(f"Unexpected $writememh line format (expected {digits} hex digits per line)")
+    lines = np.frombuffer(text, dtype=np.uint8).reshape(-1, width)[:, :digits]
+    values = np.zeros(len(lines), dtype=np.uint32)
+    for position in range(digits):
+        values = (values << 4) | _HEX_VALUES[lines[:, position]]
+    return values
+
+
+async def read_memory(dut, memory, address=None, length=None):
+    """Snapshot DATA_RAM, INSTRUCTION_RAM or ROM with a single $writememh.
+
+    Args:
+        dut: The integration test harness DUT
+        memory: DATA_RAM, INSTRUCTION_RAM or ROM
+        address: CPU address of the first byte, or None for the whole memory
+        length: Bytes to return (default: to the end of the memory)
+
+    Returns:
+        uint8 array for the RAMs, uint32 word array for the ROM
+
+    Raises:
+        ValueError: If the range does not fit the memory
+    """
+    size = ROM_SIZE if memory == ROM else HARNESS_RAM_SIZE
+    if address is None:
+        address = CPU_BASE_ADDR
+    if length is None:
+        length = size - (address - CPU_BASE_ADDR) % size
+    index = memory_index(memory, address, length)
+
+    path = _image_path(f"{memory}.dump.hex")
+    await _pulse(dut, _DUMP_STROBES[memory], path)
+    with open(path, "rb") as f:
+        text = f.read()
+
+    if memory == ROM:
+        return _parse_dump(text, 8)[index:index + length // 4]
+    return _parse_dump(text, 2).astype(np.uint8)[index:index + length]
+
+
+def diff_ranges(actual, expected):
+    """Mismatching index ranges between two equal-length arrays.
+
+    Returns:
+        List of (start, end) index pairs, end exclusive, for each run of
+        consecutive differing elements
+    """
+    actual = np.asarray(actual)
+    expected = np.asarray(expected)
+    if actual.shape != expected.shape:
+        raise ValueError(f"Shape mismatch: {actual.shape} vs {expected.shape}")
+    mismatches = np.flatnonzero(actual != expected)
+    if not len(mismatches):
+        return []
+    breaks = np.flatnonzero(np.diff(mismatches) > 1)
+    starts = np.concatenate(([mismatches[0]], mismatches[breaks + 1]))
+    ends = np.concatenate((mismatches[breaks], [mismatches[-1]])) + 1
+    return [(int(start), int(end)) for start, end in zip(starts, ends)]
+
+
+def format_diff(actual, expected, base_addr=CPU_BASE_ADDR, element_size=1, max_ranges=16):
+    """Describe diff_ranges() as address ranges with a preview of both sides.
+
+    Args:
+        element_size: Bytes per array element (4 for ROM word arrays)
+        max_ranges: Ranges listed before the rest is summarised
+    """
+    ranges = diff_ranges(actual, expected)
+    digits = 2 * element_size
+    lines = []
+    for start, end in ranges[:max_ranges]:
+        preview = slice(start, min(end, start + DIFF_PREVIEW_LENGTH))
+        got = " ".join(f"{int(value):0{digits}x}" for value in actual[preview])
+        want = " ".join(f"{int(value):0{digits}x}" for value in expected[preview])
+        more = " ..." if end - start > DIFF_PREVIEW_LENGTH else ""
+        lines.append(
+            f"  {base_addr + start * element_size:#010x}-{base_addr + end * element_size - 1:#010x} "
+            f"({(end - start) * element_size} bytes): got {got}{more}, expected {want}{more}"
+        )
+    if len(ranges) > max_ranges:
+        lines.append(f"  ... and {len(ranges) - max_ranges} more range(s)")
+    return "\n".join(lines)
+
+
+def assert_memory_equal(actual, expected, base_addr=CPU_BASE_ADDR, element_size=1):
+    """Assert a snapshot matches, reporting every mismatching address range in one failure."""
+    expected = np.asarray(expected, dtype=np.asarray(actual).dtype)
+    if np.array_equal(actual, expected):
+        return
+    count = int(np.count_nonzero(np.asarray(actual) != expected))
+    raise AssertionError(
+        f"Memory mismatch in {count} element(s):\n{format_diff(actual, expected, base_addr, element_size)}")
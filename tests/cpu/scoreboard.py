@@ -0,0 +1,130 @@
+"""Lock-step RTL-vs-ISS scoreboard driven by writeback retirement events.
+
+Instead of polling dut.cpu.r_PC every few cycles, the scoreboard sleeps on the
+writeback enable of the CPU (w_Wb_Enable in cpu.v) and only wakes when an
+instruction retires into the register file. On each retirement it advances
+the ISS to its next register-writing instruction and compares PC, rd and the
+written value, failing on the first divergence.
+"""
+
+import cocotb
+from cocotb.triggers import Event, FallingEdge, First, ReadOnly, RisingEdge, Timer
+
+from cpu.iss import writes_register
+from cpu.utils import read_registers
+
+# Upper bound on branches/stores the ISS may skip between two register writes.
+# Guards against spinning forever on a loop that never writes a register.
+MAX_NON_WRITING_RUN = 10_000
+
+
+class RetirementScoreboard:
+    """Compare every register writeback of the CPU against an RV32ISimulator.
+
+    Start it after the CPU has been halted and set up (e.g. right before
+    send_unhalt_command), so boot ROM execution before the halt is not seen:
+
+        scoreboard = RetirementScoreboard(dut, iss, until_pc=end_address)
+        scoreboard.start()
+        await send_unhalt_command(dut)
+        await scoreboard.wait_until_done(timeout_ns=1000)
+    """
+
+    def __init__(self, dut, iss, until_pc=None, sync_registers=True):
+        self.dut = dut
+        self.iss = iss
+        self.until_pc = until_pc
+        self.sync_registers = sync_registers
+        self.retired = 0
+        self.error = None
+        self._done = Event()
+        self._task = None
+
+    def start(self):
+        """Fork the monitor coroutine."""
+        if self.sync_registers:
+            # Debug writes and ROM code before the halt may have touched registers
+            self.iss.registers[:] = read_registers(self.dut)
+        self._skip_non_writing()
+        self._task = cocotb.start_soon(self._monitor())
+        return self._task
+
+    def stop(self):
+        if self._task is not None:
+            self._task.kill()
+            self._task = None
+
+    async def wait_until_done(self, timeout_ns):
+        """Wait until the ISS reaches until_pc with every register write matched.
+
+        Raises:
+            AssertionError: On divergence, or if until_pc is not reached in time
+        """
+        if not self._done.is_set():
+            await First(self._done.wait(), Timer(timeout_ns, units="ns"))
+        self.stop()
+        if self.error is not None:
+            raise AssertionError(self.error)
+        assert self._done.is_set(), (
+            f"Scoreboard timed out after {self.retired} retirements: "
+            f"ISS at {self.iss.pc:#010x}, waiting for {self.until_pc:#010x}"
+        )
+
+    def _skip_non_writing(self):
+        """Run the ISS over branches/stores so its PC is at the next register write."""
+        iss = self.iss
+        for _ in range(MAX_NON_WRITING_RUN):
+            if iss.pc == self.until_pc:
+                self._done.set()
+                return
+            if writes_register(iss.decode(iss.pc)[0]):
+                return
+            iss.step()
+
+    def _fail(self, message):
+        self.error = message
+        self._done.set()
+        raise AssertionError(message)
+
+    def _check_retirement(self):
+        cpu = self.dut.cpu
+        rtl_pc = cpu.r_S3_PC_Fetch.value.integer
+        rtl_rd = cpu.r_S3_Rd.value.integer
+        rtl_value = cpu.w_Wb_Data.value.integer
+
+        iss_pc, iss_rd = self.iss.step()
+        self.retired += 1
+
+        if rtl_pc != iss_pc or rtl_rd != iss_rd:
+            self._fail(
+                f"Retirement #{self.retired} diverged: RTL pc={rtl_pc:#010x} rd=x{rtl_rd}, "
+                f"ISS pc={iss_pc:#010x} rd=x{iss_rd}"
+            )
+        if rtl_rd != 0 and rtl_value != self.iss.registers[rtl_rd]:
+            self._fail(
+                f"Retirement #{self.retired} at pc={rtl_pc:#010x} wrote x{rtl_rd}={rtl_value:#010x}, "
+                f"ISS expected {self.iss.registers[rtl_rd]:#010x}"
+            )
+
+        self._skip_non_writing()
+
+    async def _monitor(self):
+        cpu = self.dut.cpu
+        clock = self.dut.i_Clock
+        wb_enable = cpu.w_Wb_Enable
+        stall = cpu.w_Stall_S1
+
+        await ReadOnly()
+        while not self._done.is_set():
+            if not wb_enable.value.integer:
+                await RisingEdge(wb_enable)
+                await ReadOnly()
+            self._check_retirement()
+
+            # S3 only advances on a clock edge where stage 1 is not stalled. While
+            # a load/store holds the pipeline, w_Wb_Enable stays high for the
+            # same instruction, so sleep through the stall instead of re-checking.
+            if stall.value.integer:
+                await FallingEdge(stall)
+            await RisingEdge(clock)
+            await ReadOnly()
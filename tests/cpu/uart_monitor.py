@@ -0,0 +1,127 @@
+"""Event-driven decoder for bytes the design transmits on a UART line.
+
+uart_wait_for_byte in cpu/utils.py receives one byte while the caller waits,
+and re-measures the clock for every bit. UartMonitor runs in the background:
+it sleeps on the falling edge of the line, then wakes once per bit at the
+middle of the bit (a Timer computed from the clock period measured once) and
+pushes the decoded byte into a queue. Start it before sending the command whose reply
+it should catch:
+
+    monitor = UartMonitor(dut.i_Clock, dut.cpu.o_Uart_Rx_Out)
+    monitor.start()
+    await send_debug_command(dut, [DEBUG_OP_READ_PC], DEBUG_TRANSPORT_UART)
+    pc = int.from_bytes(await monitor.read_bytes(4), "little")
+"""
+
+import cocotb
+from cocotb.queue import Queue
+from cocotb.triggers import Event, FallingEdge, First, RisingEdge, Timer
+from cocotb.utils import get_sim_time
+
+from cpu.utils import uart_clocks_per_bit
+
+# Default read timeout: two frames (start + 8 data + stop bits each)
+REPLY_TIMEOUT_BITS = 20
+
+
+class UartMonitor:
+    """Decode 8N1 frames on a UART line into a queue of byte values.
+
+    Args:
+        clock: Clock the line is driven from (its period sets the bit time)
+        tx_serial: The UART line to watch (idle high)
+        clocks_per_bit: Clocks per bit; the harness's divider when omitted
+    """
+
+    def __init__(self, clock, tx_serial, clocks_per_bit=None):
+        self.clock = clock
+        self.tx_serial = tx_serial
+        self.clocks_per_bit = clocks_per_bit if clocks_per_bit is not None else uart_clocks_per_bit()
+        self.queue = Queue()
+        self.received = 0
+        self.framing_errors = 0  # frames whose start or stop bit was wrong
+        self.bit_steps = None  # bit time in simulator steps, once the clock is measured
+        self._measured = Event()
+        self._byte_received = Event()
+        self._task = None
+
+    def start(self):
+        """Fork the monitor coroutine."""
+        self._task = cocotb.start_soon(self._monitor())
+        return self._task
+
+    def stop(self):
+        if self._task is not None:
+            self._task.kill()
+            self._task = None
+
+    def clear(self):
+        """Drop bytes received but not read yet."""
+        while not self.queue.empty():
+            self.queue.get_nowait()
+
+    async def read_byte(self, timeout_ns=None):
+        """Wait for the next decoded byte.
+
+        Args:
+            timeout_ns: How long to wait; REPLY_TIMEOUT_BITS bit times when omitted
+
+        Raises:
+            AssertionError: If no byte arrives in time
+        """
+        if self.queue.empty():
+            if timeout_ns is None:
+                await self._measured.wait()
+                timeout = Timer(REPLY_TIMEOUT_BITS * self.bit_steps, units="step")
+            else:
+                timeout = Timer(timeout_ns, units="ns")
+            self._byte_received.clear()
+            await First(self._byte_received.wait(), timeout)
+        assert not self.queue.empty(), f"No UART byte received in time ({self.received} received so far)"
+        return self.queue.get_nowait()
+
+    async def read_bytes(self, count, timeout_ns=None):
+        """Wait for count bytes, each within timeout_ns of the previous one."""
+        return bytes([await self.read_byte(timeout_ns) for _ in range(count)])
+
+    async def _clock_period_steps(self):
+        await RisingEdge(self.clock)
+        start = get_sim_time()
+        await RisingEdge(self.clock)
+        return get_sim_time() - start
+
+    async def _monitor(self):
+        bit_steps = self.bit_steps = self.clocks_per_bit * await self._clock_period_steps()
+        self._measured.set()
+        half_bit = Timer(bit_steps // 2, units="step")
+        one_bit = Timer(bit_steps, units="step")
+        tx_serial = self.tx_serial
+
+        while True:
+            if not tx_serial.value.integer:
+                await RisingEdge(tx_serial)  # not idle: a break or a frame already under way
+            await FallingEdge(tx_serial)
+            await half_bit
+            if tx_serial.value.integer:
+                self.framing_errors += 1  # glitch, not a start bit
+                continue
+
+            byte = 0
+            for i in range(8):
+                await one_bit
+                byte |= tx_serial.value.integer << i
+
+            await one_bit
+            if not tx_serial.value.integer:
+                self.framing_errors += 1
+                continue
+            self.received += 1
+            self.queue.put_nowait(byte)
+            self._byte_received.set()
+
+
+def debug_uart_monitor(dut):
+    """Start a UartMonitor on the debug peripheral's TX line (cpu.o_Uart_Rx_Out)."""
+    monitor = UartMonitor(dut.i_Clock, dut.cpu.o_Uart_Rx_Out)
+    monitor.start()
+    return monitor
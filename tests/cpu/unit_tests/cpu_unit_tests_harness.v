@@ -109,6 +109,8 @@ module cpu_unit_tests_harness ();
   );
   // verilator lint_off PINMISSING
 
+  // The UART modules keep the board's divider here: these are the tests that
+  // cover the real baud rate, the integration harness runs a shortened UART.
   uart_receiver uart_receiver (
       .i_Reset(i_Reset),
       .i_Clock(i_Clock)
@@ -124,4 +126,9 @@ module cpu_unit_tests_harness ();
       .i_Clock(i_Clock)
   );
 
+  // i_Clock cycles since time 0, read at the start and end of every test by
+  // perf_records.py
+  reg [63:0] r_Cycle_Count = 64'd0;
+  always @(posedge i_Clock) r_Cycle_Count <= r_Cycle_Count + 1;
+
 endmodule
@@ -1,5 +1,7 @@
 import cocotb
+import numpy as np
 from cocotb.triggers import Timer
+from cpu.batch_iss import BatchRV32ISimulator, random_programs
 from cpu.constants import (
     ALU_SEL_ADD,
     ALU_SEL_SUB,
@@ -13,6 +15,7 @@ from cpu.constants import (
 )
 
 wait_ns = 1
+random_vectors = 2000
 
 
 @cocotb.test()
@@ -217,3 +220,27 @@ async def unknown_opcode_test(dut):
     await Timer(wait_ns, units="ns")
     result = dut.alu.o_Alu_Result.value.integer
     assert result == 0, f"Unknown opcode should result in 0, got {result}"
+
+
+@cocotb.test()
+async def random_program_alu_test(dut):
+    """Replay ALU operands produced by a batch of random programs on the batch ISS"""
+    rng = np.random.default_rng(0)
+    simulator = BatchRV32ISimulator(random_programs(rng, lanes=64, length=64), record_operations=True)
+    simulator.run()
+
+    a, b, select, expected = simulator.alu_operations()
+    picks = rng.choice(a.size, size=min(random_vectors, a.size), replace=False)
+
+    for i in picks:
+        dut.alu.i_Input_A.value = int(a[i])
+        dut.alu.i_Input_B.value = int(b[i])
+        dut.alu.i_Alu_Select.value = int(select[i])
+
+        await Timer(wait_ns, units="ns")
+
+        result = dut.alu.o_Alu_Result.value.integer
+        assert result == int(expected[i]), (
+            f"ALU select {int(select[i])} on {int(a[i]):#010x}, {int(b[i]):#010x} "
+            f"should be {int(expected[i]):#010x}, got {result:#010x}"
+        )
@@ -1,5 +1,7 @@
 import cocotb
+import numpy as np
 from cocotb.triggers import Timer
+from cpu.batch_iss import BatchRV32ISimulator, random_programs
 from cpu.constants import (
     CMP_SEL_EQ,
     CMP_SEL_NE,
@@ -11,6 +13,7 @@ from cpu.constants import (
 )
 
 wait_ns = 1
+random_vectors = 2000
 
 
 @cocotb.test()
@@ -219,3 +222,27 @@ async def unknown_test(dut):
 
         result = dut.comparator_unit.o_Compare_Result.value.integer
         assert result == 0, f"Unknown comparison should yield 0, got {result} for inputs {a}, {b}"
+
+
+@cocotb.test()
+async def random_program_comparator_test(dut):
+    """Replay comparator operands produced by a batch of random programs on the batch ISS"""
+    rng = np.random.default_rng(0)
+    simulator = BatchRV32ISimulator(random_programs(rng, lanes=64, length=64), record_operations=True)
+    simulator.run()
+
+    a, b, select, expected = simulator.comparator_operations()
+    picks = rng.choice(a.size, size=min(random_vectors, a.size), replace=False)
+
+    for i in picks:
+        dut.comparator_unit.i_Input_A.value = int(a[i])
+        dut.comparator_unit.i_Input_B.value = int(b[i])
+        dut.comparator_unit.i_Compare_Select.value = int(select[i])
+
+        await Timer(wait_ns, units="ns")
+
+        result = dut.comparator_unit.o_Compare_Result.value.integer
+        assert result == int(expected[i]), (
+            f"comparator select {int(select[i])} on {int(a[i]):#010x}, {int(b[i]):#010x} "
+            f"should be {int(expected[i]):#010x}, got {result:#010x}"
+        )
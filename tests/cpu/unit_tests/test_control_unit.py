@@ -118,6 +118,7 @@ async def test_r_type_instructions(dut):
 async def test_i_type_alu_instructions(dut):
     tests = [
         ("ADDI", FUNC3_ALU_ADD_SUB, 0,  ALU_SEL_ADD),
+        ("ADDI (imm[10] set)", FUNC3_ALU_ADD_SUB, 1, ALU_SEL_ADD),
         ("ANDI", FUNC3_ALU_AND, 0, ALU_SEL_AND),
         ("ORI", FUNC3_ALU_OR, 0, ALU_SEL_OR),
         ("XORI", FUNC3_ALU_XOR, 0, ALU_SEL_XOR),
@@ -9,9 +9,17 @@ from cpu.constants import (
 
     UART_CLOCKS_PER_BIT,
     DEBUG_OP_WRITE_PC,
+    DEBUG_OP_HALT,
     DEBUG_OP_UNHALT,
+    DEBUG_TRANSPORT_BACKDOOR,
+    DEBUG_TRANSPORT_UART,
 )
-from cocotb.triggers import ClockCycles, FallingEdge
+import os
+
+import cocotb
+from cocotb.triggers import FallingEdge, RisingEdge
+
+from cpu.waits import clock_cycles, wait_for_value
 
 def gen_i_type_instruction(opcode, rd, funct3, rs1, imm):
     instruction = opcode
@@ -67,7 +75,9 @@ def gen_r_type_instruction(rd, funct3, rs1, rs2, funct7):
 def write_word_to_mem(mem_array, addr, value):
     """Write a 32-bit value into byte-addressable cocotb memory (little-endian).
 
-    Address is masked to 16 bits to match test harness AXI truncation.
+    Address is masked to 16 bits to match test harness AXI truncation. This
+    costs four VPI writes; use cpu.memory_image.load_memory() for anything
+    larger than a handful of words.
     """
     addr = (addr - 0x80000000) & 0xFFFF
     mem_array[addr + 0].value = (value >> 0) & 0xFF
@@ -103,23 +113,35 @@ def write_instructions_rom(mem_array, base_addr, instructions):
         mem_array[rom_offset + i].value = ins
 
 
+def uart_clocks_per_bit():
+    """Clocks per UART bit of the simulated debug peripheral.
+
+    Harnesses that shorten the UART override its divider with a top-level
+    UART_CLKS_PER_BIT parameter; without one the board's rate is used.
+    """
+    try:
+        return cocotb.top.UART_CLKS_PER_BIT.value
+    except AttributeError:
+        return int(UART_CLOCKS_PER_BIT)
+
+
 async def uart_send_byte(clock, i_rx_serial, o_rx_dv, data_byte):
     """Send bytes over UART RX line bit by bit."""
+    clocks_per_bit = uart_clocks_per_bit()
 
     i_rx_serial.value = 0
-    await ClockCycles(clock, int(UART_CLOCKS_PER_BIT))
+    await clock_cycles(clock, clocks_per_bit)
 
     # Data bits (LSB first)
     for i in range(8):
         i_rx_serial.value = (data_byte >> i) & 0x1
-        await ClockCycles(clock, int(UART_CLOCKS_PER_BIT))
+        await clock_cycles(clock, clocks_per_bit)
 
-    # Stop bit
+    # Stop bit: done on the clock edge after the receiver raises o_Rx_DV (the
+    # edge that hands the byte on), or after one bit time
     i_rx_serial.value = 1
-    for _ in range(int(UART_CLOCKS_PER_BIT)):
-        if o_rx_dv.value.integer == 1:
-            break
-        await ClockCycles(clock, 1)
+    if await wait_for_value(o_rx_dv, 1, clock, clocks_per_bit):
+        await RisingEdge(clock)
 
 
 async def uart_send_bytes(clock, i_rx_serial, o_rx_dv, byte_array):
@@ -130,32 +152,31 @@ async def uart_send_bytes(clock, i_rx_serial, o_rx_dv, byte_array):
 
 async def uart_wait_for_byte(clock, i_tx_serial, o_tx_done):
     """Wait for a byte to be transmitted over UART TX line bit by bit."""
+    clocks_per_bit = uart_clocks_per_bit()
 
     # Wait for start bit for max 1 second
     timeout_cycles = CLOCK_FREQUENCY  # 1 second timeout
-    cycles_waited = 0
-    while i_tx_serial.value.integer != 0:
-        await ClockCycles(clock, 1)
-        cycles_waited += 1
-        assert cycles_waited < timeout_cycles, "Timeout waiting for UART start bit."
-
-    # Wait UART_CLOCKS_PER_BIT/2 to sample in middle of start bit
-    await ClockCycles(clock, int(UART_CLOCKS_PER_BIT) // 2)
+    assert await wait_for_value(i_tx_serial, 0, clock, timeout_cycles), "Timeout waiting for UART start bit."
+
+    # Wait half a bit to sample in middle of start bit
+    await clock_cycles(clock, clocks_per_bit // 2)
     assert i_tx_serial.value.integer == 0, "UART start bit incorrect."
 
     # Data bits (LSB first)
     received_byte = 0
     for i in range(8):
-        await ClockCycles(clock, int(UART_CLOCKS_PER_BIT))
+        await clock_cycles(clock, clocks_per_bit)
         bit = i_tx_serial.value.integer
         received_byte |= (bit << i)
 
     # Wait to middle of stop bit and check
-    await ClockCycles(clock, int(UART_CLOCKS_PER_BIT))
+    await clock_cycles(clock, clocks_per_bit)
     assert i_tx_serial.value.integer == 1, "UART stop bit incorrect."
 
-    # Wait for rest of stop bit
-    await ClockCycles(clock, int(UART_CLOCKS_PER_BIT)//2)
+    # o_Tx_Done pulses at the end of the stop bit; with a short bit the start
+    # bit may have been seen a few cycles late, so wait for it instead of
+    # sampling at a fixed offset
+    await wait_for_value(o_tx_done, 1, clock, clocks_per_bit)
 
     assert o_tx_done == 1, "UART o_Tx_Done flag not set"
 
@@ -173,26 +194,94 @@ async def wait_for_pipeline_flush(dut, timeout_cycles=1000):
     Raises:
         AssertionError: If pipeline doesn't flush within timeout
     """
-    for i in range(timeout_cycles):
-        if dut.cpu.w_Pipeline_Flushed.value == 1:
-            return
-        await ClockCycles(dut.i_Clock, 1)
-    raise AssertionError(f"Pipeline did not flush after {timeout_cycles} cycles")
+    if not await wait_for_value(dut.cpu.w_Pipeline_Flushed, 1, dut.i_Clock, timeout_cycles):
+        raise AssertionError(f"Pipeline did not flush after {timeout_cycles} cycles")
+
+
+def read_registers(dut):
+    """Read the whole CPU register file (x0-x31) as unsigned 32-bit values."""
+    return [dut.cpu.reg_file.Registers[i].value.integer for i in range(32)]
+
+
+def assert_registers_match(dut, expected_registers):
+    """Compare the CPU register file against expected values (e.g. iss.registers).
+
+    All mismatching registers are reported in a single assertion.
+    """
+    actual_registers = read_registers(dut)
+    mismatches = [
+        f"x{i}: got {actual:#010x}, expected {expected & 0xFFFFFFFF:#010x}"
+        for i, (actual, expected) in enumerate(zip(actual_registers, expected_registers))
+        if actual != expected & 0xFFFFFFFF
+    ]
+    assert not mismatches, "Register file mismatch: " + "; ".join(mismatches)
+
 
+def debug_transport(transport=None):
+    """Resolve how debug commands reach the CPU.
 
-async def send_write_pc_command(dut, pc_value):
+    Args:
+        transport: DEBUG_TRANSPORT_UART or DEBUG_TRANSPORT_BACKDOOR; when None,
+            the DEBUG_TRANSPORT environment variable, else the backdoor
+
+    Raises:
+        ValueError: If the transport is not one of the two
+    """
+    if transport is None:
+        transport = os.environ.get("DEBUG_TRANSPORT", DEBUG_TRANSPORT_BACKDOOR)
+    if transport not in (DEBUG_TRANSPORT_UART, DEBUG_TRANSPORT_BACKDOOR):
+        raise ValueError(f"Unknown debug transport {transport!r}")
+    return transport
+
+
+async def backdoor_send_bytes(dut, byte_array, timeout_cycles=1000):
+    """Hand a debug command to debug_peripheral one byte per cycle, bypassing the UART.
+
+    Waits for the previous command to finish first: unlike the UART, the
+    backdoor can deliver an opcode while the peripheral is still busy.
+    """
+    s_idle = 0
+    if not await wait_for_value(dut.cpu.debug_peripheral.r_State, s_idle, dut.i_Clock, timeout_cycles):
+        raise AssertionError(f"Debug peripheral still busy after {timeout_cycles} cycles")
+
+    # Driven between rising edges, so each byte is sampled exactly once
+    for byte in byte_array:
+        await FallingEdge(dut.i_Clock)
+        dut.r_Debug_Cmd_Byte.value = byte
+        dut.r_Debug_Cmd_DV.value = 1
+    await FallingEdge(dut.i_Clock)
+    # Immediate, so the pulse ends even if the test returns right after
+    dut.r_Debug_Cmd_DV.setimmediatevalue(0)
+
+
+async def send_debug_command(dut, byte_array, transport=None):
+    """Send a debug command (opcode followed by its argument bytes) to the CPU.
+
+    Args:
+        dut: The integration harness DUT
+        byte_array: Opcode and argument bytes
+        transport: See debug_transport()
+    """
+    if debug_transport(transport) == DEBUG_TRANSPORT_BACKDOOR:
+        await backdoor_send_bytes(dut, byte_array)
+        return
+    for byte in byte_array:
+        await uart_send_byte(dut.i_Clock, dut.cpu.i_Uart_Tx_In, dut.cpu.debug_peripheral.uart_receiver.o_Rx_DV, byte)
+
+
+async def send_write_pc_command(dut, pc_value, transport=None):
     """Send WRITE_PC command via debug peripheral: opcode + 4 PC bytes (little-endian).
 
     Note: The WRITE_PC command automatically halts the CPU.
     """
-    await uart_send_byte(dut.i_Clock, dut.cpu.i_Uart_Tx_In, dut.cpu.debug_peripheral.uart_receiver.o_Rx_DV, DEBUG_OP_WRITE_PC)
-    await uart_send_byte(dut.i_Clock, dut.cpu.i_Uart_Tx_In, dut.cpu.debug_peripheral.uart_receiver.o_Rx_DV, (pc_value >> 0) & 0xFF)
-    await uart_send_byte(dut.i_Clock, dut.cpu.i_Uart_Tx_In, dut.cpu.debug_peripheral.uart_receiver.o_Rx_DV, (pc_value >> 8) & 0xFF)
-    await uart_send_byte(dut.i_Clock, dut.cpu.i_Uart_Tx_In, dut.cpu.debug_peripheral.uart_receiver.o_Rx_DV, (pc_value >> 16) & 0xFF)
-    await uart_send_byte(dut.i_Clock, dut.cpu.i_Uart_Tx_In, dut.cpu.debug_peripheral.uart_receiver.o_Rx_DV, (pc_value >> 24) & 0xFF)
+    await send_debug_command(dut, [DEBUG_OP_WRITE_PC, *(pc_value & 0xFFFFFFFF).to_bytes(4, "little")], transport)
 
 
-async def send_unhalt_command(dut):
-    """Send UNHALT command via debug peripheral to resume CPU execution."""
-    await uart_send_byte(dut.i_Clock, dut.cpu.i_Uart_Tx_In, dut.cpu.debug_peripheral.uart_receiver.o_Rx_DV, DEBUG_OP_UNHALT)
+async def send_halt_command(dut, transport=None):
+    """Send HALT command via debug peripheral to stop CPU execution."""
+    await send_debug_command(dut, [DEBUG_OP_HALT], transport)
 
+
+async def send_unhalt_command(dut, transport=None):
+    """Send UNHALT command via debug peripheral to resume CPU execution."""
+    await send_debug_command(dut, [DEBUG_OP_UNHALT], transport)
@@ -0,0 +1,71 @@
+"""Edge-triggered waits that cost a few Python wakeups however long they last.
+
+A loop of ClockCycles(clock, 1) that checks a signal wakes Python on every
+clock edge until the hardware gets there, and ClockCycles(clock, n) itself
+awaits n edges one by one. The waits here sleep on the edges of the signal
+being waited for, raced against a timeout, and count out long delays with a
+Timer from the clock's measured period:
+
+    if not await wait_for_value(dut.cpu.w_Pipeline_Flushed, 1, dut.i_Clock, 1000):
+        raise AssertionError("Pipeline did not flush")
+
+A 1-bit signal wakes Python once, on the edge towards the value; a vector
+wakes it on each change until it holds the value.
+"""
+
+import cocotb
+from cocotb.triggers import Edge, FallingEdge, First, RisingEdge, Timer
+from cocotb.utils import get_sim_time
+
+
+async def clock_cycles(clock, cycles):
+    """Wait for the cycles-th rising edge of a free-running clock, like ClockCycles.
+
+    The first two edges measure the period; the rest are skipped with a Timer
+    to half a period before the last edge, so any count costs four wakeups.
+    """
+    await RisingEdge(clock)
+    if cycles < 2:
+        return
+    start = get_sim_time()
+    await RisingEdge(clock)
+    if cycles < 3:
+        return
+    period = get_sim_time() - start
+    await Timer((cycles - 2) * period - period // 2, units="step")
+    await RisingEdge(clock)
+
+
+def _change_trigger(signal, value):
+    if len(signal) == 1:
+        return RisingEdge(signal) if value else FallingEdge(signal)
+    return Edge(signal)
+
+
+async def wait_for_value(signal, value, clock, timeout_cycles):
+    """Wait until signal holds value, giving up after timeout_cycles of clock.
+
+    Returns at once if signal already holds value, else in the timestep it
+    changes to value. The timeout is a clock_cycles() task raced against the
+    signal's edges and killed when the wait ends.
+
+    Args:
+        signal: The signal to wait on
+        value: Integer value to wait for
+        clock: Free-running clock the timeout is counted in
+        timeout_cycles: Rising edges of clock to wait at most
+
+    Returns:
+        True if signal reached value, False if the timeout expired first
+    """
+    if signal.value == value:
+        return True
+    changed = _change_trigger(signal, value)
+    timeout = cocotb.start_soon(clock_cycles(clock, timeout_cycles))
+    try:
+        while signal.value != value:
+            if await First(changed, timeout.join()) is not changed:
+                return False
+        return True
+    finally:
+        timeout.kill()
@@ -0,0 +1,7 @@
+import os
+import sys
+
+# The assembler, its passes and debug_client live in the repo root, probe.py in
+# tools/ and the test runners (run_parallel.py, perf_records.py) in tests/
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..")
+sys.path[:0] = [ROOT, os.path.join(ROOT, "tools"), os.path.join(ROOT, "tests")]
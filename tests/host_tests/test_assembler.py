@@ -0,0 +1,131 @@
+import pytest
+
+from assembler import CPU_BASE_ADDR, NOP, assemble, evaluate, hi, lo
+
+
+def words(source, base_addr=CPU_BASE_ADDR):
+    return assemble(source, base_addr).words
+
+
+@pytest.mark.parametrize("source, word", [
+    ("add a0, a1, a2", 0x00C58533),        # R
+    ("sub t0, t1, t2", 0x407302B3),
+    ("addi a0, a0, -1", 0xFFF50513),       # I
+    ("slli a0, a0, 3", 0x00351513),
+    ("srai a0, a0, 3", 0x40355513),
+    ("lw a0, 8(sp)", 0x00812503),
+    ("lbu a0, -1(sp)", 0xFFF14503),
+    ("jalr zero, 0(ra)", 0x00008067),
+    ("jalr ra, t0, 4", 0x004280E7),
+    ("sw a0, 8(sp)", 0x00A12423),          # S
+    ("sb a0, -4(s0)", 0xFEA40E23),
+    ("lui a0, 0x12345", 0x12345537),       # U
+    ("auipc t0, 1", 0x00001297),
+    ("beq a0, a1, .+8", 0x00B50463),       # B
+    ("bne a0, a1, .-4", 0xFEB51EE3),
+    ("jal ra, .+16", 0x010000EF),          # J
+])
+def test_instruction_formats(source, word):
+    assert words(source) == [word]
+
+
+def test_forward_and_backward_labels():
+    program = assemble("""
+    start:
+        beq  a0, zero, done     # forward
+        addi a0, a0, -1
+        j    start              # backward
+    done:
+        jal  zero, done
+    """)
+    assert program.symbols == {"start": CPU_BASE_ADDR, "done": CPU_BASE_ADDR + 12}
+    assert program.words == [
+        0x00050663,  # beq +12
+        0xFFF50513,
+        0xFF9FF06F,  # jal zero, -8
+        0x0000006F,  # jal zero, 0
+    ]
+
+
+@pytest.mark.parametrize("value", [0, 0x7FF, 0x800, 0xFFF, 0x12345678, 0x80000800, 0xFFFFFFFF])
+def test_hi_lo_rebuild_the_value(value):
+    assert ((hi(value) << 12) + lo(value)) & 0xFFFFFFFF == value
+    assert -2048 <= lo(value) <= 2047
+
+
+def test_hi_lo_operands():
+    program = assemble("""
+        lui  a0, %hi(data)
+        addi a0, a0, %lo(data)
+        .org 0x800
+    data:
+        .word 1
+    """)
+    # data is 0x80000800: lo is -2048, so hi rounds up to 0x80001
+    assert program.words[:2] == [0x80001537, 0x80050513]
+
+
+@pytest.mark.parametrize("expression, value", [
+    ("'a'", 97),
+    ("'\\n'", 10),
+    ("'\\\\'", 92),
+    ("'\\''", 39),
+    ("'\\0'", 0),
+    ("1 + 2 * 3", 7),
+    ("(1 + 2) * 3", 9),
+    ("-7 / 2", -4),
+    ("0x10 - 0b11", 13),
+])
+def test_evaluate(expression, value):
+    assert evaluate(expression, {}) == value
+
+
+@pytest.mark.parametrize("literal", ["'ab'", "'", "'\\q'"])
+def test_malformed_character_literals(literal):
+    with pytest.raises(ValueError):
+        evaluate(literal, {})
+
+
+def test_directives():
+    program = assemble("""
+        .text
+        .globl start
+        .equ  COUNT, 3
+    start:
+        addi  a0, zero, COUNT
+        .align 3
+    table:
+        .word 1, table, COUNT * 2
+        .zero 8
+        .org  0x28
+    tail:
+        .word -1
+    """)
+    assert program.symbols["table"] == CPU_BASE_ADDR + 8
+    assert program.symbols["tail"] == CPU_BASE_ADDR + 0x28
+    assert program.words == [
+        0x00300513, NOP,
+        1, CPU_BASE_ADDR + 8, 6,
+        0, 0,
+        0, 0, 0,
+        0xFFFFFFFF,
+    ]
+
+
+@pytest.mark.parametrize("source, message", [
+    ("beq a0, a1, nowhere", "Undefined symbol 'nowhere'"),
+    ("beq a0, a1, .+4096", "Branch offset 4096 out of range"),
+    ("jal ra, .+0x100000", "Jump offset 1048576 out of range"),
+    ("addi a0, a0, 2048", "Immediate 2048 out of range"),
+    ("lw a0, -2049(sp)", "Offset -2049 out of range"),
+    ("slli a0, a0, 32", "Shift amount 32 out of range"),
+    ("lui a0, 0x100000", "Upper immediate 1048576 out of range"),
+    ("add a0, a1", "'add' takes 3 operands"),
+    ("add a0, a1, x32", "Unknown register 'x32'"),
+    ("frob a0", "Unknown instruction 'frob'"),
+    (".zero 6", "multiple of 4"),
+    ("a:\na:", "Duplicate symbol 'a'"),
+])
+def test_errors_name_the_line(source, message):
+    with pytest.raises(ValueError, match="line [12]: .*" + message.replace("(", r"\(").replace(".", r"\.")):
+        assemble(source)
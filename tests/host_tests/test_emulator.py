@@ -0,0 +1,40 @@
+import threading
+
+from debug_client import DebugClient, PtyTransport
+from debug_client.emulator import PtyDebugPeripheral
+
+
+def stop_within(peripheral, seconds):
+    """Run peripheral.stop() on a thread so a hang fails the test instead of the run."""
+    stopper = threading.Thread(target=peripheral.stop, daemon=True)
+    stopper.start()
+    stopper.join(seconds)
+    return not stopper.is_alive()
+
+
+def test_commands_round_trip():
+    with PtyDebugPeripheral(pc=0x80000010) as peripheral:
+        transport = PtyTransport(peripheral.port)
+        try:
+            client = DebugClient(transport)
+            assert client.ping()
+            client.write_register(5, 0x1234)
+            assert client.read_register(5) == 0x1234
+            assert client.read_pc() == 0x80000010
+        finally:
+            transport.close()
+
+
+def test_stop_before_start():
+    assert stop_within(PtyDebugPeripheral(), 1)
+
+
+def test_stop_while_a_client_holds_the_port():
+    peripheral = PtyDebugPeripheral().start()
+    transport = PtyTransport(peripheral.port)
+    try:
+        assert DebugClient(transport).ping()
+        # The client's open slave keeps EOF from reaching the serving thread
+        assert stop_within(peripheral, 2)
+    finally:
+        transport.close()
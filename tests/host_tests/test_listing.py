@@ -0,0 +1,57 @@
+import pytest
+
+from assembler import CPU_BASE_ADDR, assemble, write_listing_file
+from probe import SymbolTable
+
+SOURCE = """
+start:
+entry:
+    addi a0, zero, 1
+loop:
+    addi a0, a0, 1
+    j    loop
+table:
+    .word 1, 2, 3
+"""
+
+
+@pytest.fixture
+def symbols(tmp_path):
+    path = tmp_path / "program.lst"
+    write_listing_file(path, assemble(SOURCE))
+    return SymbolTable.load(path)
+
+
+def test_listing_rows(tmp_path):
+    path = tmp_path / "program.lst"
+    write_listing_file(path, assemble(SOURCE))
+    rows = [row.split("\t") for row in path.read_text().splitlines()]
+    assert rows[0] == ["# address", "labels", "words", "line", "source"]
+    assert rows[1] == ["80000000", "start", "0", "2", "start:"]
+    assert rows[3] == ["80000000", "-", "1", "4", "addi a0, zero, 1"]
+    assert rows[-1] == ["8000000c", "-", "3", "9", ".word 1, 2, 3"]
+
+
+def test_round_trip_keeps_the_first_label_of_an_address(symbols):
+    assert symbols.addresses == [CPU_BASE_ADDR, CPU_BASE_ADDR + 4, CPU_BASE_ADDR + 12]
+    assert symbols.names == ["start", "loop", "table"]
+
+
+@pytest.mark.parametrize("pc, name", [
+    (CPU_BASE_ADDR - 4, ""),             # before the first symbol
+    (CPU_BASE_ADDR, "start"),
+    (CPU_BASE_ADDR + 8, "loop+0x4"),
+    (CPU_BASE_ADDR + 12, "table"),
+    (CPU_BASE_ADDR + 20, "table+0x8"),   # last word of a multi-word row
+    (CPU_BASE_ADDR + 24, ""),            # past the end
+])
+def test_lookup(symbols, pc, name):
+    assert symbols.lookup(pc) == name
+
+
+def test_end_counts_every_word_of_an_expanded_pseudo_instruction(tmp_path):
+    path = tmp_path / "program.lst"
+    write_listing_file(path, assemble("start:\n    li a0, 0x12345678"))
+    symbols = SymbolTable.load(path)
+    assert symbols.end == CPU_BASE_ADDR + 8
+    assert symbols.lookup(CPU_BASE_ADDR + 4) == "start+0x4"
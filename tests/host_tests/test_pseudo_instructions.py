@@ -0,0 +1,68 @@
+import pytest
+
+from assembler import CPU_BASE_ADDR, assemble
+
+
+def run(words):
+    """Value left in the destination of a lui/addi sequence, and the sequence's length."""
+    value = 0
+    for word in words:
+        opcode = word & 0x7F
+        if opcode == 0b0110111:  # lui
+            value = word & 0xFFFFF000
+        elif opcode == 0b0010011 and (word >> 12) & 0x7 == 0:  # addi
+            rs1 = (word >> 15) & 0x1F
+            imm = ((word >> 20) ^ 0x800) - 0x800
+            value = ((value if rs1 else 0) + imm) & 0xFFFFFFFF
+        else:
+            raise AssertionError(f"Unexpected instruction {word:#010x} in a li expansion")
+    return value, len(words)
+
+
+@pytest.mark.parametrize("constant, length", [
+    (0, 1),
+    (1, 1),
+    (2047, 1),
+    (-1, 1),
+    (-2048, 1),
+    (0xFFFFFFFF, 1),           # -1 as unsigned
+    (0xFFFFF800, 1),           # -2048 as unsigned
+    (2048, 2),                 # just past addi's range
+    (-2049, 2),
+    (0x12345000, 1),           # low 12 bits clear: lui alone
+    (0x80000000, 1),
+    (0xFFFFF000, 1),
+    (0x12345678, 2),
+    (0x12345800, 2),           # lo bit 11 set: hi rounds up to 0x12346
+    (0x00000FFF, 2),           # lo is -1, hi is 1
+    (0x7FFFFFFF, 2),           # hi 0x80000 wraps, lo -1 brings it back
+    (0x7FFFF800, 2),
+    (0x80000800, 2),
+    (0xDEADBEEF, 2),
+])
+def test_li_is_shortest_and_exact(constant, length):
+    value, emitted = run(assemble(f"li a0, {constant}").words)
+    assert value == constant & 0xFFFFFFFF
+    assert emitted == length
+
+
+def test_li_small_constants_take_one_addi():
+    for constant in range(-2048, 2048):
+        assert run(assemble(f"li a0, {constant}").words) == (constant & 0xFFFFFFFF, 1), constant
+
+
+def test_li_equ_constant_is_folded():
+    assert run(assemble(".equ BASE, 0x80000000\nli a0, BASE + 4").words) == (0x80000004, 2)
+
+
+@pytest.mark.parametrize("offset", [0x8, 0x7FC, 0x800, 0xFFC])
+def test_la_label_takes_the_full_pair(offset):
+    # The label is not known before layout, so la reserves lui + addi even when one would do
+    program = assemble(f"la a0, target\n.org {offset:#x}\ntarget:\n.word 0")
+    assert run(program.words[:2]) == (CPU_BASE_ADDR + offset, 2)
+
+
+@pytest.mark.parametrize("constant", ["0x100000000", "-0x80000001"])
+def test_li_out_of_range(constant):
+    with pytest.raises(ValueError, match="Constant"):
+        assemble(f"li a0, {constant}")
@@ -0,0 +1,35 @@
+import shutil
+
+import pytest
+
+from run_parallel import merge_coverage
+
+
+def point(line, count, hierarchy="top.cpu"):
+    """One line-coverage point in Verilator's coverage.dat format."""
+    fields = {"f": "cpu.v", "l": str(line), "page": "v_line/cpu", "o": "block", "h": hierarchy}
+    key = "".join(f"\001{name}\002{value}" for name, value in fields.items())
+    return f"C '{key}' {count}\n"
+
+
+def read_points(path):
+    """{frozenset of key fields: count}, independent of the order verilator_coverage writes fields in."""
+    points = {}
+    for line in path.read_text().splitlines():
+        if line.startswith("C '"):
+            key, count = line[3:].rsplit("' ", 1)
+            fields = frozenset(tuple(field.split("\002")) for field in key.split("\001") if field)
+            points[fields] = int(count)
+    return points
+
+
+@pytest.mark.skipif(shutil.which("verilator_coverage") is None, reason="verilator_coverage not installed")
+def test_merge_coverage_sums_points(tmp_path):
+    first, second, merged = tmp_path / "a.dat", tmp_path / "b.dat", tmp_path / "merged.dat"
+    first.write_text("# SystemC::Coverage-3\n" + point(10, 3) + point(11, 0))
+    second.write_text("# SystemC::Coverage-3\n" + point(10, 2) + point(12, 1))
+    assert merge_coverage([str(first), str(second)], str(merged)) == 0
+
+    expected = tmp_path / "expected.dat"
+    expected.write_text("# SystemC::Coverage-3\n" + point(10, 5) + point(11, 0) + point(12, 1))
+    assert read_points(merged) == read_points(expected)
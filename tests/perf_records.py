@@ -0,0 +1,291 @@
+"""Per-test cost records for cocotb regressions.
+
+install() (called from the cpu and vga package __init__ when a simulation
+imports them) appends one JSON line per test to PERF_RECORDS (default
+perf.jsonl in the simulator's working directory):
+
+    {"test": "cpu.integration_tests.test_debug_ping.test_ping_response",
+     "outcome": "pass", "wall_time_s": 0.053, "sim_time_ns": 312.0,
+     "cycles": 312, "sim_ns_per_s": 5832.6, "cycles_per_s": 5832.6,
+     "wakeups": 2067, "wakeups_per_cycle": 6.62}
+
+cycles counts the harness's i_Clock (r_Cycle_Count in each *_harness.v);
+wakeups counts triggers that fired into the cocotb scheduler, i.e. every
+time the simulator handed control back to Python. The most expensive tests
+are printed after cocotb's own summary; for a saved file:
+
+    python perf_records.py perf.jsonl [--top N]
+
+perf_baseline.json holds the checked-in cost of every passing test. Compare a
+run against it, or fold a run into it after an intended change:
+
+    python perf_records.py perf.jsonl --compare perf_baseline.json
+    python perf_records.py perf.jsonl --update-baseline perf_baseline.json
+
+A test regresses when its wakeups or cycles grow past the thresholds; those
+counters do not depend on the machine, so --compare exits 1 on them. Wall
+time is noisy and machine-specific: it is first scaled by the ratio of the
+run's total to the baseline's (so a slower host is not flagged as a whole),
+and a test that still grew past WALL_THRESHOLD is only reported as a
+warning.
+"""
+
+import argparse
+import json
+import os
+import sys
+
+DEFAULT_RECORDS_FILE = "perf.jsonl"
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "perf_baseline.json")
+SUMMARY_TOP = 15
+
+# Regression thresholds: relative growth over the baseline
+WAKEUP_THRESHOLD = 0.10
+CYCLE_THRESHOLD = 0.10
+# Wall time growth past this, after scaling, is only a warning
+WALL_THRESHOLD = 0.50
+# Changes smaller than these are never flagged
+WAKEUP_MIN_DELTA = 100
+CYCLE_MIN_DELTA = 10
+WALL_MIN_DELTA_S = 0.25
+
+_wakeups = 0
+_installed = False
+
+
+def _cycle_count():
+    import cocotb
+    try:
+        return cocotb.top.r_Cycle_Count.value.integer
+    except (AttributeError, ValueError):
+        return None
+
+
+def _ratio(a, b):
+    return a / b if a is not None and b else None
+
+
+def make_record(test, outcome, wall_time_s, sim_time_ns, cycles, wakeups):
+    """One test's record, with the derived rates."""
+    return {
+        "test": test,
+        "outcome": outcome,
+        "wall_time_s": wall_time_s,
+        "sim_time_ns": sim_time_ns,
+        "cycles": cycles,
+        "sim_ns_per_s": _ratio(sim_time_ns, wall_time_s),
+        "cycles_per_s": _ratio(cycles, wall_time_s),
+        "wakeups": wakeups,
+        "wakeups_per_cycle": _ratio(wakeups, cycles),
+    }
+
+
+def install(path=None):
+    """Record every test of this simulation into path (PERF_RECORDS, or perf.jsonl).
+
+    Wraps cocotb 1.9's Scheduler._react and RegressionManager's per-test
+    start/record/summary methods; the file is truncated here, once per
+    simulation, like results.xml.
+    """
+    global _installed
+    if _installed:
+        return
+    _installed = True
+
+    from cocotb.regression import RegressionManager
+    from cocotb.scheduler import Scheduler
+
+    path = os.path.abspath(path or os.environ.get("PERF_RECORDS", DEFAULT_RECORDS_FILE))
+    open(path, "w").close()
+    records = []
+    start = {}
+
+    react = Scheduler._react
+
+    def counting_react(self, trigger):
+        global _wakeups
+        _wakeups += 1
+        return react(self, trigger)
+
+    start_test = RegressionManager._start_test
+
+    def recording_start_test(self):
+        start["cycles"] = _cycle_count()
+        start["wakeups"] = _wakeups
+        return start_test(self)
+
+    record_result = RegressionManager._record_result
+
+    def recording_record_result(self, test, outcome, wall_time_s, sim_time_ns):
+        record_result(self, test, outcome, wall_time_s, sim_time_ns)
+        if outcome is None:
+            result, wall_time_s, cycles, wakeups = "skip", 0.0, 0, 0
+        else:
+            result = "pass" if self.test_results[-1]["pass"] else "fail"
+            cycles = _cycle_count()
+            if cycles is not None and start.get("cycles") is not None:
+                cycles -= start["cycles"]
+            wakeups = _wakeups - start.get("wakeups", 0)
+        record = make_record(f"{test.__module__}.{test.__qualname__}", result, wall_time_s, sim_time_ns, cycles, wakeups)
+        records.append(record)
+        with open(path, "a") as f:
+            f.write(json.dumps(record) + "\n")
+
+    log_test_summary = RegressionManager._log_test_summary
+
+    def summarising_log_test_summary(self):
+        log_test_summary(self)
+        print(format_summary(records, top=SUMMARY_TOP))
+
+    Scheduler._react = counting_react
+    RegressionManager._start_test = recording_start_test
+    RegressionManager._record_result = recording_record_result
+    RegressionManager._log_test_summary = summarising_log_test_summary
+
+
+def load(path):
+    """Records from a JSON-lines file."""
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def _fmt(value, width, spec):
+    return f"{'-':>{width}}" if value is None else format(value, f"{width}{spec}")
+
+
+def format_summary(records, top=None):
+    """Table of records, most wall-clock time first, with totals."""
+    ranked = sorted(records, key=lambda record: record["wall_time_s"], reverse=True)
+    total_wall = sum(record["wall_time_s"] for record in records)
+    lines = [
+        f"{'WALL (s)':>9} {'%':>5} {'SIM (ns)':>12} {'CYCLES':>10} {'KCYC/S':>8} {'WAKEUPS':>9} {'WAKE/CYC':>8}  TEST"
+    ]
+    for record in ranked[:top]:
+        cycles_per_s = record["cycles_per_s"]
+        lines.append(
+            f"{record['wall_time_s']:9.2f} {100 * _ratio(record['wall_time_s'], total_wall) if total_wall else 0:5.1f} "
+            f"{record['sim_time_ns']:12.0f} {_fmt(record['cycles'], 10, 'd')} "
+            f"{_fmt(cycles_per_s and cycles_per_s / 1000, 8, '.1f')} {record['wakeups']:9d} "
+            f"{_fmt(record['wakeups_per_cycle'], 8, '.2f')}  {record['test']}"
+        )
+    if top is not None and len(ranked) > top:
+        lines.append(f"{'':>9} ... {len(ranked) - top} cheaper tests")
+    total_wakeups = sum(record["wakeups"] for record in records)
+    lines.append(f"{total_wall:9.2f} {'':5} {'':12} {'':10} {'':8} {total_wakeups:9d} {'':8}  TOTAL ({len(records)} tests)")
+    return "\n".join(lines)
+
+
+def load_baseline(path):
+    """{test: {"wall_time_s", "wakeups", "cycles"}} from a baseline file, or {} if there is none."""
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def update_baseline(records, path):
+    """Set the baseline entries of every passing test in records; other entries are kept."""
+    baseline = load_baseline(path)
+    for record in records:
+        if record["outcome"] == "pass":
+            baseline[record["test"]] = {
+                "wall_time_s": round(record["wall_time_s"], 3),
+                "wakeups": record["wakeups"],
+                "cycles": record["cycles"],
+            }
+    with open(path, "w") as f:
+        json.dump(dict(sorted(baseline.items())), f, indent=1)
+        f.write("\n")
+
+
+def _grew(now, before, threshold, min_delta):
+    return now - before > max(threshold * before, min_delta)
+
+
+def compare(records, baseline, wakeup_threshold=WAKEUP_THRESHOLD, wall_threshold=WALL_THRESHOLD,
+            cycle_threshold=CYCLE_THRESHOLD):
+    """Regressions and wall-time warnings of passing tests in records against baseline.
+
+    Wall times are scaled by the baseline's total over the run's total (of
+    the tests both have) before they are compared.
+
+    Returns:
+        [(test, metric, baseline value, new value)] for wakeups and cycles,
+        the same for scaled wall times, and the tests that have no baseline
+        entry
+    """
+    regressions = []
+    warnings = []
+    missing = []
+    compared = []
+    for record in records:
+        if record["outcome"] != "pass":
+            continue
+        before = baseline.get(record["test"])
+        if before is None:
+            missing.append(record["test"])
+            continue
+        compared.append((record, before))
+        if _grew(record["wakeups"], before["wakeups"], wakeup_threshold, WAKEUP_MIN_DELTA):
+            regressions.append((record["test"], "wakeups", before["wakeups"], record["wakeups"]))
+        if (record["cycles"] is not None and before.get("cycles") is not None
+                and _grew(record["cycles"], before["cycles"], cycle_threshold, CYCLE_MIN_DELTA)):
+            regressions.append((record["test"], "cycles", before["cycles"], record["cycles"]))
+
+    run_wall = sum(record["wall_time_s"] for record, _ in compared)
+    baseline_wall = sum(before["wall_time_s"] for _, before in compared)
+    scale = baseline_wall / run_wall if run_wall and baseline_wall else 1.0
+    for record, before in compared:
+        wall_time_s = round(record["wall_time_s"] * scale, 3)
+        if _grew(wall_time_s, before["wall_time_s"], wall_threshold, WALL_MIN_DELTA_S):
+            warnings.append((record["test"], "scaled wall_time_s", before["wall_time_s"], wall_time_s))
+    return regressions, warnings, missing
+
+
+def format_comparison(regressions, warnings, missing, compared):
+    lines = []
+    for label, entries in (("REGRESSED", regressions), ("WARNING", warnings)):
+        for test, metric, before, now in entries:
+            growth = f"+{100 * (now - before) / before:.0f}%" if before else "new"
+            lines.append(f"{label} {test}: {metric} {before:g} -> {now:g} ({growth})")
+    for test in missing:
+        lines.append(f"NO BASELINE {test}")
+    lines.append(f"{compared} tests compared, {len({test for test, *_ in regressions})} regressed, "
+                 f"{len({test for test, *_ in warnings})} slower (advisory), {len(missing)} without a baseline")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Print the per-test cost table of a perf records file.")
+    parser.add_argument("records", nargs="?", default=DEFAULT_RECORDS_FILE, help="JSON-lines file (default: perf.jsonl)")
+    parser.add_argument("--top", type=int, help="only the N most expensive tests")
+    parser.add_argument("--compare", metavar="BASELINE",
+                        help="flag tests that regressed against BASELINE; exit 1 if wakeups or cycles did")
+    parser.add_argument("--update-baseline", metavar="BASELINE", help="store the passing tests' costs in BASELINE")
+    parser.add_argument("--wakeup-threshold", type=float, default=WAKEUP_THRESHOLD,
+                        help=f"allowed relative growth in wakeups (default: {WAKEUP_THRESHOLD})")
+    parser.add_argument("--cycle-threshold", type=float, default=CYCLE_THRESHOLD,
+                        help=f"allowed relative growth in cycles (default: {CYCLE_THRESHOLD})")
+    parser.add_argument("--wall-threshold", type=float, default=WALL_THRESHOLD,
+                        help=f"relative growth in scaled wall time to warn about (default: {WALL_THRESHOLD})")
+    args = parser.parse_args()
+
+    records = load(args.records)
+    if args.top != 0:
+        print(format_summary(records, top=args.top))
+    if args.update_baseline:
+        update_baseline(records, args.update_baseline)
+        print(f"Updated {args.update_baseline}")
+    if args.compare:
+        baseline = load_baseline(args.compare)
+        regressions, warnings, missing = compare(
+            records, baseline, args.wakeup_threshold, args.wall_threshold, args.cycle_threshold
+        )
+        compared = sum(1 for record in records if record["outcome"] == "pass") - len(missing)
+        print(format_comparison(regressions, warnings, missing, compared))
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,152 @@
+"""Run cocotb test modules in parallel simulations of one compiled model.
+
+Called by "make parallel" once the model in SIM_BUILD is built; make's
+environment (TOPLEVEL, MODULE, PYTHONPATH, LIBPYTHON_LOC, ...) is passed
+through. Every module in MODULE gets its own simulation in its own directory
+under SIM_BUILD/parallel/, and a pool of --jobs workers runs them. When all
+are done, their results.xml files are merged into --results, their
+perf.jsonl records into --perf-records, and their coverage.dat files (from a
+--coverage build) into coverage.dat with verilator_coverage.
+
+    make TEST_TYPE=integration parallel JOBS=8
+
+Modules run in separate simulations, so state that one module leaves in the
+harness is not seen by the next, unlike a serial run.
+"""
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import time
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
+
+import perf_records
+
+# Files the HDL opens relative to the simulator's working directory
+# (instruction_memory_axi.v: $readmemh("rom.mem", rom)); linked into every
+# module's directory
+SIM_INPUT_FILES = ["rom.mem"]
+
+
+def split_modules(modules):
+    """The module names of a MODULE value ("a, b,\\n c", quotes from the Makefile included)."""
+    names = (name.strip().strip('"').strip() for name in modules.split(","))
+    return [name for name in names if name]
+
+
+def run_module(module, simulator, sim_args, work_dir):
+    """Simulate one module in work_dir.
+
+    Returns:
+        (module, returncode, seconds); output goes to work_dir/sim.log
+    """
+    shutil.rmtree(work_dir, ignore_errors=True)
+    os.makedirs(work_dir)
+    for name in SIM_INPUT_FILES:
+        if os.path.exists(name):
+            os.symlink(os.path.abspath(name), os.path.join(work_dir, name))
+    env = dict(os.environ, MODULE=module, TESTCASE="", COCOTB_RESULTS_FILE="results.xml", PERF_RECORDS="perf.jsonl")
+    start = time.monotonic()
+    with open(os.path.join(work_dir, "sim.log"), "w") as log:
+        returncode = subprocess.call(
+            [simulator] + sim_args, cwd=work_dir, env=env, stdout=log, stderr=subprocess.STDOUT
+        )
+    return module, returncode, time.monotonic() - start
+
+
+def merge_results(paths, output):
+    """Write one results.xml with the test suites of every file in paths."""
+    merged = ET.Element("testsuites", name="results")
+    for path in paths:
+        for suite in ET.parse(path).getroot().iter("testsuite"):
+            merged.append(suite)
+    ET.indent(merged)
+    ET.ElementTree(merged).write(output, encoding="unicode")
+
+
+def merge_coverage(paths, output):
+    """Merge Verilator coverage.dat files into output with verilator_coverage.
+
+    Returns:
+        verilator_coverage's exit code
+    """
+    return subprocess.call(["verilator_coverage", "--write", output] + paths)
+
+
+def count_tests(path):
+    """(tests, failures, skipped) in a results.xml."""
+    testcases = list(ET.parse(path).getroot().iter("testcase"))
+    failures = sum(1 for testcase in testcases if testcase.find("failure") is not None)
+    skipped = sum(1 for testcase in testcases if testcase.find("skipped") is not None)
+    return len(testcases), failures, skipped
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run test modules in parallel simulations of one model.")
+    parser.add_argument("--sim-build", required=True, help="directory holding the compiled Vtop")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count(), help="simulations at a time (default: CPU count)")
+    parser.add_argument("--results", default="results.xml", help="merged results file")
+    parser.add_argument("--perf-records", default=perf_records.DEFAULT_RECORDS_FILE, help="merged per-test cost records")
+    parser.add_argument("--coverage", default="coverage.dat", help="merged coverage file, if the model has coverage")
+    parser.add_argument("sim_args", nargs=argparse.REMAINDER, help="arguments for the simulator (after --)")
+    args = parser.parse_args()
+
+    modules = split_modules(os.environ.get("MODULE", ""))
+    if not modules:
+        parser.error("MODULE is empty")
+    sim_args = args.sim_args[1:] if args.sim_args[:1] == ["--"] else args.sim_args
+    simulator = os.path.abspath(os.path.join(args.sim_build, "Vtop"))
+    parallel_dir = os.path.abspath(os.path.join(args.sim_build, "parallel"))
+
+    print(f"Running {len(modules)} modules on {args.jobs} workers")
+    start = time.monotonic()
+    work_dirs = {module: os.path.join(parallel_dir, module) for module in modules}
+    broken = []
+    with ThreadPoolExecutor(max_workers=args.jobs) as pool:
+        futures = [pool.submit(run_module, module, simulator, sim_args, work_dirs[module]) for module in modules]
+        for future in futures:
+            module, returncode, seconds = future.result()
+            results = os.path.join(work_dirs[module], "results.xml")
+            if returncode != 0 or not os.path.exists(results):
+                broken.append(module)
+                print(f"ERROR {module}: simulator exited with {returncode}, see {work_dirs[module]}/sim.log")
+                continue
+            tests, failures, skipped = count_tests(results)
+            status = "FAIL" if failures else "PASS"
+            print(f"{status:5s} {module}: {tests - failures - skipped}/{tests} passed in {seconds:.1f} s")
+
+    # Merge in MODULE order, so the merged file reads like a serial run
+    results = [os.path.join(work_dirs[module], "results.xml") for module in modules if module not in broken]
+    merge_results(results, args.results)
+    coverage = [os.path.join(work_dirs[module], "coverage.dat") for module in modules]
+    coverage = [path for path in coverage if os.path.exists(path)]
+    merge_failed = False
+    if coverage:
+        try:
+            merge_failed = merge_coverage(coverage, args.coverage) != 0
+        except FileNotFoundError:
+            merge_failed = True
+        if merge_failed:
+            print(f"ERROR merging coverage with verilator_coverage; per-module files are in {parallel_dir}/*/coverage.dat")
+
+    records = []
+    for module in modules:
+        path = os.path.join(work_dirs[module], "perf.jsonl")
+        if os.path.exists(path):
+            records += perf_records.load(path)
+    with open(args.perf_records, "w") as f:
+        f.writelines(json.dumps(record) + "\n" for record in records)
+    print(perf_records.format_summary(records, top=perf_records.SUMMARY_TOP))
+
+    tests, failures, skipped = count_tests(args.results)
+    print(f"TESTS={tests} PASS={tests - failures - skipped} FAIL={failures} SKIP={skipped} BROKEN_MODULES={len(broken)} "
+          f"in {time.monotonic() - start:.1f} s -> {args.results}")
+    return 1 if failures or broken or merge_failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
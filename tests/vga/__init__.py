@@ -0,0 +1,7 @@
+import cocotb
+
+import perf_records
+
+# Imported by cocotb's test discovery: record the cost of every test
+if cocotb.top is not None:
+    perf_records.install()
@@ -38,4 +38,9 @@ module vga_unit_tests_harness ();
       .o_Vertical_Sync(o_Vertical_Sync)
   );
 
+  // i_Clock cycles since time 0, read at the start and end of every test by
+  // perf_records.py
+  reg [63:0] r_Cycle_Count = 64'd0;
+  always @(posedge i_Clock) r_Cycle_Count <= r_Cycle_Count + 1;
+
 endmodule
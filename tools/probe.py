@@ -1,35 +1,56 @@
 #!/usr/bin/env python3
 """Periodically probe the FPGA board via UART debug protocol."""
 
-import serial
-import time
-import sys
+import argparse
+import bisect
+import collections
 import glob
+import os
+import sys
+import time
 
-# Opcodes
-OP_HALT       = 0x03
-OP_UNHALT     = 0x04
-OP_PING       = 0x05
-OP_READ_PC    = 0x06
-OP_DUMP_STATE = 0x0A
-
-# Data memory AXI states
-DATA_MEM_STATES = {0: "IDLE", 1: "RD_SUBMIT", 2: "RD_AWAIT", 3: "RD_OK",
-                   4: "WR_SUBMIT", 5: "WR_AWAIT", 6: "WR_OK", 7: "MEM_ERR"}
-INSTR_MEM_STATES = {0: "IDLE", 1: "RD_SUBMIT", 2: "RD_AWAIT", 3: "RD_OK"}
-
-PC_LABELS = {
-    0x80000010: "fill_loop",
-    0x80000014: "fill_loop+4",
-    0x80000018: "fill_loop+8",
-    0x8000001C: "fill_loop+C (branch)",
-    0x80000020: "vdma_init",
-    0x80000028: "vdma_ctrl_write",
-    0x80000048: "vdma_vsize (trigger)",
-    0x8000004C: "ddr3_test",
-    0x8000006C: "*** FAIL ***",
-    0x80000070: "*** PASS ***",
-}
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from debug_client import DebugClient, SerialTransport, protocol
+
+# Written by assemble.py next to rom.mem (see assembler.write_listing_file)
+DEFAULT_LISTING = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "rom.lst")
+
+class SymbolTable:
+    """Resolves PCs to "symbol+offset" from an assembler listing file.
+
+    Label addresses are kept in a sorted list, so each lookup is a bisect.
+    """
+
+    def __init__(self, symbols=(), end=None):
+        symbols = sorted(symbols)
+        self.addresses = [address for address, _ in symbols]
+        self.names = [name for _, name in symbols]
+        self.end = end
+
+    @classmethod
+    def load(cls, path):
+        first = {}
+        end = None
+        with open(path) as f:
+            for row in f:
+                if row.startswith("#"):
+                    continue
+                address, labels, words = row.split("\t", 3)[:3]
+                address = int(address, 16)
+                end = max(end or 0, address + 4 * int(words))
+                if labels != "-":
+                    # Several labels on one address: keep the first
+                    first.setdefault(address, labels.split(",")[0])
+        return cls(first.items(), end)
+
+    def lookup(self, pc):
+        """"symbol+offset" for pc, or "" if it is outside the listed program."""
+        index = bisect.bisect_right(self.addresses, pc) - 1
+        if index < 0 or (self.end is not None and pc >= self.end):
+            return ""
+        offset = pc - self.addresses[index]
+        return self.names[index] if offset == 0 else f"{self.names[index]}+0x{offset:X}"
 
 def find_port():
     candidates = glob.glob("/dev/ttyUSB*") + glob.glob("/dev/ttyACM*")
@@ -41,91 +62,94 @@ def find_port():
             return p
     return candidates[0]
 
-def send_byte(ser, b):
-    ser.write(bytes([b]))
-
-def read_bytes(ser, n, timeout=0.5):
-    ser.timeout = timeout
-    data = ser.read(n)
-    return data
+# One write: the peripheral runs each command as its bytes arrive, so the CPU
+# is halted only while READ_PC and DUMP_STATE are received (~3 byte times)
+PROBE_BATCH = [protocol.halt(), protocol.read_pc(), protocol.dump_state(), protocol.unhalt()]
 
-def ping(ser):
-    send_byte(ser, OP_PING)
-    r = read_bytes(ser, 1)
-    return len(r) == 1 and r[0] == 0xAA
-
-def read_pc(ser):
-    send_byte(ser, OP_READ_PC)
-    r = read_bytes(ser, 4)
-    if len(r) != 4:
-        return None
-    return int.from_bytes(r, "little")
-
-def dump_state(ser):
-    send_byte(ser, OP_DUMP_STATE)
-    r = read_bytes(ser, 2)
-    if len(r) != 2:
-        return None
-    b0, b1 = r[0], r[1]
-    return {
-        "data_mem":         DATA_MEM_STATES.get((b0 >> 5) & 0x7, "?"),
-        "pipeline_flushed": bool(b0 & 0x10),
-        "stall_s1":         bool(b0 & 0x08),
-        "enable_fetch":     bool(b0 & 0x04),
-        "s2_valid":         bool(b0 & 0x02),
-        "s3_valid":         bool(b0 & 0x01),
-        "instr_mem":        INSTR_MEM_STATES.get((b1 >> 6) & 0x3, "?"),
-        "init_calib":       bool(b1 & 0x20),
-    }
-
-def probe_once(ser):
-    send_byte(ser, OP_HALT)
-    time.sleep(0.01)
-
-    pc = read_pc(ser)
-    state = dump_state(ser)
-
-    send_byte(ser, OP_UNHALT)
+# --live: the CPU keeps running. READ_PC returns the PC of the cycle the
+# opcode was accepted (all four bytes from one snapshot); DUMP_STATE is sampled
+# one byte time later
+LIVE_BATCH = [protocol.read_pc(), protocol.dump_state()]
 
+def probe_once(client, live=False):
+    if live:
+        pc, state = client.execute(LIVE_BATCH)
+        return pc, state
+    _, pc, state, _ = client.execute(PROBE_BATCH)
     return pc, state
 
+def print_profile(samples, top=20):
+    """Print the most sampled symbols, as counted by --live."""
+    total = sum(samples.values())
+    print(f"\n{total} samples")
+    for name, count in samples.most_common(top):
+        print(f"{100 * count / total:6.1f}%  {count:8d}  {name}")
+
 def main():
-    port = sys.argv[1] if len(sys.argv) > 1 else find_port()
+    parser = argparse.ArgumentParser(description="Periodically probe the CPU over the UART debug port.")
+    parser.add_argument("port", nargs="?", help="serial port (default: first /dev/ttyUSB* or /dev/ttyACM*)")
+    parser.add_argument("interval", nargs="?", type=float, default=1.0, help="seconds between probes")
+    parser.add_argument("--listing", default=DEFAULT_LISTING,
+                        help="assembler listing used to name PCs (default: rom.lst from assemble.py)")
+    parser.add_argument("--live", action="store_true",
+                        help="sample without halting the CPU and print a per-symbol profile on exit")
+    args = parser.parse_args()
+
+    port = args.port or find_port()
     if not port:
         print("No serial port found. Usage: probe.py [/dev/ttyUSBx]")
         sys.exit(1)
 
-    interval = float(sys.argv[2]) if len(sys.argv) > 2 else 1.0
+    interval = args.interval
+    symbols = SymbolTable()
+    if os.path.exists(args.listing):
+        symbols = SymbolTable.load(args.listing)
+        print(f"Loaded {len(symbols.addresses)} symbols from {args.listing}")
+    elif args.listing != DEFAULT_LISTING:
+        print(f"Listing {args.listing} not found")
+        sys.exit(1)
 
     print(f"Opening {port} @ 115200 baud")
-    ser = serial.Serial(port, 115200, timeout=0.5)
+    transport = SerialTransport.open(port)
+    client = DebugClient(transport)
     time.sleep(0.1)
 
     # flush
-    ser.reset_input_buffer()
+    transport.reset_input()
 
-    if not ping(ser):
+    try:
+        alive = client.ping()
+    except TimeoutError:
+        alive = False
+    if not alive:
         print("PING failed — check connection")
-        ser.close()
+        transport.close()
         sys.exit(1)
     print("PING OK\n")
 
     prev_pc = None
+    samples = collections.Counter()
     while True:
         try:
-            pc, state = probe_once(ser)
+            try:
+                pc, state = probe_once(client, args.live)
+            except TimeoutError:
+                pc = state = None
+                # Drop a partial reply so the next probe starts in sync
+                transport.reset_input()
             ts = time.strftime("%H:%M:%S")
 
-            if pc is None or state is None:
+            if pc is None:
                 print(f"[{ts}] read error")
             else:
-                label = PC_LABELS.get(pc, "")
+                label = symbols.lookup(pc)
                 pc_str = f"0x{pc:08X}"
                 if label:
                     pc_str += f"  ({label})"
 
                 changed = pc != prev_pc
                 prev_pc = pc
+                samples[label.split("+")[0] if label else f"0x{pc:08X}"] += 1
 
                 calib = "CAL" if state["init_calib"] else "no-cal"
                 dm = state["data_mem"]
@@ -141,12 +165,14 @@ def main():
             time.sleep(interval)
         except KeyboardInterrupt:
             print("\nDone.")
+            if args.live:
+                print_profile(samples)
             break
         except Exception as e:
             print(f"Error: {e}")
             time.sleep(interval)
 
-    ser.close()
+    transport.close()
 
 if __name__ == "__main__":
     main()